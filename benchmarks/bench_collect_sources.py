@@ -0,0 +1,143 @@
+"""
+Harness: refresh latency of the multi-source collector against local stub servers
+Each source (FPL, ESPN, football-data.org) is served by its own stub with its own response
+delay; the sources are fetched one after another (the old collector's shape) and then
+concurrently through source_collector, and a hung source shows the per-source timeout
+Usage: python benchmarks/bench_collect_sources.py [--fpl 0.8] [--espn 0.5] [--football-data 0.6]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from synthetic_fpl import TEAM_NAMES, make_bootstrap_payload
+
+def espn_payloads():
+    """ESPN standings and teams payloads for the synthetic league"""
+    entries = [
+        {
+            'team': {'displayName': name, 'abbreviation': name[:3].upper()},
+            'note': {'rank': rank},
+            'stats': [
+                {'name': 'gamesPlayed', 'value': 5}, {'name': 'wins', 'value': 3},
+                {'name': 'ties', 'value': 1}, {'name': 'losses', 'value': 1},
+                {'name': 'pointsFor', 'value': 9}, {'name': 'pointsAgainst', 'value': 4},
+                {'name': 'pointDifferential', 'value': 5}, {'name': 'points', 'value': 10},
+            ],
+        }
+        for rank, name in enumerate(TEAM_NAMES, start=1)
+    ]
+    teams = [
+        {'team': {'displayName': name, 'abbreviation': name[:3].upper(), 'location': name,
+                  'color': '000000', 'logos': [{'href': f'https://example.invalid/{i}.png'}]}}
+        for i, name in enumerate(TEAM_NAMES)
+    ]
+    return (
+        {'children': [{'standings': {'entries': entries}}]},
+        {'sports': [{'leagues': [{'teams': teams}]}]},
+    )
+
+def football_data_payload():
+    """football-data.org standings payload for the synthetic league"""
+    table = [
+        {'position': rank, 'team': {'name': name, 'tla': name[:3].upper()}, 'playedGames': 5,
+         'won': 3, 'draw': 1, 'lost': 1, 'points': 10, 'goalsFor': 9, 'goalsAgainst': 4, 'goalDifference': 5}
+        for rank, name in enumerate(TEAM_NAMES, start=1)
+    ]
+    return {'standings': [{'type': 'TOTAL', 'table': table}]}
+
+def stub_server(routes, delay):
+    """Serve {path: payload} as JSON after `delay` seconds; returns (server, base URL)"""
+    bodies = {path: json.dumps(payload).encode('utf-8') for path, payload in routes.items()}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(delay)
+            body = bodies.get(self.path.split('?')[0])
+            if body is None:
+                self.send_response(404)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}'
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--fpl', type=float, default=0.8, help='FPL stub delay (s)')
+    parser.add_argument('--espn', type=float, default=0.5, help='ESPN stub delay (s)')
+    parser.add_argument('--football-data', type=float, default=0.6, help='football-data.org stub delay (s)')
+    args = parser.parse_args()
+
+    standings, teams = espn_payloads()
+    fpl, fpl_url = stub_server({'/api/bootstrap-static/': make_bootstrap_payload()}, args.fpl)
+    espn, espn_url = stub_server({'/eng.1/standings': standings, '/eng.1/teams': teams}, args.espn)
+    football_data, football_data_url = stub_server({'/v4/competitions/PL/standings': football_data_payload()}, args.football_data)
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Endpoints are read from the environment when the collector modules are imported
+        os.environ.update({
+            'FPL_API_BASE': f'{fpl_url}/api',
+            'FPL_CACHE_DIR': os.path.join(directory, 'cache'),
+            'ESPN_API_BASE': f'{espn_url}/eng.1',
+            'FOOTBALL_DATA_API_BASE': f'{football_data_url}/v4',
+            'FOOTBALL_DATA_API_KEY': 'stub',
+        })
+        import fpl_client
+        import source_collector
+
+        try:
+            print(f"stub delays: fpl {args.fpl}s, espn {args.espn}s (x2 endpoints), football-data {args.football_data}s\n")
+
+            fpl_cache = lambda: os.path.join(directory, 'cache', str(time.perf_counter_ns()))
+            start = time.perf_counter()
+            for name, source in source_collector.SOURCES.items():
+                fpl_client.CACHE_DIR = fpl_cache()
+                source['fetch'](source['timeout'])
+            sequential = time.perf_counter() - start
+            print(f"{'sequential':<28}{sequential:>8.2f} s\n")
+
+            fpl_client.CACHE_DIR = fpl_cache()
+            start = time.perf_counter()
+            written = source_collector.collect_to_csv(output_dir=directory)
+            concurrent = time.perf_counter() - start
+            print(f"{'concurrent':<28}{concurrent:>8.2f} s")
+            print(f"\nspeedup: {sequential / concurrent:.1f}x (slowest source alone: {max(args.fpl, args.espn, args.football_data):.2f} s)")
+            assert written == {'players': 'fpl', 'teams': 'fpl', 'team_info': 'espn_teams', 'standings': 'football_data'}, written
+
+            # A source that never answers in time is cut off without delaying the rest
+            print("\nespn stub hung, 1s per-source timeout:")
+            espn.shutdown()
+            espn.server_close()
+            hung, hung_url = stub_server({}, 30)
+            source_collector.ESPN_API_BASE = f'{hung_url}/eng.1'
+            fpl_client.CACHE_DIR = fpl_cache()
+            start = time.perf_counter()
+            source_collector.collect_to_csv(output_dir=directory, timeouts={'espn_standings': 1, 'espn_teams': 1})
+            print(f"{'concurrent, espn timed out':<28}{time.perf_counter() - start:>8.2f} s")
+        finally:
+            fpl.shutdown()
+            football_data.shutdown()
+
+    # Threads still blocked on the hung stub are not waited for
+    os._exit(0)
+
+if __name__ == '__main__':
+    main()
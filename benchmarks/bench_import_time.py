@@ -0,0 +1,97 @@
+"""
+Benchmark and regression guard: cold-start import cost of the API server and the collectors
+Runs `python -X importtime -c "import <module>"` in fresh interpreters, reports each module's
+median cumulative import time and the slowest dependencies it pulls in, and fails (exit code 1)
+if a module imports a dependency it must load lazily or goes over its time budget. A separate
+run times the server answering /api/health, then /api/stats, from a cold interpreter
+Usage: python benchmarks/bench_import_time.py [runs]
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# module -> (dependencies it must not import at module load, budget in ms for its cumulative import)
+GUARDS = {
+    'stats_api_server': ({'pandas', 'numpy', 'pyarrow', 'requests', 'lxml', 'selenium', 'bs4'}, 600),
+    'wsgi': ({'pandas', 'numpy', 'pyarrow', 'requests', 'lxml', 'selenium', 'bs4'}, 600),
+    'stats_snapshot': ({'pandas', 'numpy'}, 50),
+    'stats_db': ({'pandas'}, 50),
+    'shared_snapshot': ({'pandas', 'numpy', 'pyarrow'}, 50),
+    'team_scraper': ({'pandas', 'selenium'}, 150),
+    'football_stats_advanced': ({'pandas', 'numpy', 'pyarrow', 'selenium', 'bs4'}, 150),
+}
+
+# Budgets scale with this for slower machines (e.g. STATS_IMPORT_BUDGET_SCALE=2)
+BUDGET_SCALE = float(os.environ.get('STATS_IMPORT_BUDGET_SCALE', '1'))
+
+COLD_START = '''
+import json, sys, time
+start = time.perf_counter()
+import stats_api_server
+client = stats_api_server.app.test_client()
+assert client.get('/api/health').status_code == 200
+health = time.perf_counter() - start
+pandas_at_health = 'pandas' in sys.modules
+client.get('/api/stats?players=0')
+print(json.dumps({'health_ms': health * 1e3, 'stats_ms': (time.perf_counter() - start) * 1e3, 'pandas_at_health': pandas_at_health}))
+'''
+
+def import_profile(module):
+    """{imported module: cumulative microseconds} from one -X importtime run"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=REPO_ROOT, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f'import {module} failed:\n{result.stderr[-2000:]}')
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        profile[name.strip()] = int(cumulative)
+    return profile
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    failures = []
+    print(f"median of {runs} cold imports (budget scale {BUDGET_SCALE:g})\n")
+    print(f"{'module':<26}{'import (ms)':>12}{'budget':>8}  status")
+    for module, (forbidden, budget_ms) in GUARDS.items():
+        profiles = [import_profile(module) for _ in range(runs)]
+        elapsed_ms = statistics.median(profile[module] for profile in profiles) / 1e3
+        loaded = {name.split('.')[0] for name in profiles[0]}
+        problems = sorted(forbidden & loaded)
+        status = 'ok'
+        if problems:
+            status = f"imports {', '.join(problems)}"
+        elif elapsed_ms > budget_ms * BUDGET_SCALE:
+            status = 'over budget'
+        if status != 'ok':
+            failures.append(module)
+        print(f"{module:<26}{elapsed_ms:>12.1f}{budget_ms * BUDGET_SCALE:>8.0f}  {status}")
+
+    profile = import_profile('stats_api_server')
+    print("\nslowest imports under stats_api_server:")
+    for name, micros in sorted(profile.items(), key=lambda item: -item[1])[1:9]:
+        print(f"  {name:<40}{micros / 1e3:>8.1f} ms")
+
+    result = subprocess.run([sys.executable, '-c', COLD_START], cwd=REPO_ROOT, capture_output=True, text=True)
+    cold = json.loads(result.stdout.strip().splitlines()[-1])
+    print(f"\ncold start: /api/health after {cold['health_ms']:.0f} ms, /api/stats after {cold['stats_ms']:.0f} ms")
+    if cold['pandas_at_health']:
+        failures.append('/api/health')
+        print("/api/health loaded pandas")
+
+    if failures:
+        print(f"\n❌ Import regressions: {', '.join(failures)}")
+        sys.exit(1)
+    print("\n✅ No import regressions")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark: exact FPL squad optimization on the stats.csv player pool
+For each objective, times optimize_squad with and without pruning dominated players (candidate
+pool size and branch-and-bound squads searched alongside), then across budgets, then /api/optimize
+through the Flask test client, uncached and cached
+Usage: python benchmarks/bench_optimizer.py [repeats]
+"""
+
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+os.chdir(REPO_ROOT)
+
+BUDGETS = [80.0, 90.0, 100.0, 110.0]
+
+def timed(run, repeats):
+    """(median seconds, last result) of repeated calls"""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = run()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+def no_pruning(costs, values, clubs, *args):
+    return np.zeros(len(costs), dtype=bool)
+
+def main():
+    import pandas as pd
+
+    import squad_optimizer
+    from squad_optimizer import OBJECTIVES, optimize_squad
+
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    df = pd.read_csv('stats.csv')
+    print(f"{len(df)} players in stats.csv, median of {repeats} runs\n")
+
+    print(f"{'objective':<18}{'pruning':<9}{'ms':>9}{'candidates':>12}{'squads':>8}{'value':>8}{'cost':>7}")
+    pruning = squad_optimizer.dominated_players
+    for objective in OBJECTIVES:
+        for label, prune in (('yes', pruning), ('no', no_pruning)):
+            squad_optimizer.dominated_players = prune
+            seconds, result = timed(lambda: optimize_squad(df['Pos'], df['Team'], df['price'], df[objective]), repeats)
+            print(
+                f"{objective:<18}{label:<9}{seconds * 1e3:>9.1f}{result['candidates']:>12}{result['nodes']:>8}"
+                f"{result['value']:>8.1f}{result['cost']:>7.1f}"
+            )
+    squad_optimizer.dominated_players = pruning
+
+    print(f"\n{'budget':>8}{'ms':>9}{'squads':>8}{'total_points':>14}{'cost':>7}")
+    for budget in BUDGETS:
+        seconds, result = timed(lambda: optimize_squad(df['Pos'], df['Team'], df['price'], df['total_points'], budget), repeats)
+        print(f"{budget:>8.1f}{seconds * 1e3:>9.1f}{result['nodes']:>8}{result['value']:>14.0f}{result['cost']:>7.1f}")
+
+    import stats_api_server
+
+    client = stats_api_server.app.test_client()
+    stats_api_server.get_snapshot()
+    print()
+    for objective in OBJECTIVES:
+        url = f'/api/optimize?objective={objective}'
+        uncached, _ = timed(lambda: (stats_api_server.response_cache.clear(), client.get(url)), repeats)
+        cached, _ = timed(lambda: client.get(url), repeats)
+        print(f"GET {url:<42} uncached {uncached * 1e3:>6.1f} ms, cached {cached * 1e3:>5.2f} ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark: converting the pipe-table PL data.csv to a columnar snapshot, on an N-times replicated copy
+Compares loading the whole table with read_pipe_table and writing it with write_snapshot against
+convert_pipe_table, which parses it once in fixed-size batches through a spool file. Reports time,
+throughput and peak memory above the interpreter's baseline, and checks the streamed snapshot holds
+the same values as read_pipe_table's frame. Each side runs in a fresh interpreter
+Usage: python benchmarks/bench_pipe_table.py [copies]
+"""
+
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+SOURCE = os.path.join(REPO_ROOT, 'PL data.csv')
+
+# Rule, header level 0, rule, header level 1, rule
+HEADER_LINES = 5
+
+def replicate(path, copies):
+    """Write SOURCE with its data rows repeated `copies` times"""
+    with open(SOURCE, encoding='utf-8') as f:
+        lines = f.readlines()
+    with open(path, 'w', encoding='utf-8') as f:
+        f.writelines(lines[:HEADER_LINES])
+        for _ in range(copies):
+            f.writelines(lines[HEADER_LINES:])
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far in MB"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+def run_in_memory(source, target):
+    """Old path: the whole table as a DataFrame, then one write"""
+    from columnar_snapshot import write_snapshot
+    from pipe_table import read_pipe_table
+
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    df = read_pipe_table(source)
+    write_snapshot(df, target)
+    return {'seconds': time.perf_counter() - start, 'rows': len(df), 'peak_mb': peak_rss_mb() - baseline}
+
+def run_streaming(source, target):
+    """convert_pipe_table: one batch in memory at a time"""
+    from pipe_table import convert_pipe_table
+
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    rows = convert_pipe_table(source, target)
+    return {'seconds': time.perf_counter() - start, 'rows': rows, 'peak_mb': peak_rss_mb() - baseline}
+
+def summarize(df):
+    """Column names and per-column sums (numeric) or distinct counts (text) of a frame"""
+    import pandas as pd
+
+    return {
+        column: round(float(df[column].sum()), 3) if pd.api.types.is_numeric_dtype(df[column].dtype)
+        else int(df[column].astype(str).nunique())
+        for column in df.columns
+    }
+
+def run_child(kind, source, target):
+    result = subprocess.run(
+        [sys.executable, __file__, '--child', kind, source, target],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(result.strip().splitlines()[-1])
+
+def main():
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, 'PL data x.csv')
+        replicate(source, copies)
+        size_mb = os.path.getsize(source) / 1e6
+        print(f"PL data.csv x{copies}: {size_mb:.1f} MB\n")
+        print(f"{'method':<12}{'rows':>10}{'seconds':>10}{'MB/s':>8}{'rows/s':>10}{'peak +MB':>10}")
+
+        targets = {}
+        for kind in ('in_memory', 'streaming'):
+            targets[kind] = os.path.join(directory, f'{kind}.arrow')
+            result = run_child(kind, source, targets[kind])
+            print(
+                f"{kind:<12}{result['rows']:>10}{result['seconds']:>10.2f}{size_mb / result['seconds']:>8.1f}"
+                f"{result['rows'] / result['seconds']:>10.0f}{result['peak_mb']:>10.1f}"
+            )
+
+        # write_snapshot stores some columns as categories, so compare against the frame it was given
+        from columnar_snapshot import read_snapshot
+        from pipe_table import read_pipe_table
+
+        same = summarize(read_pipe_table(source)) == summarize(read_snapshot(targets['streaming']))
+        print(f"\nsame columns and totals as read_pipe_table: {same}")
+
+if __name__ == '__main__':
+    if len(sys.argv) > 4 and sys.argv[1] == '--child':
+        run = run_streaming if sys.argv[2] == 'streaming' else run_in_memory
+        print(json.dumps(run(sys.argv[3], sys.argv[4])))
+    else:
+        main()
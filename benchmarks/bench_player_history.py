@@ -0,0 +1,163 @@
+"""
+Harness: cost of player history refreshes against a local FPL stub
+A stub serves bootstrap-static and event/{gw}/live with a per-request delay. The runs are:
+a cold backfill, a rerun with nothing changed, a live update of a few players in the
+current gameweek, and a run interrupted by a failing gameweek followed by its resume.
+Each run prints the gameweeks fetched, rows appended, and time; the stored history is
+checked against the stub after every run
+Usage: python benchmarks/bench_player_history.py [--players 741] [--gameweeks 30] [--delay 0.2] [--workers 4]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from synthetic_fpl import make_bootstrap_payload
+
+class League:
+    """Synthetic season whose gameweek stats can be edited between runs"""
+
+    def __init__(self, players, current_gw, seed=0):
+        self.bootstrap = make_bootstrap_payload(players, seed=seed, current_gw=current_gw)
+        self.rng = random.Random(seed)
+        self.live = {}
+        for gw in range(1, current_gw + 1):
+            self.add_gameweek(gw)
+        self.recompute_totals()
+
+    def player_stats(self):
+        minutes = self.rng.choice([0, 0, 15, 60, 90, 90])
+        goals = self.rng.randint(0, 2) if minutes else 0
+        return {
+            'minutes': minutes, 'goals_scored': goals, 'assists': self.rng.randint(0, 1) if minutes else 0,
+            'clean_sheets': 0, 'goals_conceded': self.rng.randint(0, 3) if minutes else 0, 'own_goals': 0,
+            'penalties_saved': 0, 'penalties_missed': 0, 'yellow_cards': 0, 'red_cards': 0, 'saves': 0,
+            'bonus': 0, 'bps': self.rng.randint(0, 40) if minutes else 0, 'total_points': goals * 5 + (2 if minutes >= 60 else 1 if minutes else 0),
+            'influence': f'{self.rng.uniform(0, 60):.1f}', 'creativity': f'{self.rng.uniform(0, 60):.1f}',
+            'threat': f'{self.rng.uniform(0, 60):.1f}', 'ict_index': f'{self.rng.uniform(0, 18):.1f}',
+        }
+
+    def add_gameweek(self, gw):
+        self.live[gw] = {element['id']: self.player_stats() for element in self.bootstrap['elements']}
+
+    def set_current(self, gw, finished_through):
+        for event in self.bootstrap['events']:
+            event['is_current'] = event['id'] == gw
+            event['finished'] = event['id'] <= finished_through
+
+    def edit_players(self, gw, count):
+        """Give `count` players a goal in gameweek gw"""
+        for pid in self.rng.sample(sorted(self.live[gw]), count):
+            stats = self.live[gw][pid]
+            stats['goals_scored'] += 1
+            stats['total_points'] += 5
+        self.recompute_totals()
+
+    def recompute_totals(self):
+        for element in self.bootstrap['elements']:
+            for field in ('total_points', 'minutes', 'goals_scored', 'assists', 'bps'):
+                element[field] = sum(stats[element['id']][field] for stats in self.live.values())
+
+    def live_payload(self, gw):
+        return {'elements': [{'id': pid, 'stats': stats, 'explain': []} for pid, stats in self.live[gw].items()]}
+
+def stub_server(league, delay):
+    """Serve the league's bootstrap-static and live endpoints; returns (server, API base URL)"""
+
+    class Handler(BaseHTTPRequestHandler):
+        failing = set()
+
+        def do_GET(self):
+            time.sleep(delay)
+            path = self.path.split('?')[0].strip('/').split('/')
+            if path == ['api', 'bootstrap-static']:
+                payload = league.bootstrap
+            elif len(path) == 4 and path[1] == 'event' and int(path[2]) in league.live and int(path[2]) not in self.failing:
+                payload = league.live_payload(int(path[2]))
+            else:
+                self.send_response(404)
+                self.end_headers()
+                return
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, Handler, f'http://127.0.0.1:{server.server_address[1]}/api'
+
+def check(league, history_dir):
+    """The stored history must equal the stub's current gameweek stats"""
+    from player_history import HISTORY_INT_STATS, load_history
+    history = load_history(history_dir=history_dir)
+    expected = {(pid, gw): stats for gw, players in league.live.items() for pid, stats in players.items()}
+    assert len(history) == len(expected), (len(history), len(expected))
+    for row in history[['player_id', 'gameweek', *HISTORY_INT_STATS]].itertuples(index=False):
+        stats = expected[(row.player_id, row.gameweek)]
+        assert all(getattr(row, field) == stats[field] for field in HISTORY_INT_STATS), row
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--players', type=int, default=741)
+    parser.add_argument('--gameweeks', type=int, default=30, help='gameweeks played before the first run')
+    parser.add_argument('--delay', type=float, default=0.2, help='stub response delay (s)')
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    league = League(args.players, args.gameweeks)
+    server, handler, api_base = stub_server(league, args.delay)
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ['FPL_API_BASE'] = api_base
+        os.environ['FPL_CACHE_DIR'] = os.path.join(directory, 'cache')
+        from fpl_client import fetch_bootstrap_static
+        from player_history import update_history
+
+        history_dir = os.path.join(directory, 'history')
+
+        def run(label):
+            print(f"\n--- {label} ---")
+            summary = update_history(history_dir, workers=args.workers, fpl_data=fetch_bootstrap_static(max_age=0))
+            if not summary['failed']:
+                check(league, history_dir)
+            return summary
+
+        try:
+            run(f'cold backfill ({args.gameweeks} gameweeks, {args.players} players)')
+            run('rerun, nothing changed')
+
+            league.edit_players(args.gameweeks, 25)
+            run('25 players changed in the current gameweek')
+
+            league.add_gameweek(args.gameweeks + 1)
+            league.add_gameweek(args.gameweeks + 2)
+            league.set_current(args.gameweeks + 2, args.gameweeks + 2)
+            league.recompute_totals()
+            handler.failing.add(args.gameweeks + 2)
+            run('two new gameweeks, the second one failing')
+
+            handler.failing.clear()
+            run('resume')
+        finally:
+            server.shutdown()
+
+        parts = sum(len(files) for _, _, files in os.walk(history_dir))
+        print(f"\nhistory store: {parts} files, history checked against the stub after every complete run")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark: list-of-dicts player records vs. the columnar PlayerStore
+Reports retained memory (tracemalloc) and JSON serialization time for the full list
+and for a filtered subset, on stats.csv replicated to a multi-season sized dataset
+Usage: python benchmarks/bench_player_store.py [replicas]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import pandas as pd
+from flask import Flask
+
+from player_store import PlayerStore
+
+def build_frame(replicas):
+    """Replicate stats.csv with distinct player names, as several seasons would have"""
+    base = pd.read_csv(os.path.join(REPO_ROOT, 'stats.csv'), keep_default_na=False)
+    frames = []
+    for i in range(replicas):
+        copy = base.copy()
+        copy['Player'] = copy['Player'] + f' #{i}'
+        frames.append(copy)
+    return pd.concat(frames, ignore_index=True)
+
+def retained_bytes(build):
+    """Bytes still allocated after build() returns, with its result kept alive"""
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+def best_time(fn, repeats=5):
+    """Best wall-clock time of several runs"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    replicas = int(sys.argv[1]) if len(sys.argv) > 1 else 68
+    df = build_frame(replicas)
+    print(f"{len(df):,} rows  (stats.csv x {replicas}), {len(df.columns)} columns\n")
+
+    records, records_bytes = retained_bytes(lambda: df.to_dict('records'))
+    store, store_bytes = retained_bytes(lambda: PlayerStore(df))
+    # The first serialization caches encoded names and category values inside the store
+    _, fragment_bytes = retained_bytes(lambda: len(store.to_json()))
+
+    print(f"{'representation':<28}{'memory MB':>12}")
+    print(f"{'list of dicts':<28}{records_bytes / 1e6:>12.1f}")
+    print(f"{'PlayerStore':<28}{store_bytes / 1e6:>12.1f}")
+    print(f"{'PlayerStore + JSON caches':<28}{(store_bytes + fragment_bytes) / 1e6:>12.1f}")
+    print(f"  saving: {records_bytes / (store_bytes + fragment_bytes):.1f}x smaller\n")
+
+    app = Flask(__name__)
+    subset = [row_id for row_id, team in enumerate(store.column('Team')) if team == 'Arsenal']
+
+    with app.app_context():
+        assert app.json.dumps(records) == store.to_json(), 'store JSON differs from jsonify output'
+        assert app.json.dumps([records[i] for i in subset]) == store.to_json(subset)
+
+        cases = [
+            ('all players', lambda: app.json.dumps(records), store.to_json),
+            (f'one team ({len(subset):,} rows)',
+             lambda: app.json.dumps([records[i] for i in subset]),
+             lambda: store.to_json(subset)),
+        ]
+        print(f"{'serialize':<28}{'dicts (s)':>12}{'store (s)':>12}{'speedup':>10}")
+        for label, dicts_fn, store_fn in cases:
+            dicts_time = best_time(dicts_fn)
+            store_time = best_time(store_fn)
+            print(f"{label:<28}{dicts_time:>12.4f}{store_time:>12.4f}{dicts_time / store_time:>9.1f}x")
+
+if __name__ == '__main__':
+    main()
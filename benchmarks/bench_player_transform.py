@@ -0,0 +1,127 @@
+"""
+Benchmark: per-element dict loops vs. the columnar fpl_transform frames
+Usage: python benchmarks/bench_player_transform.py [n_elements]
+"""
+
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fpl_transform import current_season_players_frame, latest_players_frame, stats_frame
+from synthetic_fpl import make_bootstrap_payload
+
+def legacy_stats_frame(fpl_data):
+    """The per-player loop football_stats.py used before the columnar transform"""
+    teams = {team['id']: team['name'] for team in fpl_data['teams']}
+    positions = {pos['id']: pos['singular_name_short'] for pos in fpl_data['element_types']}
+    rows = []
+    for player in fpl_data['elements']:
+        rows.append({
+            'Player': f"{player['first_name']} {player['second_name']}",
+            'Nation': '', 'Pos': positions.get(player['element_type'], 'Unknown'),
+            'Age': '', 'MP': '', 'Starts': '',
+            'Min': player['minutes'], 'Gls': player['goals_scored'], 'Ast': player['assists'],
+            'PK': '', 'CrdY': player['yellow_cards'], 'CrdR': player['red_cards'],
+            'xG': '', 'npxG': '', 'Team': teams.get(player['team'], 'Unknown'),
+            'total_points': player['total_points'], 'clean_sheets': player['clean_sheets'],
+            'saves': player['saves'], 'bonus': player['bonus'],
+            'influence': float(player['influence']),
+            'creativity': float(player['creativity']),
+            'threat': float(player['threat']),
+            'price': player['now_cost'] / 10,
+            'selected_by_percent': float(player['selected_by_percent']),
+            'form': float(player['form']),
+            'points_per_game': float(player['points_per_game']) if player['points_per_game'] else 0.0,
+        })
+    return pd.DataFrame(rows)
+
+def legacy_current_season_players_frame(fpl_data):
+    """The per-player loop current_season_data.py used before the columnar transform"""
+    teams = {team['id']: team['name'] for team in fpl_data['teams']}
+    positions = {pos['id']: pos['singular_name_short'] for pos in fpl_data['element_types']}
+    rows = []
+    for player in fpl_data['elements']:
+        if player['total_points'] > 0 or player['minutes'] > 0:
+            rows.append({
+                'player_id': player['id'],
+                'name': f"{player['first_name']} {player['second_name']}",
+                'team': teams.get(player['team'], 'Unknown'),
+                'position': positions.get(player['element_type'], 'Unknown'),
+                'total_points': player['total_points'], 'goals': player['goals_scored'],
+                'assists': player['assists'], 'clean_sheets': player['clean_sheets'],
+                'minutes_played': player['minutes'], 'yellow_cards': player['yellow_cards'],
+                'red_cards': player['red_cards'], 'saves': player['saves'],
+                'bonus_points': player['bonus'],
+                'influence': float(player['influence']),
+                'creativity': float(player['creativity']),
+                'threat': float(player['threat']),
+                'selected_by_percent': float(player['selected_by_percent']),
+                'price': player['now_cost'] / 10,
+                'form': float(player['form']),
+                'points_per_game': float(player['points_per_game']) if player['points_per_game'] else 0.0,
+                'dreamteam_count': player['dreamteam_count'],
+                'value_form': float(player['value_form']),
+                'value_season': float(player['value_season']),
+                'news': player['news'],
+                'chance_of_playing_this_round': player['chance_of_playing_this_round'],
+                'chance_of_playing_next_round': player['chance_of_playing_next_round'],
+            })
+    return pd.DataFrame(rows)
+
+def legacy_latest_players_frame(fpl_data):
+    """The per-player loop football_stats_api.py used before the columnar transform"""
+    teams = {team['id']: team['name'] for team in fpl_data['teams']}
+    positions = {pos['id']: pos['singular_name'] for pos in fpl_data['element_types']}
+    rows = []
+    for player in fpl_data['elements']:
+        rows.append({
+            'id': player['id'],
+            'name': f"{player['first_name']} {player['second_name']}",
+            'team': teams.get(player['team'], 'Unknown'),
+            'position': positions.get(player['element_type'], 'Unknown'),
+            'total_points': player['total_points'], 'goals_scored': player['goals_scored'],
+            'assists': player['assists'], 'clean_sheets': player['clean_sheets'],
+            'minutes': player['minutes'], 'yellow_cards': player['yellow_cards'],
+            'red_cards': player['red_cards'], 'saves': player['saves'], 'bonus': player['bonus'],
+            'influence': player['influence'], 'creativity': player['creativity'],
+            'threat': player['threat'], 'selected_by_percent': player['selected_by_percent'],
+            'now_cost': player['now_cost'] / 10, 'form': player['form'],
+            'points_per_game': player['points_per_game'],
+        })
+    return pd.DataFrame(rows)
+
+def best_of(fn, payload, repeats=3):
+    """Best wall-clock time of several runs, plus the last result"""
+    best = float('inf')
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn(payload)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main():
+    n_elements = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    payload = make_bootstrap_payload(n_elements)
+    print(f"Synthetic bootstrap-static payload: {n_elements:,} elements\n")
+
+    cases = [
+        ('stats.csv', legacy_stats_frame, stats_frame),
+        ('current_season_players.csv', legacy_current_season_players_frame, current_season_players_frame),
+        ('premier_league_players_latest.csv', legacy_latest_players_frame, latest_players_frame),
+    ]
+
+    print(f"{'output':<36}{'loop (s)':>10}{'columnar (s)':>14}{'speedup':>10}")
+    for name, legacy, columnar in cases:
+        legacy_time, legacy_df = best_of(legacy, payload)
+        columnar_time, columnar_df = best_of(columnar, payload)
+        same = legacy_df.to_csv(index=False) == columnar_df.to_csv(index=False)
+        flag = '' if same else '  (OUTPUT DIFFERS)'
+        print(f"{name:<36}{legacy_time:>10.3f}{columnar_time:>14.3f}{legacy_time / columnar_time:>9.1f}x{flag}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark: match outcome prediction for a full season (380 fixtures) and a 10k-fixture batch
+Times building the predictor from the team file, then for each batch the vectorized model call
+on team rows, the JSON-ready records from team names, a loop scoring one fixture per call (the
+per-fixture alternative), and a POST to /api/predict through the Flask test client
+Usage: python benchmarks/bench_predict.py [batch fixtures] [repeats]
+"""
+
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+os.chdir(REPO_ROOT)
+
+def timed(run, repeats):
+    """Median seconds of repeated calls"""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+def main():
+    from match_predictor import load_predictor, season_fixtures
+    import stats_api_server
+
+    batch_size = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    start = time.perf_counter()
+    predictor = load_predictor()
+    print(f"predictor built from {predictor.source} in {(time.perf_counter() - start) * 1e3:.2f} ms ({len(predictor.names)} teams)")
+    client = stats_api_server.app.test_client()
+    client.get('/api/predict?home=ARS&away=LIV')
+    start = time.perf_counter()
+    stats_api_server.get_match_predictor()
+    print(f"warm predictor lookup in the server: {(time.perf_counter() - start) * 1e6:.1f} us\n")
+
+    rng = np.random.default_rng(0)
+    teams = len(predictor.names)
+    home_rows = rng.integers(0, teams, batch_size)
+    away_rows = (home_rows + rng.integers(1, teams, batch_size)) % teams
+    batches = {'season (380)': season_fixtures(teams), f'batch ({batch_size})': (home_rows, away_rows)}
+
+    print(f"{'fixtures':<16}{'model (ms)':>12}{'records (ms)':>14}{'per-fixture (ms)':>18}{'POST (ms)':>11}{'fixtures/s':>12}")
+    for label, (home, away) in batches.items():
+        home_names = [predictor.short_names[row] for row in home]
+        away_names = [predictor.short_names[row] for row in away]
+        fixtures = [{'home': h, 'away': a} for h, a in zip(home_names, away_names)]
+
+        model = timed(lambda: predictor.predict_rows(home, away), repeats)
+        records = timed(lambda: predictor.predictions(home_names, away_names), repeats)
+        per_fixture = timed(lambda: [predictor.predict_rows(home[i:i + 1], away[i:i + 1]) for i in range(len(home))], max(1, repeats // 10))
+        post = timed(lambda: client.post('/api/predict', json={'fixtures': fixtures}), max(1, repeats // 4))
+        print(
+            f"{label:<16}{model * 1e3:>12.3f}{records * 1e3:>14.2f}{per_fixture * 1e3:>18.1f}{post * 1e3:>11.1f}"
+            f"{len(home) / model:>12.0f}"
+        )
+
+if __name__ == '__main__':
+    main()
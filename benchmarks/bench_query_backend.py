@@ -0,0 +1,111 @@
+"""
+Benchmark: serving several seasons from the SQLite query backend vs. in-memory Python rows
+Replicates PL data.csv into N seasons and compares resident memory after loading, and latency
+of a filtered/sorted page and a grouped aggregation, between the old approach (every season kept
+as a list of row dicts and scanned per request) and stats_db (one indexed on-disk table per season)
+Each side runs in a fresh interpreter
+Usage: python benchmarks/bench_query_backend.py [seasons]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+QUERIES = 200
+
+def rss_mb():
+    """Current resident set size in MB"""
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1e3
+    return 0.0
+
+def season_frames(seasons):
+    """PL data.csv replicated into `seasons` tables with perturbed goal counts"""
+    from pipe_table import read_pipe_table
+
+    base = read_pipe_table(os.path.join(REPO_ROOT, 'PL data.csv'))
+    return {f'season_{i}': base.assign(Gls=base['Gls'] + i % 3) for i in range(seasons)}
+
+def run_python_rows(seasons):
+    """Old approach: every season held as row dicts, filtered, sorted and grouped in Python"""
+    frames = season_frames(seasons)
+    baseline = rss_mb()
+    data = {name: frame.to_dict('records') for name, frame in frames.items()}
+    del frames
+    loaded = rss_mb() - baseline
+
+    names = list(data)
+    start = time.perf_counter()
+    for i in range(QUERIES):
+        rows = [row for row in data[names[i % len(names)]] if row['Team'] == 'Arsenal-' and row['Gls'] >= 2]
+        page = sorted(rows, key=lambda row: row['Gls'], reverse=True)[:10]
+    page_ms = (time.perf_counter() - start) / QUERIES * 1e3
+
+    start = time.perf_counter()
+    for i in range(QUERIES):
+        totals = {}
+        for row in data[names[i % len(names)]]:
+            totals[row['Team']] = totals.get(row['Team'], 0) + row['Gls']
+    group_ms = (time.perf_counter() - start) / QUERIES * 1e3
+    return {'loaded_mb': loaded, 'page_ms': page_ms, 'group_ms': group_ms, 'check': [row['Player'] for row in page]}
+
+def run_sqlite(seasons, directory):
+    """stats_db: seasons written to an indexed database; only query results are materialized"""
+    from stats_db import StatsDatabase, write_tables
+
+    path = os.path.join(directory, 'seasons.sqlite')
+    write_tables(path, season_frames(seasons))
+    baseline = rss_mb()
+    database = StatsDatabase(path)
+    loaded = rss_mb() - baseline
+
+    names = sorted(database.datasets)
+    start = time.perf_counter()
+    for i in range(QUERIES):
+        page = database.select(
+            names[i % len(names)], filters={'Team': ['Arsenal-']}, ranges={'Gls': (2, None)},
+            sort='Gls', descending=True, limit=10, fields=['Player', 'Gls'],
+        )
+    page_ms = (time.perf_counter() - start) / QUERIES * 1e3
+
+    start = time.perf_counter()
+    for i in range(QUERIES):
+        database.group(names[i % len(names)], ['Team'], [('sum', 'Gls')])
+    group_ms = (time.perf_counter() - start) / QUERIES * 1e3
+    return {'loaded_mb': loaded, 'page_ms': page_ms, 'group_ms': group_ms, 'check': [row['Player'] for row in page['rows']]}
+
+def run_child(kind, seasons):
+    output = subprocess.run(
+        [sys.executable, __file__, '--child', kind, str(seasons)],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    seasons = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    print(f"{seasons} seasons x PL data.csv, {QUERIES} queries each\n")
+    print(f"{'backend':<14}{'loaded +MB':>12}{'page (ms)':>12}{'group (ms)':>12}")
+    results = {}
+    for kind in ('python_rows', 'sqlite'):
+        result = results[kind] = run_child(kind, seasons)
+        print(f"{kind:<14}{result['loaded_mb']:>12.1f}{result['page_ms']:>12.3f}{result['group_ms']:>12.3f}")
+    # Ties in Gls may be ordered differently; the set of top names must match
+    print(f"\nsame top page: {sorted(results['python_rows']['check']) == sorted(results['sqlite']['check'])}")
+
+if __name__ == '__main__':
+    if len(sys.argv) > 3 and sys.argv[1] == '--child':
+        if sys.argv[2] == 'sqlite':
+            with tempfile.TemporaryDirectory() as directory:
+                print(json.dumps(run_sqlite(int(sys.argv[3]), directory)))
+        else:
+            print(json.dumps(run_python_rows(int(sys.argv[3]))))
+    else:
+        main()
@@ -0,0 +1,85 @@
+"""
+Benchmark: "players like X" queries over the similarity index at multi-season sizes
+stats.csv is replicated (with the numeric features jittered, so copies are not exact duplicates)
+to each size; reports the time to build the index with the snapshot, then the p50/p99 latency of
+k=10 queries over all players and within one position, against a Python loop scoring every row
+Usage: python benchmarks/bench_similarity.py [replica counts, e.g. 1,14,68,270]
+"""
+
+import math
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+QUERIES = 1000
+LOOP_QUERIES = 5
+
+def build_frame(replicas, rng):
+    """Replicate stats.csv with distinct names and jittered feature columns, as several seasons would have"""
+    import pandas as pd
+
+    from player_similarity import FEATURES
+
+    base = pd.read_csv(os.path.join(REPO_ROOT, 'stats.csv'), keep_default_na=False)
+    frames = []
+    for i in range(replicas):
+        copy = base.copy()
+        copy['Player'] = copy['Player'] + f' #{i}'
+        if i:
+            for column in FEATURES + ['Min']:
+                copy[column] = copy[column] * rng.uniform(0.8, 1.2, len(copy))
+        frames.append(copy)
+    return pd.concat(frames, ignore_index=True)
+
+def loop_nearest(rows, features, row_id, k):
+    """Per-row alternative: Euclidean distance to every row computed in Python"""
+    query = rows[row_id]
+    scored = []
+    for other, vector in enumerate(rows):
+        if other != row_id:
+            scored.append((math.sqrt(sum((a - b) ** 2 for a, b in zip(query, vector))), other))
+    scored.sort()
+    return scored[:k]
+
+def latencies(run, row_ids):
+    """(p50, p99) microseconds of run(row_id) over row_ids"""
+    times = []
+    for row_id in row_ids:
+        start = time.perf_counter()
+        run(row_id)
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return statistics.median(times) * 1e6, times[int(len(times) * 0.99)] * 1e6
+
+def main():
+    from player_similarity import build_similarity_index
+    from player_store import PlayerStore
+    from stats_snapshot import grouped_row_ids
+
+    counts = [int(n) for n in sys.argv[1].split(',')] if len(sys.argv) > 1 else [1, 14, 68, 270]
+    rng = np.random.default_rng(0)
+    print(f"{'players':>9}{'build (ms)':>12}{'p50 (us)':>10}{'p99 (us)':>10}{'MID p50':>9}{'MID p99':>9}{'loop (ms)':>11}")
+    for replicas in counts:
+        store = PlayerStore(build_frame(replicas, rng))
+        start = time.perf_counter()
+        index = build_similarity_index(store, grouped_row_ids(store, 'Pos'))
+        build = time.perf_counter() - start
+
+        row_ids = rng.integers(0, len(store), QUERIES).tolist()
+        p50, p99 = latencies(lambda row_id: index.nearest(row_id, 10), row_ids)
+        mid_p50, mid_p99 = latencies(lambda row_id: index.nearest(row_id, 10, 'mid'), row_ids)
+        rows = index.vectors.tolist()
+        loop, _ = latencies(lambda row_id: loop_nearest(rows, index.features, row_id, 10), row_ids[:LOOP_QUERIES])
+        print(
+            f"{len(store):>9,}{build * 1e3:>12.1f}{p50:>10.1f}{p99:>10.1f}{mid_p50:>9.1f}{mid_p99:>9.1f}"
+            f"{loop / 1e3:>11.1f}"
+        )
+
+if __name__ == '__main__':
+    main()
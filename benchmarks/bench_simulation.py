@@ -0,0 +1,71 @@
+"""
+Benchmark: Monte Carlo season simulation of the remaining fixtures
+Times a plain loop drawing one match at a time (on a small number of simulations, extrapolated),
+then simulate_season with every simulation of a batch drawn at once, in this process and across
+process pools of increasing size, and checks the pooled runs give the same table as the single one
+Usage: python benchmarks/bench_simulation.py [simulations] [max workers]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+os.chdir(REPO_ROOT)
+
+LOOP_SIMULATIONS = 200
+
+def loop_season(predictor, home_rows, away_rows, simulations, seed):
+    """Per-match alternative: one Poisson draw per side per match per simulation; returns title counts"""
+    rng = np.random.default_rng(seed)
+    home_rates, away_rates = predictor.expected_goals(home_rows, away_rows)
+    titles = np.zeros(len(predictor.names), dtype=np.int64)
+    for _ in range(simulations):
+        points = predictor.points.astype(np.int64)
+        for home, away, home_rate, away_rate in zip(home_rows, away_rows, home_rates, away_rates):
+            home_goals, away_goals = rng.poisson(home_rate), rng.poisson(away_rate)
+            if home_goals > away_goals:
+                points[home] += 3
+            elif home_goals < away_goals:
+                points[away] += 3
+            else:
+                points[home] += 1
+                points[away] += 1
+        titles[points.argmax()] += 1
+    return titles
+
+def main():
+    from match_predictor import load_predictor
+    from season_simulator import remaining_fixtures, simulate_season
+
+    simulations = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else max(4, os.cpu_count() or 1)
+
+    predictor = load_predictor()
+    home_rows, away_rows = remaining_fixtures(predictor)
+    print(f"{len(home_rows)} remaining fixtures, {simulations:,} simulations, {os.cpu_count()} CPUs\n")
+    print(f"{'method':<22}{'seconds':>10}{'sims/s':>12}  same table")
+
+    start = time.perf_counter()
+    loop_season(predictor, home_rows, away_rows, LOOP_SIMULATIONS, 0)
+    per_simulation = (time.perf_counter() - start) / LOOP_SIMULATIONS
+    print(f"{'per-match loop*':<22}{per_simulation * simulations:>10.2f}{1 / per_simulation:>12.0f}")
+
+    reference = None
+    workers = 1
+    while workers <= max_workers:
+        start = time.perf_counter()
+        result = simulate_season(predictor, simulations, workers)
+        elapsed = time.perf_counter() - start
+        if reference is None:
+            reference = result['teams']
+        label = 'vectorized' if workers == 1 else f'process pool x{workers}'
+        print(f"{label:<22}{elapsed:>10.2f}{simulations / elapsed:>12.0f}  {result['teams'] == reference}")
+        workers *= 2
+    print(f"\n* extrapolated from {LOOP_SIMULATIONS} simulations")
+
+if __name__ == '__main__':
+    main()
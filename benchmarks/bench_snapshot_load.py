@@ -0,0 +1,94 @@
+"""
+Benchmark: loading stats.csv with pandas vs. memory-mapping the Arrow snapshot
+Each loader runs in a fresh interpreter so resident memory is measured in isolation
+Usage: python benchmarks/bench_snapshot_load.py [replicas]
+"""
+
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+def rss_mb():
+    """Current resident set size in MB (Linux /proc, falls back to peak RSS)"""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / 1e6
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+def child(kind, path):
+    """Load one file the way the API server does and report time and memory as JSON"""
+    import pandas as pd
+    from columnar_snapshot import read_snapshot
+
+    before = rss_mb()
+    start = time.perf_counter()
+    if kind == 'csv':
+        df = pd.read_csv(path, keep_default_na=False)
+    else:
+        df = read_snapshot(path)
+    elapsed = time.perf_counter() - start
+    # Touch every column so lazily mapped pages are counted too
+    df.memory_usage(deep=False).sum()
+    print(json.dumps({
+        'seconds': elapsed,
+        'rss_mb': rss_mb() - before,
+        'frame_mb': df.memory_usage(deep=True).sum() / 1e6,
+        'rows': len(df),
+    }))
+
+def build_files(replicas, directory):
+    """Replicate stats.csv into a larger CSV and Arrow snapshot pair"""
+    import pandas as pd
+    from columnar_snapshot import write_snapshot
+
+    base = pd.read_csv(os.path.join(REPO_ROOT, 'stats.csv'), keep_default_na=False)
+    frames = []
+    for i in range(replicas):
+        copy = base.copy()
+        copy['Player'] = copy['Player'] + f' #{i}'
+        frames.append(copy)
+    df = pd.concat(frames, ignore_index=True)
+
+    csv_path = os.path.join(directory, 'stats.csv')
+    arrow_path = os.path.join(directory, 'stats.arrow')
+    df.to_csv(csv_path, index=False)
+    write_snapshot(df, arrow_path)
+    return len(df), csv_path, arrow_path
+
+def run_child(kind, path, repeats=3):
+    """Best-of-N child run for one loader"""
+    results = []
+    for _ in range(repeats):
+        output = subprocess.run(
+            [sys.executable, __file__, '--child', kind, path],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    return min(results, key=lambda r: r['seconds'])
+
+def main():
+    replicas = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    with tempfile.TemporaryDirectory() as directory:
+        rows, csv_path, arrow_path = build_files(replicas, directory)
+        print(f"{rows:,} rows  (stats.csv x {replicas})")
+        print(f"  file size: csv {os.path.getsize(csv_path) / 1e6:.1f} MB, arrow {os.path.getsize(arrow_path) / 1e6:.1f} MB\n")
+
+        print(f"{'loader':<10}{'load (s)':>10}{'RSS +MB':>10}{'frame MB':>10}")
+        for kind, path in (('csv', csv_path), ('arrow', arrow_path)):
+            result = run_child(kind, path)
+            print(f"{kind:<10}{result['seconds']:>10.3f}{result['rss_mb']:>10.1f}{result['frame_mb']:>10.1f}")
+
+if __name__ == '__main__':
+    if len(sys.argv) == 4 and sys.argv[1] == '--child':
+        child(sys.argv[2], sys.argv[3])
+    else:
+        main()
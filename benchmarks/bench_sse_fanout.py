@@ -0,0 +1,142 @@
+"""
+Benchmark: fanning snapshot notifications out to many /api/stats/stream subscribers
+Compares sse_broadcaster (one event loop holding every connection) with the thread-per-client
+alternative of a streaming Flask response on the threaded development server. For each, N
+clients connect, one event is published, and the time until every client has received it is
+measured along with the server's thread count and resident memory growth
+Each side runs in a fresh interpreter; clients run in this process on their own event loop
+Usage: python benchmarks/bench_sse_fanout.py [clients]
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+EVENT = json.dumps({'version': 2, 'since': 1, 'full': False, 'player_ids': list(range(20))})
+
+def process_stats():
+    """(thread count, resident set size in MB) of this process"""
+    threads = rss = 0
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('Threads:'):
+                threads = int(line.split()[1])
+            elif line.startswith('VmRSS:'):
+                rss = int(line.split()[1]) / 1e3
+    return threads, rss
+
+def serve_broadcaster():
+    """Child: serve the stream with SSEBroadcaster; returns a publish function"""
+    from sse_broadcaster import SSEBroadcaster
+
+    broadcaster = SSEBroadcaster(host='127.0.0.1', port=0).start()
+    return broadcaster.port, lambda: broadcaster.publish('snapshot', EVENT, 2)
+
+def serve_threaded_flask():
+    """Child: the thread-per-client alternative, a streaming Flask response waiting on a condition"""
+    from flask import Flask, Response
+    from werkzeug.serving import make_server
+
+    from sse_broadcaster import STREAM_PATH, format_event
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    app = Flask(__name__)
+    condition = threading.Condition()
+    state = {'version': 1}
+
+    @app.route(STREAM_PATH)
+    def stream():
+        def events():
+            seen = state['version']
+            yield b'retry: 5000\n\n'
+            while True:
+                with condition:
+                    condition.wait_for(lambda: state['version'] != seen)
+                    seen = state['version']
+                yield format_event('snapshot', EVENT, seen)
+        return Response(events(), mimetype='text/event-stream')
+
+    def publish():
+        with condition:
+            state['version'] += 1
+            condition.notify_all()
+
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    server.socket.listen(4096)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server.server_port, publish
+
+def run_child(kind):
+    """Serve one kind of stream, reporting stats on stdout and publishing when asked on stdin"""
+    baseline = process_stats()
+    port, publish = serve_broadcaster() if kind == 'broadcaster' else serve_threaded_flask()
+    print(json.dumps({'port': port}), flush=True)
+    for command in sys.stdin:
+        if command.strip() == 'stats':
+            threads, rss = process_stats()
+            print(json.dumps({'threads': threads, 'rss_mb': rss - baseline[1]}), flush=True)
+        elif command.strip() == 'publish':
+            publish()
+
+async def subscribe(port, connected, received):
+    """One EventSource-like client: read the stream until the published event arrives"""
+    from sse_broadcaster import STREAM_PATH
+
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(f'GET {STREAM_PATH} HTTP/1.1\r\nHost: 127.0.0.1\r\nAccept: text/event-stream\r\n\r\n'.encode('ascii'))
+    await reader.readuntil(b'retry: 5000\n\n')
+    connected.release()
+    await reader.readuntil(b'event: snapshot')
+    received.append(time.perf_counter())
+    writer.close()
+
+async def measure(kind, clients):
+    """Connect the clients to a fresh server, publish once and time the fan-out"""
+    child = await asyncio.create_subprocess_exec(
+        sys.executable, __file__, '--child', kind,
+        stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE,
+    )
+    port = json.loads(await child.stdout.readline())['port']
+
+    connected = asyncio.Semaphore(0)
+    received = []
+    tasks = []
+    start = time.perf_counter()
+    for _ in range(clients):
+        tasks.append(asyncio.create_task(subscribe(port, connected, received)))
+        await asyncio.sleep(0)
+    for _ in range(clients):
+        await connected.acquire()
+    connect_s = time.perf_counter() - start
+
+    child.stdin.write(b'stats\n')
+    stats = json.loads(await child.stdout.readline())
+    published = time.perf_counter()
+    child.stdin.write(b'publish\n')
+    await asyncio.gather(*tasks)
+    fanout_ms = (max(received) - published) * 1e3
+
+    child.kill()
+    await child.wait()
+    return {'connect_s': connect_s, 'fanout_ms': fanout_ms, **stats}
+
+def main():
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    print(f"{clients} subscribers, one published event\n")
+    print(f"{'server':<16}{'threads':>10}{'+MB':>10}{'connect (s)':>14}{'fan-out (ms)':>14}")
+    for kind in ('threaded_flask', 'broadcaster'):
+        result = asyncio.run(measure(kind, clients))
+        print(f"{kind:<16}{result['threads']:>10}{result['rss_mb']:>10.1f}{result['connect_s']:>14.2f}{result['fanout_ms']:>14.1f}")
+
+if __name__ == '__main__':
+    if len(sys.argv) > 2 and sys.argv[1] == '--child':
+        run_child(sys.argv[2])
+    else:
+        main()
@@ -0,0 +1,110 @@
+"""
+Benchmark: extracting the squad stats table from fbref pages
+Compares the old whole-page BeautifulSoup tree + str() + read_html round trip, read_html
+over the whole page, and the streaming html_tables extractor on saved fixture pages
+Each method runs in a fresh interpreter so peak resident memory is measured in isolation
+Usage: python benchmarks/bench_table_extract.py [pages] [players]
+"""
+
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from io import StringIO
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+METHODS = ('beautifulsoup', 'read_html', 'stream')
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (VmHWM; ru_maxrss can carry over the parent's peak)"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1e3
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+def extract(method, path):
+    """Extract the first stats table of one saved page with the given method"""
+    import pandas as pd
+    from html_tables import read_first_table
+
+    if method == 'stream':
+        with open(path, encoding='utf-8') as f:
+            return read_first_table(iter(lambda: f.read(64 * 1024), ''))
+
+    with open(path, encoding='utf-8') as f:
+        html = f.read()
+    if method == 'beautifulsoup':
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(html, "lxml")
+        stats = soup.find_all("table", class_="stats_table")[0]
+        return pd.read_html(StringIO(str(stats)))[0]
+    return pd.read_html(StringIO(html))[0]
+
+def child(method, paths):
+    """Time one method over every page and report time and peak memory as JSON"""
+    import pandas as pd  # noqa: F401 (imported before the baseline so it is not counted)
+    import lxml.html  # noqa: F401
+    if method == 'beautifulsoup':
+        import bs4  # noqa: F401
+
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    frames = [extract(method, path) for path in paths]
+    elapsed = time.perf_counter() - start
+    print(json.dumps({
+        'seconds': elapsed,
+        'peak_mb': peak_rss_mb() - baseline,
+        'rows': sum(len(frame) for frame in frames),
+    }))
+
+def run_child(method, paths):
+    """Run one method in a fresh interpreter"""
+    output = subprocess.run(
+        [sys.executable, __file__, '--child', method, *paths],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    from fbref_fixtures import write_fixtures
+    from html_tables import read_first_table
+
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    players = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+
+    try:
+        import bs4  # noqa: F401
+        methods = METHODS
+    except ImportError:
+        methods = METHODS[1:]
+
+    with tempfile.TemporaryDirectory() as directory:
+        _, squad_paths = write_fixtures(directory, teams=pages, players=players)
+        paths = [os.path.join(directory, *p.strip('/').split('/')) for p in squad_paths]
+        size = sum(os.path.getsize(path) for path in paths) / len(paths) / 1e3
+        print(f"{len(paths)} squad pages, {size:.0f} KB each, {players} players per table\n")
+
+        # All methods must agree before their timings mean anything
+        reference = extract('read_html', paths[0])
+        assert read_first_table(open(paths[0], encoding='utf-8').read()).equals(reference)
+
+        print(f"{'method':<16}{'total (s)':>10}{'per page (ms)':>15}{'peak RSS +MB':>14}")
+        for method in methods:
+            result = min((run_child(method, paths) for _ in range(3)), key=lambda r: r['seconds'])
+            print(f"{method:<16}{result['seconds']:>10.3f}{result['seconds'] / len(paths) * 1e3:>15.1f}{result['peak_mb']:>14.1f}")
+
+if __name__ == '__main__':
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    if len(sys.argv) > 2 and sys.argv[1] == '--child':
+        child(sys.argv[2], sys.argv[3:])
+    else:
+        main()
@@ -0,0 +1,116 @@
+"""
+Harness: wall-clock time of the fbref squad scrape against local fixture pages
+Serves a generated league page and squad pages from a local HTTP server with simulated
+page latency, then runs the old one-page-at-a-time loop (fixed sleeps, whole-page
+BeautifulSoup parse) and the pooled, rate-limited scraper over the same pages
+Sleeps and the rate-limit interval are multiplied by --scale so a run takes seconds
+Usage: python benchmarks/bench_team_scrape.py [--teams 20] [--latency 0.5] [--scale 0.1] [--workers 3]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import pandas as pd
+import requests
+
+from fbref_fixtures import write_fixtures
+from html_tables import scan_html
+from team_scraper import (
+    FBREF_MIN_INTERVAL, HostRateLimiter, http_table_fetcher, scrape_team_pages,
+    squad_urls, team_name_from_url,
+)
+
+try:
+    from bs4 import BeautifulSoup
+except ImportError:
+    BeautifulSoup = None
+
+class SlowHandler(SimpleHTTPRequestHandler):
+    """Static file handler that waits `latency` seconds before answering, like a page load"""
+    latency = 0.0
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        super().do_GET()
+
+    def guess_type(self, path):
+        return 'text/html'
+
+    def log_message(self, *args):
+        pass
+
+def serve(directory, latency):
+    """Start a threaded fixture server; returns (server, base URL)"""
+    handler = type('Handler', (SlowHandler,), {'latency': latency})
+    server = ThreadingHTTPServer(('127.0.0.1', 0), partial(handler, directory=directory))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}'
+
+def legacy_scrape(team_urls, scale):
+    """The previous loop: one page at a time, fixed sleeps, whole-page parse"""
+    all_teams = []
+    for i, team_url in enumerate(team_urls):
+        html = requests.get(team_url, timeout=30).text
+        time.sleep(3 * scale)  # Wait for page to load
+        if BeautifulSoup is not None:
+            soup = BeautifulSoup(html, "lxml")
+            team_data = pd.read_html(StringIO(str(soup.find_all("table", class_="stats_table")[0])))[0]
+        else:
+            team_data = pd.read_html(StringIO(html))[0]
+        team_data["Team"] = team_name_from_url(team_url)
+        all_teams.append(team_data)
+        time.sleep((2 + (i % 3)) * scale)  # 2-4 second delay
+    return all_teams
+
+def timed(label, fn):
+    """Run fn once and print its wall-clock time"""
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<44}{elapsed:>8.2f} s")
+    return result, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--teams', type=int, default=20)
+    parser.add_argument('--players', type=int, default=30)
+    parser.add_argument('--latency', type=float, default=0.5, help='simulated page load time (s)')
+    parser.add_argument('--scale', type=float, default=0.1, help='multiplier for sleeps and rate limits')
+    parser.add_argument('--workers', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        league_path, _ = write_fixtures(directory, args.teams, args.players)
+        server, base_url = serve(directory, args.latency)
+        try:
+            league_html = requests.get(base_url + league_path, timeout=30).text
+            team_urls = squad_urls(scan_html(league_html, link_text='/squads')['links'], base_url=base_url)
+            print(f"{len(team_urls)} squad pages, {args.latency:.2f} s latency, sleeps x {args.scale}\n")
+
+            parser_name = 'BeautifulSoup' if BeautifulSoup is not None else 'read_html'
+            legacy, legacy_time = timed(f'sequential, fixed sleeps ({parser_name})', lambda: legacy_scrape(team_urls, args.scale))
+
+            limiter = HostRateLimiter(FBREF_MIN_INTERVAL * args.scale)
+            session = requests.Session()
+            pooled, pooled_time = timed(
+                f'pooled x{args.workers}, rate limited ({FBREF_MIN_INTERVAL * args.scale:.2f} s/host)',
+                lambda: scrape_team_pages(team_urls, http_table_fetcher(session), workers=args.workers, limiter=limiter),
+            )
+        finally:
+            server.shutdown()
+
+    same = len(legacy) == len(pooled) and all(a.equals(b) for a, b in zip(legacy, pooled))
+    print(f"\nspeedup: {legacy_time / pooled_time:.1f}x, identical frames: {same}")
+
+if __name__ == '__main__':
+    main()
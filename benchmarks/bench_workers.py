@@ -0,0 +1,140 @@
+"""
+Load test: the stats API under gunicorn (wsgi:app) at 1, 4 and 8 workers
+Starts the server for each worker count with a fresh shared snapshot directory, waits until it
+answers, then drives a mix of cached API requests over keep-alive connections from several client
+processes for a fixed time. Reports requests/sec, p50/p99 latency, and the workers' total resident
+vs proportional (shared pages split between processes) memory
+Usage: python benchmarks/bench_workers.py [seconds] [worker counts, e.g. 1,4,8]
+"""
+
+import asyncio
+import multiprocessing
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HOST = '127.0.0.1'
+PORT = 5099
+STREAM_PORT = 5098
+
+PATHS = [
+    '/api/health',
+    '/api/stats?players=0',
+    '/api/stats/players?limit=50',
+    '/api/stats/leaderboard?stat=Gls&n=10',
+    '/api/stats/top-scorers',
+]
+
+CLIENT_PROCESSES = 4
+CONNECTIONS_PER_PROCESS = 8
+
+async def client(deadline, latencies, index):
+    """One keep-alive connection issuing requests back to back until the deadline"""
+    reader, writer = await asyncio.open_connection(HOST, PORT)
+    while time.perf_counter() < deadline:
+        path = PATHS[index % len(PATHS)]
+        index += 1
+        start = time.perf_counter()
+        writer.write(f'GET {path} HTTP/1.1\r\nHost: {HOST}\r\n\r\n'.encode('ascii'))
+        head = await reader.readuntil(b'\r\n\r\n')
+        length = next(
+            int(line.split(b':', 1)[1]) for line in head.split(b'\r\n') if line.lower().startswith(b'content-length:')
+        )
+        await reader.readexactly(length)
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+
+def run_clients(seconds, results):
+    """Client process: CONNECTIONS_PER_PROCESS connections on one event loop"""
+    latencies = []
+    deadline = time.perf_counter() + seconds
+
+    async def main():
+        await asyncio.gather(*(client(deadline, latencies, i) for i in range(CONNECTIONS_PER_PROCESS)))
+
+    asyncio.run(main())
+    results.put(latencies)
+
+def worker_memory(master_pid):
+    """(total RSS, total PSS) in MB of the gunicorn workers under master_pid"""
+    children = subprocess.run(['pgrep', '-P', str(master_pid)], capture_output=True, text=True).stdout.split()
+    rss = pss = 0
+    for pid in children:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            for line in f:
+                if line.startswith('Rss:'):
+                    rss += int(line.split()[1])
+                elif line.startswith('Pss:'):
+                    pss += int(line.split()[1])
+    return rss / 1e3, pss / 1e3
+
+def wait_until_ready(timeout=120):
+    """Block until every route in PATHS answers"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            for path in PATHS:
+                urllib.request.urlopen(f'http://{HOST}:{PORT}{path}', timeout=5).read()
+            return
+        except OSError:
+            time.sleep(0.5)
+    raise RuntimeError('server did not start')
+
+def measure(workers, seconds):
+    """Start gunicorn with this many workers and load it for `seconds`"""
+    with tempfile.TemporaryDirectory() as shared_dir:
+        env = {
+            **os.environ,
+            'STATS_WORKERS': str(workers),
+            'STATS_BIND': f'{HOST}:{PORT}',
+            'STATS_SHARED_DIR': shared_dir,
+            'STATS_STREAM_PORT': str(STREAM_PORT),
+        }
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:app'],
+            cwd=REPO_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            wait_until_ready()
+            # Warm every worker's response cache before timing
+            for _ in range(workers * 20):
+                for path in PATHS:
+                    urllib.request.urlopen(f'http://{HOST}:{PORT}{path}').read()
+
+            results = multiprocessing.Queue()
+            clients = [multiprocessing.Process(target=run_clients, args=(seconds, results)) for _ in range(CLIENT_PROCESSES)]
+            for process in clients:
+                process.start()
+            latencies = sorted(sum((results.get() for _ in clients), []))
+            for process in clients:
+                process.join()
+            rss, pss = worker_memory(server.pid)
+        finally:
+            server.send_signal(signal.SIGTERM)
+            server.wait()
+
+    return {
+        'rps': len(latencies) / seconds,
+        'p50_ms': latencies[len(latencies) // 2] * 1e3,
+        'p99_ms': latencies[int(len(latencies) * 0.99)] * 1e3,
+        'rss_mb': rss,
+        'pss_mb': pss,
+    }
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+    counts = [int(n) for n in sys.argv[2].split(',')] if len(sys.argv) > 2 else [1, 4, 8]
+    print(f"{CLIENT_PROCESSES * CONNECTIONS_PER_PROCESS} keep-alive connections, {seconds:g}s per run, {os.cpu_count()} CPUs\n")
+    print(f"{'workers':>8}{'req/s':>10}{'p50 (ms)':>10}{'p99 (ms)':>10}{'RSS MB':>10}{'PSS MB':>10}")
+    for workers in counts:
+        result = measure(workers, seconds)
+        print(f"{workers:>8}{result['rps']:>10.0f}{result['p50_ms']:>10.2f}{result['p99_ms']:>10.2f}{result['rss_mb']:>10.1f}{result['pss_mb']:>10.1f}")
+
+if __name__ == '__main__':
+    main()
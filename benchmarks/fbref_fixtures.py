@@ -0,0 +1,160 @@
+"""
+Offline fbref-style fixture pages for the scraping benchmarks
+Squad pages mimic the real layout: navigation and scripts, a two-row header
+(over_header with colspans), player names in <th scope="row"> with links, thousands
+separators, a tfoot with squad totals, and further tables hidden inside HTML comments
+"""
+
+import os
+import random
+
+TEAMS = [
+    'Arsenal', 'Aston-Villa', 'Bournemouth', 'Brentford', 'Brighton-and-Hove-Albion',
+    'Burnley', 'Chelsea', 'Crystal-Palace', 'Everton', 'Fulham', 'Leeds-United',
+    'Liverpool', 'Manchester-City', 'Manchester-United', 'Newcastle-United',
+    'Nottingham-Forest', 'Sunderland', 'Tottenham-Hotspur', 'West-Ham-United', 'Wolverhampton-Wanderers',
+]
+
+OVER_HEADER = [('', 5), ('Playing Time', 4), ('Performance', 8), ('Expected', 4), ('Per 90 Minutes', 5), ('', 1)]
+COLUMNS = [
+    ('player', 'Player'), ('nationality', 'Nation'), ('position', 'Pos'), ('age', 'Age'), ('games', 'MP'),
+    ('games_starts', 'Starts'), ('minutes', 'Min'), ('minutes_90s', '90s'), ('games_subs', 'Subs'),
+    ('goals', 'Gls'), ('assists', 'Ast'), ('goals_assists', 'G+A'), ('goals_pens', 'G-PK'),
+    ('pens_made', 'PK'), ('pens_att', 'PKatt'), ('cards_yellow', 'CrdY'), ('cards_red', 'CrdR'),
+    ('xg', 'xG'), ('npxg', 'npxG'), ('xg_assist', 'xAG'), ('npxg_xg_assist', 'npxG+xAG'),
+    ('goals_per90', 'Gls'), ('assists_per90', 'Ast'), ('goals_assists_per90', 'G+A'),
+    ('xg_per90', 'xG'), ('xg_assist_per90', 'xAG'), ('matches', 'Matches'),
+]
+NATIONS = [('eng', 'ENG'), ('es', 'ESP'), ('fr', 'FRA'), ('br', 'BRA'), ('pt', 'POR'), ('nl', 'NED')]
+POSITIONS = ['GK', 'DF', 'DF,MF', 'MF', 'MF,FW', 'FW']
+
+def page_chrome(kilobytes, seed):
+    """Navigation, inline scripts and ad slots padding a page to roughly the given size"""
+    rng = random.Random(seed)
+    blocks = []
+    size = 0
+    while size < kilobytes * 1024:
+        block = (
+            f'<div class="nav_item"><a href="/en/comps/{rng.randint(1, 99)}/">Competition {rng.randint(1, 999)}</a>'
+            f'<ul><li><a href="/en/players/{rng.getrandbits(32):08x}/">Player link</a></li></ul></div>\n'
+            f'<script>window.sr_data_{rng.getrandbits(24)} = {{"key": "{rng.getrandbits(64):016x}", "n": {rng.random():.6f}}};</script>\n'
+        )
+        blocks.append(block)
+        size += len(block)
+    return ''.join(blocks)
+
+def player_row(team, i, rng):
+    """One tbody row of the standard stats table"""
+    games = rng.randint(0, 38)
+    starts = rng.randint(0, games)
+    minutes = starts * 90 - rng.randint(0, 20) * starts + (games - starts) * rng.randint(0, 30)
+    goals = rng.randint(0, 25)
+    assists = rng.randint(0, 15)
+    pens = rng.randint(0, min(goals, 6))
+    flag, nation = rng.choice(NATIONS)
+    nineties = minutes / 90
+    per90 = lambda value: f'{value / nineties:.2f}' if nineties else ''
+    xg = rng.random() * 25
+    xag = rng.random() * 12
+    values = {
+        'nationality': f'<a href="/en/country/{nation}/"><span style="white-space: nowrap"><span class="f-i f-{flag}" style="">{flag}</span> {nation}</span></a>',
+        'position': rng.choice(POSITIONS),
+        'age': f'{rng.randint(17, 36)}-{rng.randint(0, 364):03d}',
+        'games': games,
+        'games_starts': starts,
+        'minutes': f'{minutes:,}',
+        'minutes_90s': f'{nineties:.1f}',
+        'games_subs': games - starts,
+        'goals': goals,
+        'assists': assists,
+        'goals_assists': goals + assists,
+        'goals_pens': goals - pens,
+        'pens_made': pens,
+        'pens_att': pens + rng.randint(0, 1),
+        'cards_yellow': rng.randint(0, 10),
+        'cards_red': rng.randint(0, 1),
+        'xg': f'{xg:.1f}',
+        'npxg': f'{xg * 0.9:.1f}',
+        'xg_assist': f'{xag:.1f}',
+        'npxg_xg_assist': f'{xg * 0.9 + xag:.1f}',
+        'goals_per90': per90(goals),
+        'assists_per90': per90(assists),
+        'goals_assists_per90': per90(goals + assists),
+        'xg_per90': per90(xg),
+        'xg_assist_per90': per90(xag),
+        'matches': f'<a href="/en/players/{i:08x}/matchlogs/{team}-Player-{i}-Match-Logs">Matches</a>',
+    }
+    player = f'<th scope="row" class="left " data-stat="player" csk="{team} {i}"><a href="/en/players/{i:08x}/{team}-Player-{i}">{team.replace("-", " ")} Player {i}</a></th>'
+    cells = ''.join(f'<td class="right " data-stat="{stat}" >{values[stat]}</td>' for stat, _ in COLUMNS[1:])
+    return f'<tr >{player}{cells}</tr>\n'
+
+def stats_table(team, players, rng, table_id='stats_standard_9'):
+    """The squad's standard stats table with a two-row header and squad totals"""
+    over = ''.join(
+        f'<th aria-label="" data-stat="" colspan="{span}" class=" over_header center" >{label}</th>'
+        for label, span in OVER_HEADER
+    )
+    header = ''.join(
+        f'<th aria-label="{label}" data-stat="{stat}" scope="col" class=" poptip center" >{label}</th>'
+        for stat, label in COLUMNS
+    )
+    rows = ''.join(player_row(team, i, rng) for i in range(players))
+    total = '<th scope="row" class="left " data-stat="player" >Squad Total</th>' + ''.join(
+        f'<td class="right " data-stat="{stat}" ></td>' for stat, _ in COLUMNS[1:]
+    )
+    return (
+        f'<div class="table_container" id="div_{table_id}">\n'
+        f'<table class="min_width sortable stats_table shade_zero" id="{table_id}" data-cols-to-freeze=",1">\n'
+        f'<caption>Standard Stats 2025-2026 Premier League Table</caption>\n'
+        f'<colgroup>{"<col>" * len(COLUMNS)}</colgroup>\n'
+        f'<thead>\n<tr class="over_header">{over}</tr>\n<tr>{header}</tr>\n</thead>\n'
+        f'<tbody>\n{rows}</tbody>\n<tfoot><tr >{total}</tr></tfoot>\n</table>\n</div>\n'
+    )
+
+def squad_page(team, players=30, chrome_kb=200, seed=0):
+    """A full squad page; the standard stats table sits after the page header"""
+    rng = random.Random(f'{team}-{seed}')
+    commented = ''.join(
+        f'<div class="placeholder"></div>\n<!--\n{stats_table(team, players, rng, table_id=f"stats_{kind}_9")}\n-->\n'
+        for kind in ('keeper', 'shooting', 'passing', 'defense')
+    )
+    return (
+        f'<!DOCTYPE html>\n<html data-version="klecko-" class="no-js" lang="en"><head><meta charset="utf-8">'
+        f'<title>{team.replace("-", " ")} Stats, Premier League | FBref.com</title></head>\n<body>\n'
+        f'{page_chrome(chrome_kb // 2, seed)}\n<div id="content">{stats_table(team, players, rng)}\n'
+        f'{commented}</div>\n{page_chrome(chrome_kb // 2, seed + 1)}\n</body></html>\n'
+    )
+
+def squad_path(index, team):
+    """URL path of a squad page"""
+    return f'/en/squads/{index:08x}/{team}-Stats'
+
+def league_page(teams, chrome_kb=150, seed=0):
+    """League page whose first stats_table links to every squad page"""
+    rows = ''.join(
+        f'<tr ><th scope="row" class="right " data-stat="rank" >{rank}</th>'
+        f'<td class="left " data-stat="team" ><a href="{squad_path(rank - 1, team)}">{team.replace("-", " ")}</a></td>'
+        f'<td class="right " data-stat="points" >{60 - rank}</td></tr>\n'
+        for rank, team in enumerate(teams, start=1)
+    )
+    table = (
+        '<table class="stats_table sortable min_width force_mobilize" id="results2025-202691_overall">'
+        '<thead><tr><th>Rk</th><th>Squad</th><th>Pts</th></tr></thead>'
+        f'<tbody>{rows}</tbody></table>'
+    )
+    return f'<html><head><title>Premier League Stats | FBref.com</title></head><body>{page_chrome(chrome_kb, seed)}{table}{page_chrome(chrome_kb, seed + 1)}</body></html>'
+
+def write_fixtures(directory, teams=20, players=30, chrome_kb=200):
+    """Write a league page and its squad pages under directory, laid out like fbref URLs"""
+    teams = TEAMS[:teams] + [f'Team-{i}' for i in range(len(TEAMS), teams)]
+    league_path = '/en/comps/9/Premier-League-Stats'
+    pages = {league_path: league_page(teams)}
+    for index, team in enumerate(teams):
+        pages[squad_path(index, team)] = squad_page(team, players, chrome_kb)
+
+    for url_path, html in pages.items():
+        path = os.path.join(directory, *url_path.strip('/').split('/'))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(html)
+    return league_path, [url_path for url_path in pages if url_path != league_path]
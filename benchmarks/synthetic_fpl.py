@@ -0,0 +1,90 @@
+"""
+Synthetic Fantasy Premier League payloads for the benchmarks
+Produces a bootstrap-static shaped dict with any number of elements
+"""
+
+import random
+
+TEAM_NAMES = [
+    'Arsenal', 'Aston Villa', 'Bournemouth', 'Brentford', 'Brighton',
+    'Burnley', 'Chelsea', 'Crystal Palace', 'Everton', 'Fulham',
+    'Leeds', 'Liverpool', 'Man City', 'Man Utd', 'Newcastle',
+    "Nott'm Forest", 'Spurs', 'Sunderland', 'West Ham', 'Wolves',
+]
+
+ELEMENT_TYPES = [
+    {'id': 1, 'singular_name': 'Goalkeeper', 'singular_name_short': 'GKP'},
+    {'id': 2, 'singular_name': 'Defender', 'singular_name_short': 'DEF'},
+    {'id': 3, 'singular_name': 'Midfielder', 'singular_name_short': 'MID'},
+    {'id': 4, 'singular_name': 'Forward', 'singular_name_short': 'FWD'},
+]
+
+def make_teams(rng):
+    """Build the 20 team records with randomized strength ratings"""
+    teams = []
+    for team_id, name in enumerate(TEAM_NAMES, start=1):
+        strengths = {
+            key: rng.randint(1000, 1350)
+            for key in (
+                'strength_overall_home', 'strength_overall_away',
+                'strength_attack_home', 'strength_attack_away',
+                'strength_defence_home', 'strength_defence_away',
+            )
+        }
+        teams.append({
+            'id': team_id, 'name': name, 'short_name': name[:3].upper(), 'code': team_id * 3,
+            'played': 0, 'win': 0, 'draw': 0, 'loss': 0, 'points': 0, 'position': team_id,
+            'form': None, 'strength': 3, 'pulse_id': team_id + 100, **strengths,
+        })
+    return teams
+
+def make_element(element_id, rng):
+    """Build one player element with realistic-looking string/number field types"""
+    # Roughly 45% of a real squad list has not played yet
+    minutes = 0 if rng.random() < 0.45 else rng.randint(1, 3420)
+    goals = rng.randint(0, 25) if minutes else 0
+    assists = rng.randint(0, 15) if minutes else 0
+    points = goals * 5 + assists * 3 + minutes // 60
+    return {
+        'id': element_id,
+        'first_name': f'First{element_id}',
+        'second_name': f'Second{element_id}',
+        'web_name': f'Second{element_id}',
+        'team': rng.randint(1, len(TEAM_NAMES)),
+        'element_type': rng.randint(1, 4),
+        'total_points': points,
+        'goals_scored': goals,
+        'assists': assists,
+        'clean_sheets': rng.randint(0, 15) if minutes else 0,
+        'minutes': minutes,
+        'yellow_cards': rng.randint(0, 10),
+        'red_cards': rng.randint(0, 1),
+        'saves': rng.randint(0, 100),
+        'bonus': rng.randint(0, 30),
+        'influence': f'{rng.uniform(0, 1200):.1f}',
+        'creativity': f'{rng.uniform(0, 1200):.1f}',
+        'threat': f'{rng.uniform(0, 1200):.1f}',
+        'selected_by_percent': f'{rng.uniform(0, 60):.1f}',
+        'now_cost': rng.randint(39, 150),
+        'form': f'{rng.uniform(0, 12):.1f}',
+        'points_per_game': rng.choice(['', f'{rng.uniform(0, 9):.1f}']),
+        'dreamteam_count': rng.randint(0, 5),
+        'value_form': f'{rng.uniform(0, 2):.1f}',
+        'value_season': f'{rng.uniform(0, 30):.1f}',
+        'news': '',
+        'chance_of_playing_this_round': rng.choice([None, 0, 25, 50, 75, 100]),
+        'chance_of_playing_next_round': rng.choice([None, 0, 25, 50, 75, 100]),
+    }
+
+def make_bootstrap_payload(n_elements=741, seed=0, current_gw=5):
+    """Build a bootstrap-static shaped payload with n_elements players"""
+    rng = random.Random(seed)
+    return {
+        'events': [
+            {'id': gw, 'is_current': gw == current_gw, 'finished': gw <= current_gw}
+            for gw in range(1, 39)
+        ],
+        'teams': make_teams(rng),
+        'element_types': ELEMENT_TYPES,
+        'elements': [make_element(i, rng) for i in range(1, n_elements + 1)],
+    }
@@ -0,0 +1,92 @@
+"""
+Typed columnar snapshots (Arrow IPC) written alongside the collector CSVs
+Categorical team/position columns and compact integer stats, memory-mapped on load
+pyarrow is optional: without it the collectors skip the snapshot and readers fall back to CSV
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+except ImportError:
+    pa = None
+    ipc = None
+
+STATS_SNAPSHOT_PATH = 'stats.arrow'
+CURRENT_PLAYERS_SNAPSHOT_PATH = 'current_season_players.arrow'
+
+# Low-cardinality text columns stored dictionary-encoded
+CATEGORICAL_COLUMNS = {
+    'Team', 'Pos', 'Nation', 'Age', 'MP', 'Starts', 'PK', 'xG', 'npxG',
+    'team', 'position',
+}
+
+def is_available():
+    """Whether pyarrow is installed so snapshots can be written and read"""
+    return pa is not None
+
+def compact_int_dtype(values):
+    """Smallest signed integer dtype that holds every value of an integer column"""
+    if len(values) == 0:
+        return np.int16
+    low, high = values.min(), values.max()
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return dtype
+    return np.int64
+
+def to_typed_frame(df):
+    """Return a copy of df with categorical text columns and compact integer columns"""
+    typed = {}
+    for column in df.columns:
+        values = df[column]
+        if column in CATEGORICAL_COLUMNS:
+            typed[column] = values.astype(str).astype('category')
+        elif pd.api.types.is_integer_dtype(values.dtype):
+            typed[column] = values.astype(compact_int_dtype(values.to_numpy()))
+        else:
+            typed[column] = values
+    return pd.DataFrame(typed, index=df.index)
+
+def write_snapshot(df, path):
+    """Write df as an uncompressed Arrow IPC file (memory-mappable); returns False without pyarrow"""
+    if pa is None:
+        return False
+
+    table = pa.Table.from_pandas(to_typed_frame(df), preserve_index=False)
+    write_snapshot_batches(table.schema, table.to_batches(), path)
+    return True
+
+def write_snapshot_batches(schema, batches, path):
+    """Stream record batches into an Arrow IPC file, replacing path once it is complete; returns the row count"""
+    rows = 0
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with pa.OSFile(tmp_path, 'wb') as sink:
+        with ipc.new_file(sink, schema) as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+                rows += batch.num_rows
+    os.replace(tmp_path, path)
+    return rows
+
+def read_snapshot_table(path):
+    """Memory-map an Arrow IPC snapshot as a pyarrow Table (columns stay backed by the file)"""
+    source = pa.memory_map(path, 'r')
+    return ipc.open_file(source).read_all()
+
+def read_snapshot(path):
+    """Load a snapshot as a typed DataFrame; split blocks let numeric columns stay zero-copy views of the map"""
+    return read_snapshot_table(path).to_pandas(split_blocks=True)
+
+def snapshot_is_fresh(snapshot_path, csv_path):
+    """Whether a snapshot exists and is at least as new as the CSV it mirrors"""
+    if pa is None or not os.path.exists(snapshot_path):
+        return False
+    if not os.path.exists(csv_path):
+        return True
+    return os.path.getmtime(snapshot_path) >= os.path.getmtime(csv_path)
@@ -4,23 +4,22 @@ Collects latest Premier League data using official APIs
 Bypasses web scraping limitations with Cloudflare protection
 """
 
-import requests
-import pandas as pd
 import json
 import time
 from datetime import datetime
 
-def get_latest_premier_league_data():
+from columnar_snapshot import STATS_SNAPSHOT_PATH, write_snapshot
+from fpl_client import fetch_bootstrap_static
+from fpl_transform import current_gameweek, stats_frame
+
+def get_latest_premier_league_data(save_csv=True, show_highlights=True):
     """
     Collect the most up-to-date Premier League statistics
     Uses Fantasy Premier League official API for 2025/26 season data
-    """
     
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-        'Accept': 'application/json, text/plain, */*',
-        'Accept-Language': 'en-US,en;q=0.9',
-    }
+    Returns the player stats DataFrame (or None on failure) so callers such as
+    the API server can use it in-process; save_csv=False skips the CSV/log files
+    """
     
     print("=== PREMIER LEAGUE DATA COLLECTOR (UPDATED) ===")
     print(f"Collection Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -30,106 +29,49 @@ def get_latest_premier_league_data():
     try:
         print("🔄 Fetching latest Premier League data...")
         
-        # Official Fantasy Premier League API
-        fpl_url = "https://fantasy.premierleague.com/api/bootstrap-static/"
-        response = requests.get(fpl_url, headers=headers, timeout=30)
-        
-        if response.status_code != 200:
-            print(f"❌ API request failed with status code: {response.status_code}")
-            return False
-        
-        fpl_data = response.json()
+        # Official Fantasy Premier League API (shared, cached bootstrap-static fetch)
+        fpl_data = fetch_bootstrap_static()
         
-        # Get current gameweek
-        current_gw = None
-        for gw in fpl_data['events']:
-            if gw['is_current']:
-                current_gw = gw['id']
-                break
-        
-        if not current_gw:
-            current_gw = max([gw['id'] for gw in fpl_data['events'] if gw.get('finished', False)])
+        current_gw = current_gameweek(fpl_data)
         
         print(f"📊 Current Gameweek: {current_gw}")
         
-        # Extract teams mapping
-        teams = {team['id']: team['name'] for team in fpl_data['teams']}
-        positions = {pos['id']: pos['singular_name_short'] for pos in fpl_data['element_types']}
-        
-        # Process player data (same format as original script for compatibility)
-        all_players_data = []
-        players = fpl_data['elements']
-        
-        for player in players:
-            # Create data in similar format to original scraping script
-            all_players_data.append({
-                'Player': f"{player['first_name']} {player['second_name']}",
-                'Nation': '',  # Not available in FPL API
-                'Pos': positions.get(player['element_type'], 'Unknown'),
-                'Age': '',     # Not available in FPL API
-                'MP': '',      # Games played not directly available
-                'Starts': '',  # Not available
-                'Min': player['minutes'],
-                'Gls': player['goals_scored'],
-                'Ast': player['assists'],
-                'PK': '',      # Penalties not separated in FPL
-                'CrdY': player['yellow_cards'],
-                'CrdR': player['red_cards'],
-                'xG': '',      # Expected goals not in basic FPL data
-                'npxG': '',    # Non-penalty xG not available
-                'Team': teams.get(player['team'], 'Unknown'),
-                # Additional FPL-specific data
-                'total_points': player['total_points'],
-                'clean_sheets': player['clean_sheets'],
-                'saves': player['saves'],
-                'bonus': player['bonus'],
-                'influence': float(player['influence']),
-                'creativity': float(player['creativity']),
-                'threat': float(player['threat']),
-                'price': player['now_cost'] / 10,
-                'selected_by_percent': float(player['selected_by_percent']),
-                'form': float(player['form']),
-                'points_per_game': float(player['points_per_game']) if player['points_per_game'] else 0.0,
-            })
-        
-        # Convert to DataFrame and save (maintaining compatibility with original script)
-        stat_df = pd.DataFrame(all_players_data)
-        stat_df.to_csv("stats.csv", index=False)
-        
-        print(f"✅ Successfully collected data for {len(all_players_data)} players")
-        print(f"✅ Data saved to stats.csv")
-        
-        # Save additional current season specific file
-        stat_df.to_csv("stats_latest_api.csv", index=False)
-        print(f"✅ Also saved to stats_latest_api.csv")
-        
-        # Display some current season highlights
-        print(f"\n🏆 === CURRENT SEASON HIGHLIGHTS ===")
-        
-        top_scorers = stat_df.nlargest(5, 'Gls')[['Player', 'Team', 'Gls', 'Ast', 'total_points']]
-        print(f"\n🥅 TOP 5 GOALSCORERS:")
-        for idx, player in top_scorers.iterrows():
-            print(f"   {player['Gls']:2d} goals - {player['Player']} ({player['Team']})")
-        
-        top_assists = stat_df.nlargest(5, 'Ast')[['Player', 'Team', 'Ast', 'Gls', 'total_points']]
-        print(f"\n🎯 TOP 5 ASSIST PROVIDERS:")
-        for idx, player in top_assists.iterrows():
-            print(f"   {player['Ast']:2d} assists - {player['Player']} ({player['Team']})")
+        # Process player data as column operations (same format as original script for compatibility)
+        stat_df = stats_frame(fpl_data)
+        print(f"✅ Successfully collected data for {len(stat_df)} players")
+        
+        if save_csv:
+            save_stats_csv(stat_df)
+        
+        if show_highlights:
+            # Display some current season highlights
+            print(f"\n🏆 === CURRENT SEASON HIGHLIGHTS ===")
+            
+            top_scorers = stat_df.nlargest(5, 'Gls')[['Player', 'Team', 'Gls', 'Ast', 'total_points']]
+            print(f"\n🥅 TOP 5 GOALSCORERS:")
+            for idx, player in top_scorers.iterrows():
+                print(f"   {player['Gls']:2d} goals - {player['Player']} ({player['Team']})")
+            
+            top_assists = stat_df.nlargest(5, 'Ast')[['Player', 'Team', 'Ast', 'Gls', 'total_points']]
+            print(f"\n🎯 TOP 5 ASSIST PROVIDERS:")
+            for idx, player in top_assists.iterrows():
+                print(f"   {player['Ast']:2d} assists - {player['Player']} ({player['Team']})")
         
         # Create summary
         summary = {
             'collection_date': datetime.now().isoformat(),
             'season': '2025/26',
             'current_gameweek': current_gw,
-            'total_players': len(all_players_data),
+            'total_players': len(stat_df),
             'data_source': 'Fantasy Premier League Official API',
             'status': 'SUCCESS - Latest data collected'
         }
         
-        with open('data_collection_log.json', 'w') as f:
-            json.dump(summary, f, indent=2)
+        if save_csv:
+            with open('data_collection_log.json', 'w') as f:
+                json.dump(summary, f, indent=2)
         
-        return True
+        return stat_df
         
     except Exception as e:
         print(f"❌ Error collecting data: {e}")
@@ -142,13 +84,27 @@ def get_latest_premier_league_data():
             'note': 'API collection failed'
         }
         
-        with open('data_collection_log.json', 'w') as f:
-            json.dump(error_summary, f, indent=2)
+        if save_csv:
+            with open('data_collection_log.json', 'w') as f:
+                json.dump(error_summary, f, indent=2)
         
-        return False
+        return None
+
+def save_stats_csv(stat_df):
+    """Persist collected stats to stats.csv, the stats_latest_api.csv backup and the columnar snapshot"""
+    stat_df.to_csv("stats.csv", index=False)
+    print(f"✅ Data saved to stats.csv")
+    
+    # Save additional current season specific file
+    stat_df.to_csv("stats_latest_api.csv", index=False)
+    print(f"✅ Also saved to stats_latest_api.csv")
+    
+    # Typed Arrow snapshot the API server memory-maps instead of re-parsing the CSV
+    if write_snapshot(stat_df, STATS_SNAPSHOT_PATH):
+        print(f"✅ Columnar snapshot saved to {STATS_SNAPSHOT_PATH}")
 
 if __name__ == "__main__":
-    success = get_latest_premier_league_data()
+    success = get_latest_premier_league_data() is not None
     
     if success:
         print(f"\n✅ SUCCESS! Latest Premier League data has been collected!")
@@ -1,16 +1,16 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
-from io import StringIO
-import pandas as pd
-import time
-import os
+# Selenium, pandas and the source collector are imported by the functions that use them, so the
+# script starts quickly and the ESPN / football-data.org fallback runs without Selenium installed
+from html_tables import scan_html
+from team_scraper import (
+    DEFAULT_WORKERS, FBREF_MIN_INTERVAL, LEAGUE_URL, DriverPool, HostRateLimiter,
+    scrape_team_pages, squad_urls,
+)
 
 def setup_driver():
     """Setup Chrome driver with options to bypass bot detection"""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    
     options = Options()
     options.add_argument('--no-sandbox')
     options.add_argument('--disable-dev-shm-usage')
@@ -32,96 +32,71 @@ def setup_driver():
         print("Make sure Chrome and ChromeDriver are installed")
         return None
 
-def get_team_stats_selenium():
-    """Get Premier League team stats using Selenium"""
-    driver = setup_driver()
-    if not driver:
+def wait_for_table(driver, css_selector='table.stats_table', timeout=30):
+    """Wait until a table is present (this also rides out a Cloudflare check) and return its HTML"""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+    
+    table = WebDriverWait(driver, timeout).until(
+        EC.presence_of_element_located((By.CSS_SELECTOR, css_selector))
+    )
+    return table.get_attribute('outerHTML')
+
+def selenium_table_fetcher(pool, timeout=30):
+    """fetch(url) -> stats table HTML using a driver checked out of the pool"""
+    def fetch(url):
+        with pool.driver() as driver:
+            driver.get(url)
+            return wait_for_table(driver, timeout=timeout)
+    return fetch
+
+def get_team_stats_selenium(workers=DEFAULT_WORKERS, min_interval=FBREF_MIN_INTERVAL):
+    """Get Premier League team stats using a pool of Selenium drivers"""
+    try:
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
+    except ImportError:
+        print("Selenium is not installed (pip install selenium)")
         return False
     
-    all_teams = []
+    pool = DriverPool(setup_driver, size=workers)
+    limiter = HostRateLimiter(min_interval)
     
     try:
         print("Fetching Premier League main page with Selenium...")
-        driver.get("https://fbref.com/en/comps/9/Premier-League-Stats")
-        
-        # Wait for the page to load and check if we're blocked
-        time.sleep(5)
-        
-        # Check if we hit Cloudflare protection
-        if "Just a moment" in driver.title or "cloudflare" in driver.page_source.lower():
-            print("Cloudflare protection detected. Waiting...")
-            time.sleep(10)  # Wait longer for Cloudflare to pass
-        
-        # Get page source after potential Cloudflare check
-        html = driver.page_source
-        soup = BeautifulSoup(html, "lxml")
-        
-        # Look for stats tables
-        tables = soup.find_all('table', class_="stats_table")
-        
-        if not tables:
-            print("No stats_table found. Looking for alternative table structures...")
-            # Check for other possible table classes
-            all_tables = soup.find_all('table')
-            print(f"Found {len(all_tables)} total tables")
-            
-            # Look for tables with team data
-            for table in all_tables:
-                links = table.find_all('a')
-                squad_links = [l for l in links if l.get('href') and '/squads/' in l.get('href')]
-                if squad_links:
-                    tables = [table]
-                    break
-        
-        if not tables:
-            print("No suitable tables found")
-            return False
+        with pool.driver() as driver:
+            limiter.wait(LEAGUE_URL)
+            driver.get(LEAGUE_URL)
             
-        table = tables[0]
-        links = table.find_all('a')
-        links = [l.get("href") for l in links]
-        links = [l for l in links if l and "/squads" in l]
+            # Wait for any squad link instead of sleeping through a possible Cloudflare check
+            WebDriverWait(driver, 30).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, 'table a[href*="/squads/"]'))
+            )
+            html = driver.page_source
+        
+        # One streaming pass finds the stats table and any table linking to team squads
+        scan = scan_html(html, link_text='/squads')
+        links = scan['links']
+        if scan['rows'] is None:
+            print("No stats_table found. Looking for alternative table structures...")
+            links = scan['fallback_links']
+            if not links:
+                print("No suitable tables found")
+                return False
         
-        if not links:
+        team_urls = squad_urls(links)
+        if not team_urls:
             print("No team links found")
             return False
-            
-        team_urls = [f"https://fbref.com{l}" for l in links]
-        print(f"Found {len(team_urls)} teams to scrape")
         
-        # Scrape each team
-        for i, team_url in enumerate(team_urls):
-            team_name = team_url.split("/")[-1].replace("-Stats", "").replace("Stats", "")
-            print(f"Scraping team {i+1}/{len(team_urls)}: {team_name}")
-            
-            try:
-                driver.get(team_url)
-                time.sleep(3)  # Wait for page to load
-                
-                html = driver.page_source
-                soup = BeautifulSoup(html, "lxml")
-                stats_tables = soup.find_all("table", class_="stats_table")
-                
-                if not stats_tables:
-                    print(f"No stats_table found for team: {team_name}")
-                    continue
-                    
-                stats = stats_tables[0]
-                
-                # Convert table to DataFrame
-                html_data = StringIO(str(stats))
-                team_data = pd.read_html(html_data)[0]
-                team_data["Team"] = team_name
-                all_teams.append(team_data)
-                
-                # Random delay to avoid being too aggressive
-                time.sleep(2 + (i % 3))  # 2-4 second delay
-                
-            except Exception as e:
-                print(f"Error scraping {team_name}: {e}")
-                continue
+        print(f"Found {len(team_urls)} teams to scrape with {workers} browsers")
+        all_teams = scrape_team_pages(team_urls, selenium_table_fetcher(pool), workers=workers, limiter=limiter)
         
         if all_teams:
+            import pandas as pd
+            
             print(f"Successfully scraped {len(all_teams)} teams")
             stat_df = pd.concat(all_teams, ignore_index=True)
             stat_df.to_csv("stats_latest.csv", index=False)
@@ -136,47 +111,17 @@ def get_team_stats_selenium():
         return False
         
     finally:
-        driver.quit()
+        pool.close()
 
 def get_alternative_data():
     """Alternative: Use ESPN or other API for Premier League data"""
-    try:
-        print("Trying alternative data source (ESPN)...")
-        
-        # ESPN Premier League standings API (public)
-        espn_url = "https://site.api.espn.com/apis/site/v2/sports/soccer/eng.1/teams"
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        }
-        
-        response = requests.get(espn_url, headers=headers)
-        
-        if response.status_code == 200:
-            data = response.json()
-            teams_data = []
-            
-            for team in data.get('sports', [{}])[0].get('leagues', [{}])[0].get('teams', []):
-                team_info = team.get('team', {})
-                teams_data.append({
-                    'team_name': team_info.get('displayName', ''),
-                    'abbreviation': team_info.get('abbreviation', ''),
-                    'location': team_info.get('location', ''),
-                    'color': team_info.get('color', ''),
-                    'logo': team_info.get('logos', [{}])[0].get('href', '') if team_info.get('logos') else ''
-                })
-            
-            if teams_data:
-                df = pd.DataFrame(teams_data)
-                df.to_csv("premier_league_teams_latest.csv", index=False)
-                print(f"Saved {len(teams_data)} Premier League teams to premier_league_teams_latest.csv")
-                return True
-        
-        return False
-        
-    except Exception as e:
-        print(f"Error with alternative data source: {e}")
-        return False
+    from source_collector import collect_to_csv
+    
+    print("Trying alternative data sources (ESPN, football-data.org)...")
+    
+    # Team info and standings come from the concurrent collector (pooled session, per-source timeouts)
+    written = collect_to_csv(['espn_teams', 'espn_standings', 'football_data'])
+    return bool(written)
 
 if __name__ == "__main__":
     print("=== Premier League Data Collector ===")
@@ -0,0 +1,169 @@
+"""
+Shared Fantasy Premier League fetch layer
+One pooled requests.Session plus an on-disk response cache with ETag/Last-Modified revalidation,
+so every collector in a refresh reuses a single bootstrap-static download
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Override with a local stub server (e.g. http://127.0.0.1:8000/api) for offline testing
+FPL_API_BASE = os.environ.get('FPL_API_BASE', 'https://fantasy.premierleague.com/api').rstrip('/')
+CACHE_DIR = os.environ.get('FPL_CACHE_DIR', '.fpl_cache')
+
+# Responses younger than this are reused without touching the network
+DEFAULT_MAX_AGE = 300
+
+# Parsed bodies kept in memory (least recently used dropped first): bootstrap-static, which every
+# collector reads, plus room for one more, so per-gameweek payloads do not pile up
+PARSED_CACHE_SIZE = 2
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'application/json, text/plain, */*',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+
+_session = None
+_session_lock = threading.Lock()
+_url_locks = {}
+_parsed = OrderedDict()  # url -> (body digest, parsed JSON) so repeated reads skip json.loads
+_parsed_lock = threading.Lock()
+
+def get_session():
+    """Return the process-wide pooled session, creating it on first use"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            session.headers.update(DEFAULT_HEADERS)
+            retries = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504))
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retries)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _session = session
+        return _session
+
+def _url_lock(url):
+    """Per-URL lock so concurrent callers share one download instead of racing"""
+    with _session_lock:
+        return _url_locks.setdefault(url, threading.Lock())
+
+def _cache_paths(url, cache_dir):
+    """Body and metadata file paths for a URL's cache entry"""
+    key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+    return os.path.join(cache_dir, f'{key}.body'), os.path.join(cache_dir, f'{key}.meta.json')
+
+def _read_cache(url, cache_dir):
+    """Load a cache entry's metadata, or None if it is missing or unreadable"""
+    body_path, meta_path = _cache_paths(url, cache_dir)
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not os.path.exists(body_path):
+        return None
+    meta['body_path'] = body_path
+    meta['meta_path'] = meta_path
+    return meta
+
+def _write_atomic(path, data):
+    """Write bytes to path via a temp file so readers never see a partial file"""
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def _write_cache(url, cache_dir, body, response):
+    """Store a fresh response body and its validators"""
+    os.makedirs(cache_dir, exist_ok=True)
+    body_path, meta_path = _cache_paths(url, cache_dir)
+    meta = {
+        'url': url,
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+        'fetched_at': time.time(),
+        'digest': hashlib.sha1(body).hexdigest(),
+    }
+    _write_atomic(body_path, body)
+    _write_atomic(meta_path, json.dumps(meta).encode('utf-8'))
+    return meta
+
+def _touch_cache(meta):
+    """Mark a revalidated cache entry as fresh again"""
+    stored = {k: v for k, v in meta.items() if k not in ('body_path', 'meta_path')}
+    stored['fetched_at'] = time.time()
+    _write_atomic(meta['meta_path'], json.dumps(stored).encode('utf-8'))
+
+def _remember_parsed(url, digest, data):
+    """Keep a parsed body for reuse, dropping the least recently used beyond PARSED_CACHE_SIZE"""
+    with _parsed_lock:
+        _parsed[url] = (digest, data)
+        _parsed.move_to_end(url)
+        while len(_parsed) > PARSED_CACHE_SIZE:
+            _parsed.popitem(last=False)
+
+def _load_body(url, meta, body_path):
+    """Parse a cached body, reusing the in-memory parse when the content is unchanged"""
+    cached = _parsed.get(url)
+    if cached and cached[0] == meta['digest']:
+        _remember_parsed(url, *cached)
+        return cached[1]
+    with open(body_path, 'rb') as f:
+        data = json.loads(f.read())
+    _remember_parsed(url, meta['digest'], data)
+    return data
+
+def fetch_json(url, max_age=DEFAULT_MAX_AGE, cache_dir=None, timeout=30):
+    """
+    Fetch a JSON document through the shared session and disk cache
+    Fresh entries are served from disk, stale ones are revalidated with
+    If-None-Match/If-Modified-Since and served as they are if the upstream fails (after the
+    session's retries); raises requests.RequestException on failure with nothing cached
+    The result may be the same object other callers get, so it must be treated as read-only
+    """
+    cache_dir = cache_dir or CACHE_DIR
+
+    with _url_lock(url):
+        meta = _read_cache(url, cache_dir)
+        if meta and max_age is not None and time.time() - meta['fetched_at'] < max_age:
+            return _load_body(url, meta, meta['body_path'])
+
+        headers = {}
+        if meta:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        try:
+            response = get_session().get(url, headers=headers, timeout=timeout)
+            if response.status_code == 304 and meta:
+                _touch_cache(meta)
+                return _load_body(url, meta, meta['body_path'])
+            response.raise_for_status()
+        except requests.RequestException as e:
+            if not meta:
+                raise
+            age = time.time() - meta['fetched_at']
+            print(f"⚠️ {url} failed ({e}); using the copy cached {age:.0f}s ago")
+            return _load_body(url, meta, meta['body_path'])
+
+        body = response.content
+        data = json.loads(body)
+        new_meta = _write_cache(url, cache_dir, body, response)
+        _remember_parsed(url, new_meta['digest'], data)
+        return data
+
+def fetch_bootstrap_static(max_age=DEFAULT_MAX_AGE, cache_dir=None, timeout=30):
+    """Fetch the FPL bootstrap-static payload (players, teams, positions, gameweeks)"""
+    return fetch_json(f'{FPL_API_BASE}/bootstrap-static/', max_age=max_age, cache_dir=cache_dir, timeout=timeout)
@@ -0,0 +1,223 @@
+"""
+Columnar transforms from the FPL bootstrap-static payload to the collectors' output frames
+The elements list is loaded into one DataFrame and every mapping, cast and concatenation
+runs as a column operation instead of a per-player Python loop
+"""
+
+from itertools import compress
+from operator import itemgetter
+
+import numpy as np
+import pandas as pd
+
+# Raw element fields used by any of the collectors
+ELEMENT_FIELDS = [
+    'id', 'first_name', 'second_name', 'team', 'element_type',
+    'total_points', 'goals_scored', 'assists', 'clean_sheets', 'minutes',
+    'yellow_cards', 'red_cards', 'saves', 'bonus',
+    'influence', 'creativity', 'threat', 'selected_by_percent', 'now_cost',
+    'form', 'points_per_game', 'dreamteam_count', 'value_form', 'value_season',
+    'news', 'chance_of_playing_this_round', 'chance_of_playing_next_round',
+]
+
+# Integer counters are packed straight into int64 arrays
+INT_FIELDS = {
+    'id', 'team', 'element_type', 'total_points', 'goals_scored', 'assists',
+    'clean_sheets', 'minutes', 'yellow_cards', 'red_cards', 'saves', 'bonus',
+    'now_cost', 'dreamteam_count',
+}
+
+# Subsets needed by stats.csv and premier_league_players_latest.csv
+STATS_FIELDS = [
+    'total_points', 'goals_scored', 'assists', 'clean_sheets', 'minutes',
+    'yellow_cards', 'red_cards', 'saves', 'bonus', 'influence', 'creativity',
+    'threat', 'selected_by_percent', 'form', 'points_per_game',
+]
+LATEST_FIELDS = ['id', *STATS_FIELDS]
+
+def lookup_names(codes, mapping):
+    """Map an integer code array to names through a dense lookup table ('Unknown' if missing)"""
+    size = max(max(mapping, default=0), int(codes.max(initial=0))) + 1
+    table = np.full(size, 'Unknown', dtype=object)
+    for code, name in mapping.items():
+        table[code] = name
+    return table[codes]
+
+def elements_frame(fpl_data, fields=ELEMENT_FIELDS, position_field='singular_name_short'):
+    """Load the requested element fields into one frame with team/position names and full names"""
+    elements = fpl_data['elements']
+    fields = list(dict.fromkeys(['first_name', 'second_name', 'team', 'element_type', 'now_cost', *fields]))
+
+    # Pull every requested field into one 2-D object array in a single C-level pass
+    if elements:
+        rows = np.array(list(map(itemgetter(*fields), elements)), dtype=object)
+    else:
+        rows = np.empty((0, len(fields)), dtype=object)
+
+    data = {}
+    for position, field in enumerate(fields):
+        values = rows[:, position]
+        if field in INT_FIELDS:
+            data[field] = values.astype(np.int64)
+        elif field.startswith('chance_of_playing'):
+            data[field] = pd.Series(values, dtype=object).astype(float)  # None becomes NaN
+        else:
+            data[field] = values
+
+    teams = {team['id']: team['name'] for team in fpl_data['teams']}
+    positions = {pos['id']: pos[position_field] for pos in fpl_data['element_types']}
+
+    data['team_name'] = lookup_names(data['team'], teams)
+    data['position_name'] = lookup_names(data['element_type'], positions)
+    data['full_name'] = data['first_name'] + ' ' + data['second_name']
+    data['price'] = data['now_cost'] / 10
+
+    # Object columns are kept as object so pandas does not re-scan them to infer a string dtype
+    return pd.DataFrame({
+        name: pd.Series(values, dtype=object) if getattr(values, 'dtype', None) == object else values
+        for name, values in data.items()
+    }, copy=False)
+
+def to_float(column, empty_as_zero=False):
+    """Cast a column of numeric strings to float; optionally treat ''/None as 0.0"""
+    values = column.to_numpy(dtype=object)
+    if empty_as_zero:
+        missing = pd.isna(values) | (values == '')
+        if missing.any():
+            values = values.copy()
+            values[missing] = 0.0
+    return pd.Series(values.astype(float), index=column.index)
+
+def stats_frame(fpl_data):
+    """Build the stats.csv frame (fbref-compatible columns plus FPL extras)"""
+    elements = elements_frame(fpl_data, STATS_FIELDS)
+    empty = pd.Series('', index=elements.index, dtype=object)
+
+    return pd.DataFrame({
+        'Player': elements['full_name'],
+        'Nation': empty,  # Not available in FPL API
+        'Pos': elements['position_name'],
+        'Age': empty,     # Not available in FPL API
+        'MP': empty,      # Games played not directly available
+        'Starts': empty,  # Not available
+        'Min': elements['minutes'],
+        'Gls': elements['goals_scored'],
+        'Ast': elements['assists'],
+        'PK': empty,      # Penalties not separated in FPL
+        'CrdY': elements['yellow_cards'],
+        'CrdR': elements['red_cards'],
+        'xG': empty,      # Expected goals not in basic FPL data
+        'npxG': empty,    # Non-penalty xG not available
+        'Team': elements['team_name'],
+        # Additional FPL-specific data
+        'total_points': elements['total_points'],
+        'clean_sheets': elements['clean_sheets'],
+        'saves': elements['saves'],
+        'bonus': elements['bonus'],
+        'influence': to_float(elements['influence']),
+        'creativity': to_float(elements['creativity']),
+        'threat': to_float(elements['threat']),
+        'price': elements['price'],
+        'selected_by_percent': to_float(elements['selected_by_percent']),
+        'form': to_float(elements['form']),
+        'points_per_game': to_float(elements['points_per_game'], empty_as_zero=True),
+    }, copy=False)
+
+def current_season_players_frame(fpl_data):
+    """Build the current_season_players.csv frame (players with points or minutes only)"""
+    # Only include players who have played this season; the mask is computed on two
+    # columns first so the remaining fields are extracted for the kept players only
+    raw = fpl_data['elements']
+    points = np.fromiter(map(itemgetter('total_points'), raw), dtype=np.int64, count=len(raw))
+    minutes = np.fromiter(map(itemgetter('minutes'), raw), dtype=np.int64, count=len(raw))
+    raw = list(compress(raw, (points > 0) | (minutes > 0)))
+    elements = elements_frame({**fpl_data, 'elements': raw})
+
+    return pd.DataFrame({
+        'player_id': elements['id'],
+        'name': elements['full_name'],
+        'team': elements['team_name'],
+        'position': elements['position_name'],
+        'total_points': elements['total_points'],
+        'goals': elements['goals_scored'],
+        'assists': elements['assists'],
+        'clean_sheets': elements['clean_sheets'],
+        'minutes_played': elements['minutes'],
+        'yellow_cards': elements['yellow_cards'],
+        'red_cards': elements['red_cards'],
+        'saves': elements['saves'],
+        'bonus_points': elements['bonus'],
+        'influence': to_float(elements['influence']),
+        'creativity': to_float(elements['creativity']),
+        'threat': to_float(elements['threat']),
+        'selected_by_percent': to_float(elements['selected_by_percent']),
+        'price': elements['price'],
+        'form': to_float(elements['form']),
+        'points_per_game': to_float(elements['points_per_game'], empty_as_zero=True),
+        'dreamteam_count': elements['dreamteam_count'],
+        'value_form': to_float(elements['value_form']),
+        'value_season': to_float(elements['value_season']),
+        'news': elements['news'],
+        'chance_of_playing_this_round': elements['chance_of_playing_this_round'],
+        'chance_of_playing_next_round': elements['chance_of_playing_next_round'],
+    }, copy=False)
+
+def latest_players_frame(fpl_data):
+    """Build the premier_league_players_latest.csv frame (raw FPL values, full position names)"""
+    elements = elements_frame(fpl_data, LATEST_FIELDS, position_field='singular_name')
+
+    return pd.DataFrame({
+        'id': elements['id'],
+        'name': elements['full_name'],
+        'team': elements['team_name'],
+        'position': elements['position_name'],
+        'total_points': elements['total_points'],
+        'goals_scored': elements['goals_scored'],
+        'assists': elements['assists'],
+        'clean_sheets': elements['clean_sheets'],
+        'minutes': elements['minutes'],
+        'yellow_cards': elements['yellow_cards'],
+        'red_cards': elements['red_cards'],
+        'saves': elements['saves'],
+        'bonus': elements['bonus'],
+        'influence': elements['influence'],
+        'creativity': elements['creativity'],
+        'threat': elements['threat'],
+        'selected_by_percent': elements['selected_by_percent'],
+        'now_cost': elements['price'],  # Convert from tenths
+        'form': elements['form'],
+        'points_per_game': elements['points_per_game'],
+    }, copy=False)
+
+def latest_teams_frame(fpl_data):
+    """Build the premier_league_teams_latest.csv frame from the FPL team records"""
+    teams = pd.DataFrame(fpl_data['teams'])
+
+    return pd.DataFrame({
+        'id': teams['id'],
+        'name': teams['name'],
+        'short_name': teams['short_name'],
+        'played': teams['played'],
+        'wins': teams['win'],
+        'draws': teams['draw'],
+        'losses': teams['loss'],
+        'goals_for': teams['points'],  # This might need adjustment
+        'goals_against': teams.get('goals_against', 0),
+        'goal_difference': teams.get('goal_difference', 0),
+        'points': teams.get('points', 0),
+        'position': teams.get('position', 0),
+        'strength_overall_home': teams['strength_overall_home'],
+        'strength_overall_away': teams['strength_overall_away'],
+        'strength_attack_home': teams['strength_attack_home'],
+        'strength_attack_away': teams['strength_attack_away'],
+        'strength_defence_home': teams['strength_defence_home'],
+        'strength_defence_away': teams['strength_defence_away'],
+    }, copy=False)
+
+def current_gameweek(fpl_data):
+    """The gameweek marked current, else the last finished one (None before the season starts)"""
+    for gw in fpl_data['events']:
+        if gw['is_current']:
+            return gw['id']
+    finished = [gw['id'] for gw in fpl_data['events'] if gw['finished']]
+    return max(finished) if finished else None
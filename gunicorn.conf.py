@@ -0,0 +1,21 @@
+"""
+gunicorn settings for wsgi:app
+STATS_WORKERS, STATS_THREADS, STATS_BIND and STATS_REFRESH_SECONDS override the defaults
+"""
+
+import multiprocessing
+import os
+
+bind = os.environ.get('STATS_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('STATS_WORKERS', min(multiprocessing.cpu_count(), 8)))
+# Requests are short and the refresh runs in its own thread, so a few threads per worker suffice
+worker_class = 'gthread'
+threads = int(os.environ.get('STATS_THREADS', 4))
+timeout = 60
+# Workers import the app themselves so each starts its own background threads after the fork
+preload_app = False
+
+def post_worker_init(worker):
+    from stats_api_server import start_shared_worker
+
+    start_shared_worker(refresh_interval=int(os.environ.get('STATS_REFRESH_SECONDS', 3600)))
@@ -0,0 +1,227 @@
+"""
+Streaming HTML table extraction
+Pages are fed to lxml's pull parser chunk by chunk; one pass finds the first table with a
+given class, records its rows and the links inside it, and stops reading as soon as that
+table closes. Everything else is discarded as it streams past, so no page tree is kept.
+Rows go through pandas' TextParser with read_html's header, span and typing rules, so
+the frame matches pd.read_html on the same table
+"""
+
+import re
+
+from lxml import etree
+
+# Same whitespace folding pandas.read_html applies to cell text
+WHITESPACE = re.compile(r"[\r\n]+|\s{2,}")
+
+CHUNK_SIZE = 64 * 1024
+
+SECTIONS = ('thead', 'tbody', 'tfoot')
+EVENT_TAGS = ('table', 'tr', 'a', *SECTIONS)
+
+def iter_chunks(source, chunk_size=CHUNK_SIZE):
+    """Yield str/bytes chunks from a string, bytes, or an iterable of chunks"""
+    if isinstance(source, (str, bytes)):
+        for start in range(0, len(source), chunk_size):
+            yield source[start:start + chunk_size]
+    else:
+        yield from source
+
+def is_hidden(element):
+    """Whether an element is styled display:none (read_html drops those)"""
+    return 'display:none' in (element.get('style') or '').replace(' ', '')
+
+def cell_text(cell):
+    """Visible text of a cell, with <br> as a line break, folded like read_html"""
+    parts = []
+
+    def collect(element):
+        if element.tag == 'br':
+            parts.append('\n')
+        elif element.text:
+            parts.append(element.text)
+        for child in element:
+            # Comments contribute no text, hidden children and <style> are dropped, tails always stay
+            if isinstance(child.tag, str) and child.tag != 'style' and not is_hidden(child):
+                collect(child)
+            if child.tail:
+                parts.append(child.tail)
+
+    collect(cell)
+    return WHITESPACE.sub(' ', ''.join(parts).strip())
+
+def row_cells(row):
+    """(tag, text, rowspan, colspan) for each visible td/th directly inside a row"""
+    cells = []
+    for cell in row:
+        if cell.tag in ('td', 'th') and not is_hidden(cell):
+            cells.append((
+                cell.tag,
+                cell_text(cell),
+                int(cell.get('rowspan') or 1),
+                int(cell.get('colspan') or 1),
+            ))
+    return cells
+
+def scan_html(source, class_name='stats_table', link_text=None, chunk_size=CHUNK_SIZE, encoding=None):
+    """
+    Stream a page once and return the first visible table whose class list has class_name
+    Returns {'rows': {section: [cells, ...]} or None, 'links': hrefs inside that table,
+    'fallback_links': hrefs of the first table of any class that has matching links}
+    Only hrefs containing link_text are kept (all hrefs when link_text is None)
+    """
+    # Only table structure and links raise Python-level events; everything else stays in C
+    parser = etree.HTMLPullParser(events=('start', 'end'), tag=EVENT_TAGS, encoding=encoding, recover=True)
+    result = {'rows': None, 'links': [], 'fallback_links': []}
+
+    depth = 0          # open <table> elements
+    target = False     # inside the outermost table we are extracting
+    section = None     # thead/tbody/tfoot of the target table (None for rows at its root)
+    table_links = []   # links of the current outermost table
+    rows = None
+
+    for chunk in iter_chunks(source, chunk_size):
+        parser.feed(chunk)
+        for event, element in parser.read_events():
+            tag = element.tag
+            if event == 'start':
+                if tag == 'table':
+                    depth += 1
+                    if depth == 1:
+                        table_links = []
+                        classes = (element.get('class') or '').split()
+                        target = result['rows'] is None and class_name in classes and not is_hidden(element)
+                        if target:
+                            rows = {name: [] for name in SECTIONS}
+                            rows['root'] = []
+                elif tag == 'a' and depth:
+                    href = element.get('href')
+                    if href and (link_text is None or link_text in href):
+                        table_links.append(href)
+                elif target and depth == 1 and tag in SECTIONS:
+                    section = tag
+                continue
+
+            # end events
+            if target and depth == 1:
+                if tag == 'tr' and not is_hidden(element):
+                    parent = element.getparent()
+                    if parent is not None and parent.tag == 'table':
+                        rows['root'].append(row_cells(element))
+                    elif section is not None and not (section == 'thead' and parent is not None and parent.tag != 'thead'):
+                        rows[section].append(row_cells(element))
+                    element.clear()
+                    continue
+                if tag in SECTIONS:
+                    # <thead><th>..</th></thead> without a <tr> counts as a header row
+                    if tag == 'thead' and any(child.tag in ('td', 'th') for child in element):
+                        rows['thead'].append(row_cells(element))
+                    section = None
+                    continue
+
+            if tag == 'table':
+                depth -= 1
+                if depth == 0:
+                    if target:
+                        result['rows'] = rows
+                        result['links'] = table_links
+                        return result
+                    if table_links and not result['fallback_links']:
+                        result['fallback_links'] = table_links
+                    target = False
+
+            # Drop what has been parsed outside the target table so the page tree never builds up
+            if not target and depth == 0:
+                element.clear(keep_tail=False)
+                for node in element.iterancestors():
+                    while node.getprevious() is not None:
+                        del node.getparent()[0]
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+
+    return result
+
+def expand_spans(rows, remainder=None, overflow=True):
+    """Copy rowspan/colspan cell text into every cell it covers (same rules as read_html)"""
+    all_texts = []
+    remainder = remainder if remainder is not None else []
+
+    for cells in rows:
+        texts = []
+        next_remainder = []
+        index = 0
+        for _, text, rowspan, colspan in cells:
+            # Texts from earlier rows with rowspan > 1 that come before this cell
+            while remainder and remainder[0][0] <= index:
+                prev_index, prev_text, prev_rowspan = remainder.pop(0)
+                texts.append(prev_text)
+                if prev_rowspan > 1:
+                    next_remainder.append((prev_index, prev_text, prev_rowspan - 1))
+                index += 1
+            for _ in range(colspan):
+                texts.append(text)
+                if rowspan > 1:
+                    next_remainder.append((index, text, rowspan - 1))
+                index += 1
+
+        for prev_index, prev_text, prev_rowspan in remainder:
+            texts.append(prev_text)
+            if prev_rowspan > 1:
+                next_remainder.append((prev_index, prev_text, prev_rowspan - 1))
+        all_texts.append(texts)
+        remainder = next_remainder
+
+    if not overflow:
+        # Rows that only exist because an earlier row spanned into them
+        while remainder:
+            next_remainder = []
+            texts = []
+            for prev_index, prev_text, prev_rowspan in remainder:
+                texts.append(prev_text)
+                if prev_rowspan > 1:
+                    next_remainder.append((prev_index, prev_text, prev_rowspan - 1))
+            all_texts.append(texts)
+            remainder = next_remainder
+
+    return all_texts, remainder
+
+def rows_to_frame(rows, thousands=','):
+    """Build a typed DataFrame from scanned rows the way read_html would"""
+    header_rows = list(rows['thead'])
+    body_rows = rows['tbody'] + rows['root']
+    footer_rows = rows['tfoot']
+
+    if not header_rows:
+        # Without a <thead>, leading all-<th> rows are the header
+        while body_rows and all(tag == 'th' for tag, *_ in body_rows[0]):
+            header_rows.append(body_rows.pop(0))
+
+    head, remainder = expand_spans(header_rows)
+    body, remainder = expand_spans(body_rows, remainder, overflow=len(footer_rows) > 0)
+    foot, _ = expand_spans(footer_rows, remainder, overflow=False)
+
+    header = None
+    if head:
+        body = head + body
+        if len(head) == 1:
+            header = 0
+        else:
+            header = [i for i, row in enumerate(head) if any(text for text in row)]
+    body += foot
+
+    # Pad ragged rows
+    width = max((len(row) for row in body), default=0)
+    body = [row + [''] * (width - len(row)) for row in body]
+
+    # pandas loads only once a table is turned into a frame; scanning pages does not need it
+    from pandas.io.parsers import TextParser
+
+    with TextParser(body, header=header, thousands=thousands, skiprows=0) as parser:
+        return parser.read()
+
+def read_first_table(source, class_name='stats_table', chunk_size=CHUNK_SIZE, encoding=None):
+    """DataFrame of the first table with class_name in a page, or None if there is none"""
+    scan = scan_html(source, class_name=class_name, chunk_size=chunk_size, encoding=encoding)
+    if scan['rows'] is None:
+        return None
+    return rows_to_frame(scan['rows'])
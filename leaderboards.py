@@ -0,0 +1,61 @@
+"""
+Leaderboards for any numeric player column
+Every numeric column gets a presorted array of row ids when a snapshot is built, so a
+leaderboard query is a slice of that array, filtered by the requested rows, never a sort
+"""
+
+import numpy as np
+
+# Store column kinds that can be ranked
+RANKABLE_KINDS = ('int', 'float')
+
+# Columns included with every leaderboard entry besides the ranked stat
+LEADERBOARD_FIELDS = ['Player', 'Team', 'Pos']
+
+DEFAULT_SIZE = 10
+MAX_SIZE = 100
+
+def rankable_columns(store):
+    """Numeric columns of a store, in column order"""
+    return [column for column in store.columns if store.kinds[column] in RANKABLE_KINDS]
+
+def sorted_row_ids(values):
+    """Row ids ordered by value, largest first, ties in row order (like nlargest); NaN rows dropped"""
+    values = values.astype(np.float64)
+    order = np.argsort(-values, kind='stable')  # NaN sorts last
+    valid = np.count_nonzero(~np.isnan(values))
+    return order[:valid].astype(np.int32 if len(values) < 2 ** 31 else np.int64)
+
+def build_sorted_indexes(store):
+    """Presorted row ids for every numeric column of a store"""
+    return {column: sorted_row_ids(store.column(column)) for column in rankable_columns(store)}
+
+def top_row_ids(order, n, allowed=None):
+    """First n row ids of a presorted order, keeping only rows in the allowed mask"""
+    if allowed is None:
+        return order[:n]
+
+    # Scan growing windows so selective filters do not have to walk the whole order at once
+    found = []
+    count = 0
+    start = 0
+    window = max(4 * n, 256)
+    while start < len(order) and count < n:
+        chunk = order[start:start + window]
+        hits = chunk[allowed[chunk]]
+        found.append(hits)
+        count += len(hits)
+        start += window
+        window *= 2
+    if not found:
+        return order[:0]
+    return np.concatenate(found)[:n]
+
+def stat_leaderboard(store, sorted_indexes, stat, n=DEFAULT_SIZE, row_ids=None, fields=LEADERBOARD_FIELDS):
+    """Top n records for a stat, optionally restricted to the given row ids"""
+    allowed = None
+    if row_ids is not None:
+        allowed = np.zeros(len(store), dtype=bool)
+        allowed[np.asarray(row_ids, dtype=np.int64)] = True
+    ids = top_row_ids(sorted_indexes[stat], n, allowed)
+    return store.rows(ids, [field for field in fields if field != stat] + [stat])
@@ -0,0 +1,222 @@
+"""
+Match outcome predictions from the FPL team strength ratings
+There is no match history to fit a classifier on, so each side's goals are Poisson with a
+log-linear rate: the league's average home (or away) goals, scaled by how far one side's attack
+rating sits above the other side's defence rating, both centred on the league mean. Home win, draw
+and away win probabilities sum the two sides' independent score distributions. Every step works on
+arrays of fixtures, so a whole season or a batch of thousands is scored in one call
+"""
+
+import csv
+import os
+
+import numpy as np
+
+# Team files written by the collectors, best first; both carry the FPL strength columns
+TEAMS_SOURCES = ['current_season_teams.csv', 'premier_league_teams_latest.csv']
+STRENGTH_COLUMNS = [
+    'strength_attack_home', 'strength_attack_away',
+    'strength_defence_home', 'strength_defence_away',
+]
+
+# Roughly the Premier League's average goals per match for the home and away side
+HOME_GOALS = 1.53
+AWAY_GOALS = 1.23
+
+# Rating points of attack-over-defence advantage per e-fold in expected goals
+STRENGTH_SCALE = 400.0
+
+# Scores from 0 to MAX_GOALS per side are summed; the tail beyond is renormalized away
+MAX_GOALS = 10
+
+GOALS = np.arange(MAX_GOALS + 1)
+LOG_FACTORIALS = np.concatenate([[0.0], np.cumsum(np.log(GOALS[1:]))])
+# HOME_WIN_MASK[i, j] is 1 where i home goals beat j away goals
+HOME_WIN_MASK = np.tril(np.ones((MAX_GOALS + 1, MAX_GOALS + 1)), -1)
+
+class UnknownTeamError(ValueError):
+    """Fixtures naming teams that are not in the strength table"""
+
+    def __init__(self, teams):
+        super().__init__(f'Unknown team(s): {", ".join(map(str, teams))}')
+        self.teams = teams
+
+def poisson_pmf(rates):
+    """P(k goals) for k in 0..MAX_GOALS, one row per rate"""
+    rates = np.asarray(rates, dtype=np.float64)[:, None]
+    return np.exp(GOALS * np.log(rates) - rates - LOG_FACTORIALS)
+
+def outcome_probabilities(home_rates, away_rates):
+    """(home win, draw, away win, most likely home goals, most likely away goals) arrays"""
+    home = poisson_pmf(home_rates)
+    away = poisson_pmf(away_rates)
+    # (home @ HOME_WIN_MASK)[n, j] is P(home scores more than j)
+    home_win = ((home @ HOME_WIN_MASK) * away).sum(axis=1)
+    away_win = ((away @ HOME_WIN_MASK) * home).sum(axis=1)
+    draw = (home * away).sum(axis=1)
+    total = home_win + draw + away_win
+    # The joint mode of two independent distributions is the pair of their modes
+    return home_win / total, draw / total, away_win / total, home.argmax(axis=1), away.argmax(axis=1)
+
+def season_fixtures(teams):
+    """(home rows, away rows) of a double round robin: every team hosts every other once"""
+    home, away = np.nonzero(~np.eye(teams, dtype=bool))
+    return home, away
+
+def team_numbers(teams, *columns):
+    """One integer per team from the first of columns its row fills, 0 where it fills none"""
+    values = []
+    for team in teams:
+        value = next((team[column] for column in columns if team.get(column) not in (None, '')), 0)
+        values.append(int(float(value)))
+    return np.array(values, dtype=np.int64)
+
+def find_teams_source(sources=TEAMS_SOURCES):
+    """The first team file that exists and has every strength column, or None"""
+    for path in sources:
+        if not os.path.exists(path):
+            continue
+        with open(path, newline='', encoding='utf-8') as f:
+            header = next(csv.reader(f), [])
+        if all(column in header for column in STRENGTH_COLUMNS):
+            return path
+    return None
+
+class MatchPredictor:
+    """Centred strength arrays for every team plus a lookup from any team identifier to its row"""
+
+    def __init__(self, teams, source=None):
+        self.source = source
+        self.source_mtime = os.path.getmtime(source) if source else None
+        self.names = [team['name'] for team in teams]
+        self.short_names = [team.get('short_name') or team['name'] for team in teams]
+        self.ids = [int(team.get('team_id') or team.get('id') or row + 1) for row, team in enumerate(teams)]
+
+        strengths = {
+            column: np.array([float(team[column]) for team in teams]) for column in STRENGTH_COLUMNS
+        }
+        strengths = {column: values - values.mean() for column, values in strengths.items()}
+        self.attack_home = strengths['strength_attack_home']
+        self.attack_away = strengths['strength_attack_away']
+        self.defence_home = strengths['strength_defence_home']
+        self.defence_away = strengths['strength_defence_away']
+
+        # The current table, which season simulations start from
+        self.played = team_numbers(teams, 'played')
+        self.points = team_numbers(teams, 'league_points', 'points')
+        self.goal_difference = team_numbers(teams, 'goal_difference')
+        self.goals_for = team_numbers(teams, 'goals_for')
+
+        # Names, short names and ids in the forms clients send them; resolve() also tries lower case
+        self.lookup = {}
+        for row, (name, short_name, team_id) in enumerate(zip(self.names, self.short_names, self.ids)):
+            for key in (name, short_name, name.lower(), short_name.lower(), team_id, str(team_id)):
+                self.lookup.setdefault(key, row)
+
+    @classmethod
+    def from_csv(cls, path):
+        """A predictor over one of the collectors' team files"""
+        with open(path, newline='', encoding='utf-8') as f:
+            teams = list(csv.DictReader(f))
+        if not teams:
+            raise ValueError(f'No teams in {path}')
+        return cls(teams, source=path)
+
+    def is_current(self):
+        """Whether the team file this predictor was built from is unchanged"""
+        if self.source is None:
+            return True
+        try:
+            return os.path.getmtime(self.source) == self.source_mtime
+        except OSError:
+            return False
+
+    def resolve(self, teams):
+        """Row numbers of team names, short names or ids; UnknownTeamError lists any others"""
+        rows = [self.lookup.get(team) if isinstance(team, (str, int)) else None for team in teams]
+        unknown = []
+        for i, row in enumerate(rows):
+            if row is None:
+                rows[i] = self.lookup.get(str(teams[i]).strip().lower())
+                if rows[i] is None:
+                    unknown.append(teams[i])
+        if unknown:
+            raise UnknownTeamError(sorted(set(map(str, unknown))))
+        return np.array(rows, dtype=np.intp)
+
+    def expected_goals(self, home_rows, away_rows):
+        """(home, away) expected goals for arrays of team rows"""
+        home = HOME_GOALS * np.exp((self.attack_home[home_rows] - self.defence_away[away_rows]) / STRENGTH_SCALE)
+        away = AWAY_GOALS * np.exp((self.attack_away[away_rows] - self.defence_home[home_rows]) / STRENGTH_SCALE)
+        return home, away
+
+    def predict_rows(self, home_rows, away_rows):
+        """Column arrays of predictions for fixtures given as team rows"""
+        home_goals, away_goals = self.expected_goals(home_rows, away_rows)
+        home_win, draw, away_win, home_score, away_score = outcome_probabilities(home_goals, away_goals)
+        return {
+            'home_expected_goals': home_goals,
+            'away_expected_goals': away_goals,
+            'home_win': home_win,
+            'draw': draw,
+            'away_win': away_win,
+            'home_score': home_score,
+            'away_score': away_score,
+        }
+
+    def predict(self, home, away):
+        """Column arrays of predictions for fixtures given as parallel lists of team identifiers"""
+        if len(home) != len(away):
+            raise ValueError('home and away must list the same number of teams')
+        home_rows = self.resolve(home)
+        away_rows = self.resolve(away)
+        return home_rows, away_rows, self.predict_rows(home_rows, away_rows)
+
+    def predictions(self, home, away):
+        """One JSON-ready record per fixture"""
+        home_rows, away_rows, columns = self.predict(home, away)
+        names = self.names
+        return [
+            {
+                'home': names[h],
+                'away': names[a],
+                'home_expected_goals': home_goals,
+                'away_expected_goals': away_goals,
+                'home_win': home_win,
+                'draw': draw,
+                'away_win': away_win,
+                'most_likely_score': f'{home_score}-{away_score}',
+            }
+            for h, a, home_goals, away_goals, home_win, draw, away_win, home_score, away_score in zip(
+                home_rows.tolist(), away_rows.tolist(),
+                np.round(columns['home_expected_goals'], 2).tolist(),
+                np.round(columns['away_expected_goals'], 2).tolist(),
+                np.round(columns['home_win'], 4).tolist(),
+                np.round(columns['draw'], 4).tolist(),
+                np.round(columns['away_win'], 4).tolist(),
+                columns['home_score'].tolist(), columns['away_score'].tolist(),
+            )
+        ]
+
+    def describe(self):
+        """Model parameters and teams, for API clients"""
+        return {
+            'name': 'poisson-strength',
+            'source': self.source,
+            'home_goals': HOME_GOALS,
+            'away_goals': AWAY_GOALS,
+            'strength_scale': STRENGTH_SCALE,
+            'teams': [
+                {'id': team_id, 'name': name, 'short_name': short_name}
+                for team_id, name, short_name in zip(self.ids, self.names, self.short_names)
+            ],
+        }
+
+def load_predictor(previous=None, sources=TEAMS_SOURCES):
+    """previous while its team file is unchanged, otherwise a predictor over the best team file"""
+    if previous is not None and previous.is_current():
+        return previous
+    source = find_teams_source(sources)
+    if source is None:
+        raise FileNotFoundError(f'No team strength file found ({", ".join(sources)})')
+    return MatchPredictor.from_csv(source)
@@ -1,14 +1,26 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import axios from 'axios';
 import { FaSync, FaFootballBall, FaUsers, FaClock, FaTrophy, FaChartLine } from 'react-icons/fa';
 import './StatsDashboard.scss';
 
+// Apply a /stats/changes response to the stats already on screen
+const mergeChanges = (previous, changes) => {
+    if (changes.full || !previous) {
+        return changes;
+    }
+    const teams = new Map((previous.team_stats || []).map((team) => [team.Team, team]));
+    changes.team_stats.forEach((team) => teams.set(team.Team, team));
+    // Leaderboards are only present when they changed
+    return { ...previous, ...changes, team_stats: Array.from(teams.values()) };
+};
+
 const StatsDashboard = () => {
     const [stats, setStats] = useState(null);
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState(null);
     const [lastUpdate, setLastUpdate] = useState(null);
     const [autoRefresh, setAutoRefresh] = useState(true);
+    const versionRef = useRef(0);
 
     const API_BASE_URL = 'http://localhost:5000/api';
 
@@ -17,8 +29,12 @@ const StatsDashboard = () => {
             setLoading(true);
             setError(null);
             
-            const response = await axios.get(`${API_BASE_URL}/stats`);
-            setStats(response.data);
+            // Only what changed since the version on screen; the dashboard renders no player rows
+            const response = await axios.get(`${API_BASE_URL}/stats/changes`, {
+                params: { since: versionRef.current, players: 0 },
+            });
+            versionRef.current = response.data.version;
+            setStats((previous) => mergeChanges(previous, response.data));
             setLastUpdate(new Date());
             
         } catch (err) {
@@ -32,13 +48,24 @@ const StatsDashboard = () => {
     const triggerManualUpdate = async () => {
         try {
             setLoading(true);
-            await axios.get(`${API_BASE_URL}/stats/update`);
-            
-            // Wait a bit for the update to complete, then fetch new data
-            setTimeout(() => {
+            const response = await axios.get(`${API_BASE_URL}/stats/update`);
+            const jobId = response.data.job_id;
+
+            // The update runs in the background, so poll its job until it finishes
+            const pollJob = async () => {
+                try {
+                    const job = await axios.get(`${API_BASE_URL}/stats/update/${jobId}`);
+                    if (job.data.status === 'running') {
+                        setTimeout(pollJob, 2000);
+                        return;
+                    }
+                } catch (err) {
+                    console.error('Update status error:', err);
+                }
                 fetchStats();
-            }, 3000);
-            
+            };
+            setTimeout(pollJob, 2000);
+
         } catch (err) {
             setError('Failed to trigger stats update');
             console.error('Update trigger error:', err);
@@ -48,14 +75,32 @@ const StatsDashboard = () => {
 
     useEffect(() => {
         fetchStats();
+        if (!autoRefresh) return undefined;
 
-        // Set up auto-refresh every 5 minutes if enabled
+        // The server pushes a message per new snapshot version; poll only if the stream is unavailable
         let interval;
-        if (autoRefresh) {
-            interval = setInterval(fetchStats, 300000); // 5 minutes
-        }
+        const source = new EventSource(`${API_BASE_URL}/stats/stream`);
+        source.addEventListener('snapshot', (event) => {
+            const changes = JSON.parse(event.data);
+            if (changes.version <= versionRef.current) return;
+            // A message that does not follow on from the version on screen (or a full reload) means
+            // updates were missed while disconnected, so catch up through /stats/changes
+            if (changes.full || changes.since !== versionRef.current) {
+                fetchStats();
+                return;
+            }
+            versionRef.current = changes.version;
+            setStats((previous) => mergeChanges(previous, changes));
+            setLastUpdate(new Date());
+        });
+        source.onerror = () => {
+            if (source.readyState === EventSource.CLOSED && !interval) {
+                interval = setInterval(fetchStats, 300000); // 5 minutes
+            }
+        };
 
         return () => {
+            source.close();
             if (interval) clearInterval(interval);
         };
     }, [autoRefresh]);
@@ -0,0 +1,259 @@
+"""
+Reader for the pipe-delimited text tables the fbref scraper exports (PL data.csv)
+Rows are |-separated with |---| rule lines between them; the first two rows are the two
+header levels of the fbref table, which are flattened into single column names
+read_pipe_table loads a table as a DataFrame. convert_pipe_table streams one into a typed
+columnar snapshot (Arrow IPC, as columnar_snapshot writes) in fixed-size batches: the text is
+parsed once into string columns, spooled to a temporary Arrow stream while each column's type is
+inferred, then cast batch by batch into the snapshot, so memory stays bounded by the batch size
+whatever the file size
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from columnar_snapshot import compact_int_dtype, is_available, read_snapshot, snapshot_is_fresh, write_snapshot_batches
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+    pc = None
+
+# Aggregate rows fbref appends to every squad table
+TOTAL_ROWS = ('Squad Total', 'Opponent Total')
+
+# Rows parsed and converted together when streaming
+BATCH_ROWS = 16384
+
+# Text columns are dictionary encoded when they have at most this many distinct values,
+# and no more than this share of the rows
+DICTIONARY_MAX_VALUES = 4096
+DICTIONARY_MAX_RATIO = 0.5
+
+NUMBER = r'^-?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$'
+INTEGER = r'^-?\d+$'
+
+def split_row(line):
+    """Cell texts of one |-delimited line"""
+    return [cell.strip() for cell in line.strip().strip('|').split('|')]
+
+def is_rule(line):
+    """Whether a line is a |----| separator"""
+    return not line.strip().strip('|-')
+
+def flatten_header(level0, level1):
+    """
+    Single column names from the two header levels
+    The lower name is used when it is unique; repeated names (the per-90 block) get their group prefixed
+    """
+    names = []
+    for group, name in zip(level0, level1):
+        if group.startswith('Unnamed') or not group:
+            group = ''
+        label = name or group
+        if label in names and group:
+            label = f'{group} {name}'.strip()
+        names.append(label)
+    return names
+
+def read_pipe_table(path, drop_totals=True):
+    """Load a pipe table as a DataFrame with numeric columns typed"""
+    with open(path, encoding='utf-8') as f:
+        rows = [split_row(line) for line in f if line.strip() and not is_rule(line)]
+    if len(rows) < 2:
+        return pd.DataFrame()
+
+    columns = flatten_header(rows[0], rows[1])
+    # Cells missing from a short row are empty, as the streaming converter reads them
+    width = len(columns)
+    df = pd.DataFrame([row[:width] + [''] * (width - len(row)) for row in rows[2:]], columns=columns)
+    # The leading unnamed column is the exported frame's row index
+    if columns[0] == '':
+        df = df.drop(columns='')
+    df = df.loc[:, ~df.columns.duplicated()]
+
+    if drop_totals and 'Player' in df.columns:
+        df = df[~df['Player'].isin(TOTAL_ROWS)].reset_index(drop=True)
+
+    for column in df.columns:
+        values = df[column].replace('', None)
+        numeric = pd.to_numeric(values, errors='coerce')
+        # Only convert columns where every non-empty cell parsed as a number
+        if values.notna().any() and numeric.notna().sum() == values.notna().sum():
+            df[column] = numeric
+    return df
+
+def table_layout(level0, level1):
+    """(column names, cell positions) kept from the header rows, as read_pipe_table keeps them"""
+    kept = {}
+    for position, name in enumerate(flatten_header(level0, level1)):
+        # Drop the exported index column and later duplicates of a name
+        if (position == 0 and name == '') or name in kept:
+            continue
+        kept[name] = position
+    return list(kept), list(kept.values())
+
+def iter_string_batches(path, drop_totals=True, batch_rows=BATCH_ROWS):
+    """Column names, then a list of trimmed Arrow string arrays (one per column) for every batch of data rows"""
+    with open(path, encoding='utf-8') as f:
+        lines = (line for line in f if not is_rule(line))
+        try:
+            names, positions = table_layout(split_row(next(lines)), split_row(next(lines)))
+        except StopIteration:
+            return
+        yield names
+
+        # Rows are split on the bare pipes and trimmed a column at a time; the leading pipe
+        # shifts every cell one place right
+        positions = [position + 1 for position in positions]
+        width = max(positions) + 1
+        player = positions[names.index('Player')] if drop_totals and 'Player' in names else None
+        batch = []
+        for line in lines:
+            cells = line.split('|')
+            if player is not None and cells[player].strip() in TOTAL_ROWS:
+                continue
+            if len(cells) < width:
+                cells += [''] * (width - len(cells))
+            batch.append(cells)
+            if len(batch) == batch_rows:
+                yield string_columns(batch, positions)
+                batch = []
+        if batch:
+            yield string_columns(batch, positions)
+
+def string_columns(rows, positions):
+    """Transpose split rows into trimmed Arrow string arrays of the kept cells"""
+    columns = list(zip(*rows))
+    return [pc.utf8_trim_whitespace(pa.array(columns[position], pa.string())) for position in positions]
+
+def blank_to_null(array):
+    """A string array with empty cells as nulls"""
+    return pc.if_else(pc.equal(array, ''), pa.scalar(None, pa.string()), array)
+
+def infer_column_type(info, array):
+    """
+    Narrow one column's inferred kind with another batch, by the same rule as read_pipe_table
+    (numeric when every non-empty cell is a number, integer without blanks)
+    """
+    values = blank_to_null(array)
+    filled = len(values) - values.null_count
+    info['filled'] += filled
+    if info['kind'] == 'int' and (filled < len(values) or not pc.all(pc.match_substring_regex(values, INTEGER)).as_py()):
+        info['kind'] = 'float'
+    if info['kind'] == 'float' and filled and not pc.all(pc.match_substring_regex(values, NUMBER)).as_py():
+        info['kind'] = 'text'
+    if info['kind'] == 'int':
+        bounds = pc.min_max(pc.cast(values, pa.int64())).as_py()
+        info['low'] = bounds['min'] if info['low'] is None else min(info['low'], bounds['min'])
+        info['high'] = bounds['max'] if info['high'] is None else max(info['high'], bounds['max'])
+    # Distinct values are tracked until there are too many to encode, since a
+    # numeric-looking column may still turn out to be text
+    if info['values'] is not None:
+        info['values'].update(pc.unique(array).to_pylist())
+        if len(info['values']) > DICTIONARY_MAX_VALUES:
+            info['values'] = None
+
+def finish_column_type(info, rows):
+    """Settle an inferred column once every batch has been seen"""
+    if info['kind'] != 'text' and info['filled'] == 0:
+        # No numbers at all: read_pipe_table leaves such columns as text
+        info['kind'] = 'text'
+    if info['kind'] != 'text' or info['values'] is None or len(info['values']) > rows * DICTIONARY_MAX_RATIO:
+        info['values'] = None
+    else:
+        info['values'] = sorted(info['values'])
+
+def arrow_field(name, info):
+    """Arrow field for an inferred column: compact ints, float64, dictionary or plain strings"""
+    if info['kind'] == 'int':
+        return pa.field(name, pa.from_numpy_dtype(compact_int_dtype(np.array([info['low'], info['high']]))))
+    if info['kind'] == 'float':
+        return pa.field(name, pa.float64())
+    if info['values'] is not None:
+        index_type = pa.from_numpy_dtype(compact_int_dtype(np.array([len(info['values'])])))
+        return pa.field(name, pa.dictionary(index_type, pa.string()))
+    return pa.field(name, pa.string())
+
+def convert_column(array, field, dictionary):
+    """One batch of a column's strings as an Arrow array of its field's type"""
+    if pa.types.is_dictionary(field.type):
+        indices = pc.index_in(array, value_set=dictionary)
+        return pa.DictionaryArray.from_arrays(pc.cast(indices, field.type.index_type), dictionary)
+    if pa.types.is_string(field.type):
+        return array
+    return pc.cast(blank_to_null(array), field.type)
+
+def spool_string_batches(path, spool, drop_totals=True, batch_rows=BATCH_ROWS):
+    """
+    Parse a pipe table once into string record batches written to the spool file, inferring
+    column types on the way; returns (names, {name: inferred type info}, row count)
+    """
+    batches = iter_string_batches(path, drop_totals, batch_rows)
+    names = next(batches, None)
+    if names is None:
+        return [], {}, 0
+
+    schema = pa.schema([pa.field(name, pa.string()) for name in names])
+    types = {name: {'kind': 'int', 'filled': 0, 'low': None, 'high': None, 'values': set()} for name in names}
+    rows = 0
+    with pa.OSFile(spool, 'wb') as sink, pa.ipc.new_stream(sink, schema) as writer:
+        for arrays in batches:
+            rows += len(arrays[0])
+            for name, array in zip(names, arrays):
+                infer_column_type(types[name], array)
+            writer.write_batch(pa.record_batch(arrays, schema=schema))
+    for info in types.values():
+        finish_column_type(info, rows)
+    return names, types, rows
+
+def convert_pipe_table(path, snapshot_path, drop_totals=True, batch_rows=BATCH_ROWS):
+    """Stream a pipe table into a typed Arrow IPC snapshot; returns the number of rows written"""
+    if not is_available():
+        raise RuntimeError('Converting pipe tables to columnar snapshots needs pyarrow')
+
+    directory = os.path.dirname(os.path.abspath(snapshot_path))
+    with tempfile.NamedTemporaryFile(dir=directory, suffix='.spool') as spool:
+        names, types, _ = spool_string_batches(path, spool.name, drop_totals, batch_rows)
+        schema = pa.schema([arrow_field(name, types[name]) for name in names])
+        # One dictionary per column for the whole file; the IPC file format does not allow replacing it
+        dictionaries = {
+            name: pa.array(types[name]['values'], pa.string())
+            for name in names if types[name]['values'] is not None
+        }
+
+        def batches():
+            if not names:
+                return
+            for batch in pa.ipc.open_stream(pa.memory_map(spool.name)):
+                yield pa.record_batch(
+                    [convert_column(array, field, dictionaries.get(field.name)) for array, field in zip(batch.columns, schema)],
+                    schema=schema,
+                )
+
+        return write_snapshot_batches(schema, batches(), snapshot_path)
+
+def snapshot_path_for(path):
+    """Path of the columnar snapshot next to a pipe table"""
+    return os.path.splitext(path)[0] + '.arrow'
+
+def load_pipe_table(path, snapshot_path=None):
+    """A pipe table as a DataFrame, converted once to its snapshot and memory-mapped from then on"""
+    if not is_available():
+        return read_pipe_table(path)
+    snapshot_path = snapshot_path or snapshot_path_for(path)
+    if not snapshot_is_fresh(snapshot_path, path):
+        convert_pipe_table(path, snapshot_path)
+    return read_snapshot(snapshot_path)
+
+if __name__ == '__main__':
+    source = sys.argv[1] if len(sys.argv) > 1 else 'PL data.csv'
+    target = sys.argv[2] if len(sys.argv) > 2 else snapshot_path_for(source)
+    rows = convert_pipe_table(source, target)
+    print(f"✅ {rows} rows from {source} saved to {target}")
@@ -0,0 +1,74 @@
+"""
+Per-player deltas between two player stores
+A delta lists the rows whose values changed between consecutive collections, so leaderboards
+and team totals can be patched instead of rebuilt; it is only produced when both stores hold
+the same players in the same order (FPL keeps elements ordered by id between gameweeks)
+"""
+
+import numpy as np
+import pandas as pd
+
+# Column that identifies a player row across collections
+PLAYER_KEY = 'Player'
+
+def category_changes(previous, current, column):
+    """Changed-row mask for a categorical column, compared on codes instead of decoded values"""
+    old_values = pd.Index(previous.categories[column], dtype=object)
+    new_values = pd.Index(current.categories[column], dtype=object)
+    if not (old_values.is_unique and new_values.is_unique):
+        return None
+
+    # Old codes translated into the new dictionary; values it lacks get codes no row can have
+    translate = new_values.get_indexer(old_values)
+    missing = translate < 0
+    translate[missing] = len(new_values) + np.arange(missing.sum())
+
+    # Code -1 is the trailing None entry in both dictionaries
+    old_codes = translate[previous.codes(column)]
+    new_codes = current.codes(column).astype(np.int64) % len(new_values)
+    return old_codes != new_codes
+
+def column_changes(previous, current, column):
+    """Boolean mask of rows whose value in column differs (NaN equals NaN)"""
+    if previous.kinds[column] == 'category' and current.kinds[column] == 'category':
+        changed = category_changes(previous, current, column)
+        if changed is not None:
+            return changed
+
+    old = previous.column(column)
+    new = current.column(column)
+    if old.dtype == object or new.dtype == object:
+        old_missing = pd.isna(old)
+        new_missing = pd.isna(new)
+        changed = (old != new) & ~(old_missing & new_missing)
+        return np.asarray(changed | (old_missing != new_missing), dtype=bool)
+
+    changed = old != new
+    if old.dtype.kind == 'f' or new.dtype.kind == 'f':
+        changed &= ~(np.isnan(old.astype(float)) & np.isnan(new.astype(float)))
+    return changed
+
+def compute_player_delta(previous, current):
+    """
+    Compare two PlayerStores row by row
+    Returns {'rows': changed row ids, 'columns': {column: changed row ids}}, or None when the
+    stores are not row-aligned (players added, removed or reordered, or the schema changed)
+    """
+    if previous is None or current is None:
+        return None
+    if len(previous) != len(current) or previous.columns != current.columns:
+        return None
+    if PLAYER_KEY not in current.kinds or column_changes(previous, current, PLAYER_KEY).any():
+        return None
+
+    columns = {}
+    any_change = np.zeros(len(current), dtype=bool)
+    for column in current.columns:
+        if previous.kinds[column] != current.kinds[column]:
+            return None
+        changed = column_changes(previous, current, column)
+        if changed.any():
+            columns[column] = np.flatnonzero(changed)
+            any_change |= changed
+
+    return {'rows': np.flatnonzero(any_change), 'columns': columns}
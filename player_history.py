@@ -0,0 +1,226 @@
+"""
+Per-gameweek player history
+Each gameweek's live stats (FPL event/{gw}/live) are appended to a partitioned Arrow store,
+history/gw=NN/part-NNNNN.arrow, keyed by player_id (as in current_season_players.csv) and
+gameweek. A checkpoint records which gameweeks are final and each player's season totals at
+the last run, so a refresh only fetches gameweeks that are new or still changing, and only
+appends rows for players whose gameweek stats changed. Gameweeks are fetched by a bounded
+worker pool; the checkpoint is saved after every stored gameweek, with the rest of the plan
+kept as a resume marker, so an interrupted run picks up where it stopped
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from columnar_snapshot import is_available, read_snapshot, write_snapshot
+from fpl_client import FPL_API_BASE, fetch_bootstrap_static, fetch_json
+from fpl_transform import current_gameweek, to_float
+
+HISTORY_DIR = os.environ.get('FPL_HISTORY_DIR', 'history')
+CHECKPOINT_FILE = 'checkpoint.json'
+DEFAULT_WORKERS = 4
+
+KEY_COLUMNS = ['player_id', 'gameweek']
+
+# Per-gameweek stats from the live endpoint
+HISTORY_INT_STATS = [
+    'minutes', 'goals_scored', 'assists', 'clean_sheets', 'goals_conceded', 'own_goals',
+    'penalties_saved', 'penalties_missed', 'yellow_cards', 'red_cards', 'saves', 'bonus',
+    'bps', 'total_points',
+]
+HISTORY_FLOAT_STATS = ['influence', 'creativity', 'threat', 'ict_index']
+HISTORY_STATS = HISTORY_INT_STATS + HISTORY_FLOAT_STATS
+
+# Season totals from bootstrap-static; a player whose totals moved has a changed gameweek row
+TOTALS_FIELDS = ['total_points', 'minutes', 'goals_scored', 'assists', 'clean_sheets', 'bonus', 'bps', 'saves']
+
+def empty_checkpoint():
+    """Checkpoint of a store that has never been filled"""
+    return {'gameweeks': {}, 'player_totals': {}, 'pending': [], 'updated_at': None}
+
+def load_checkpoint(history_dir=HISTORY_DIR):
+    """Read the checkpoint, or an empty one if there is none yet"""
+    try:
+        with open(os.path.join(history_dir, CHECKPOINT_FILE)) as f:
+            return {**empty_checkpoint(), **json.load(f)}
+    except (OSError, ValueError):
+        return empty_checkpoint()
+
+def save_checkpoint(checkpoint, history_dir=HISTORY_DIR):
+    """Atomically replace the checkpoint"""
+    os.makedirs(history_dir, exist_ok=True)
+    checkpoint['updated_at'] = datetime.now().isoformat()
+    path = os.path.join(history_dir, CHECKPOINT_FILE)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path)
+
+def partition_dir(gameweek, history_dir=HISTORY_DIR):
+    """Directory holding one gameweek's part files"""
+    return os.path.join(history_dir, f'gw={gameweek:02d}')
+
+def partition_files(gameweek, history_dir=HISTORY_DIR):
+    """A gameweek's part files in append order"""
+    directory = partition_dir(gameweek, history_dir)
+    if not os.path.isdir(directory):
+        return []
+    return [os.path.join(directory, name) for name in sorted(os.listdir(directory)) if name.endswith('.arrow')]
+
+def player_totals(fpl_data):
+    """{player_id: [season totals]} from bootstrap-static, as stored in the checkpoint"""
+    return {str(element['id']): [element.get(field, 0) for field in TOTALS_FIELDS] for element in fpl_data['elements']}
+
+def changed_players(fpl_data, checkpoint):
+    """Ids of players whose season totals differ from the last completed run"""
+    previous = checkpoint['player_totals']
+    return sorted(int(pid) for pid, totals in player_totals(fpl_data).items() if previous.get(pid) != totals)
+
+def plan_gameweeks(fpl_data, checkpoint, changed):
+    """Gameweeks to fetch: unfinished work from an interrupted run, unseen ones, and live ones with changes"""
+    todo = set(checkpoint['pending'])
+    for event in fpl_data['events']:
+        if not (event['finished'] or event['is_current']):
+            continue
+        gw = event['id']
+        state = checkpoint['gameweeks'].get(str(gw))
+        if state is None:
+            todo.add(gw)
+        elif not state['final'] and (changed or is_final(event)):
+            todo.add(gw)
+    return sorted(todo)
+
+def is_final(event):
+    """Whether a gameweek's stats can no longer change (bonus points confirmed)"""
+    # Without a data_checked flag only the current gameweek is treated as still open
+    return bool(event['finished'] and event.get('data_checked', not event.get('is_current')))
+
+def live_frame(live_data, gameweek):
+    """One row per player from an event/{gw}/live payload"""
+    elements = live_data.get('elements', [])
+    stats = pd.DataFrame([element.get('stats', {}) for element in elements]).reindex(columns=HISTORY_STATS)
+
+    frame = {
+        'player_id': np.fromiter((element['id'] for element in elements), dtype=np.int64, count=len(elements)),
+        'gameweek': np.full(len(elements), gameweek, dtype=np.int64),
+    }
+    for column in HISTORY_INT_STATS:
+        frame[column] = stats[column].fillna(0).astype(np.int64).to_numpy()
+    for column in HISTORY_FLOAT_STATS:
+        frame[column] = to_float(stats[column], empty_as_zero=True).to_numpy()
+    return pd.DataFrame(frame)
+
+def latest_rows(frame):
+    """Last appended row per (player_id, gameweek)"""
+    if frame.empty:
+        return frame
+    return frame.drop_duplicates(KEY_COLUMNS, keep='last').reset_index(drop=True)
+
+def read_gameweek(gameweek, history_dir=HISTORY_DIR):
+    """Current rows of one gameweek (latest revision per player), or None if it is not stored"""
+    parts = [read_snapshot(path) for path in partition_files(gameweek, history_dir)]
+    if not parts:
+        return None
+    return latest_rows(pd.concat(parts, ignore_index=True))
+
+def changed_rows(stored, fetched):
+    """Rows of fetched that are new or differ from the stored revision"""
+    if stored is None or stored.empty:
+        return fetched
+    merged = fetched.merge(stored[KEY_COLUMNS + HISTORY_STATS], on=KEY_COLUMNS, how='left', suffixes=('', '_stored'), indicator=True)
+    differs = merged['_merge'] == 'left_only'
+    for column in HISTORY_STATS:
+        differs |= ~np.isclose(merged[column].to_numpy(dtype=float), merged[f'{column}_stored'].to_numpy(dtype=float), equal_nan=True)
+    return fetched[differs.to_numpy()].reset_index(drop=True)
+
+def append_partition(rows, gameweek, history_dir=HISTORY_DIR):
+    """Write rows as the gameweek's next part file; existing parts are never rewritten"""
+    directory = partition_dir(gameweek, history_dir)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f'part-{len(partition_files(gameweek, history_dir)):05d}.arrow')
+    write_snapshot(rows.assign(fetched_at=pd.Timestamp.now().floor('s')), path)
+    return path
+
+def fetch_live(gameweek, max_age=0):
+    """Fetch one gameweek's live stats through the shared session (revalidating any cached copy)"""
+    return live_frame(fetch_json(f'{FPL_API_BASE}/event/{gameweek}/live/', max_age=max_age), gameweek)
+
+def update_history(history_dir=HISTORY_DIR, workers=DEFAULT_WORKERS, fetch=fetch_live, fpl_data=None):
+    """
+    Bring the history store up to date and return a summary of the run
+    Only planned gameweeks are fetched, at most `workers` at a time
+    """
+    if not is_available():
+        print("⚠️ pyarrow is not installed; skipping player history")
+        return None
+
+    start = time.perf_counter()
+    fpl_data = fpl_data or fetch_bootstrap_static()
+    checkpoint = load_checkpoint(history_dir)
+    changed = changed_players(fpl_data, checkpoint)
+    todo = plan_gameweeks(fpl_data, checkpoint, changed)
+    events = {event['id']: event for event in fpl_data['events']}
+
+    # Resume marker: whatever is still pending if this run stops part-way
+    checkpoint['pending'] = todo
+    save_checkpoint(checkpoint, history_dir)
+    print(f"📚 History: {len(changed)} players changed, {len(todo)} gameweeks to fetch {todo}")
+
+    appended = 0
+    failed = []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = {executor.submit(fetch, gw): gw for gw in todo}
+        for future in as_completed(futures):
+            gw = futures[future]
+            try:
+                fetched = future.result()
+            except Exception as e:
+                print(f"❌ Gameweek {gw}: {e}")
+                failed.append(gw)
+                continue
+
+            # Appending happens here, one gameweek at a time, so part numbers never race
+            rows = changed_rows(read_gameweek(gw, history_dir), fetched)
+            if len(rows):
+                append_partition(rows, gw, history_dir)
+            appended += len(rows)
+            state = checkpoint['gameweeks'].get(str(gw), {'parts': 0, 'rows': 0})
+            checkpoint['gameweeks'][str(gw)] = {
+                'final': is_final(events.get(gw, {'finished': False, 'is_current': False})),
+                'parts': state['parts'] + (1 if len(rows) else 0),
+                'rows': state['rows'] + len(rows),
+            }
+            checkpoint['pending'] = [pending for pending in checkpoint['pending'] if pending != gw]
+            save_checkpoint(checkpoint, history_dir)
+
+    # Totals are only advanced once every planned gameweek is stored, so failures are retried
+    if not failed:
+        checkpoint['player_totals'] = player_totals(fpl_data)
+        checkpoint['current_gameweek'] = current_gameweek(fpl_data)
+        save_checkpoint(checkpoint, history_dir)
+
+    elapsed = time.perf_counter() - start
+    print(f"✅ History: appended {appended} rows for {len(todo) - len(failed)} gameweeks in {elapsed:.2f}s")
+    return {'gameweeks': todo, 'failed': failed, 'rows': appended, 'changed_players': len(changed), 'seconds': elapsed}
+
+def load_history(gameweeks=None, player_ids=None, history_dir=HISTORY_DIR):
+    """Current per-gameweek rows for the given gameweeks/players (default: all), sorted by player and gameweek"""
+    if gameweeks is None:
+        gameweeks = sorted(int(gw) for gw in load_checkpoint(history_dir)['gameweeks'])
+    frames = [frame for frame in (read_gameweek(gw, history_dir) for gw in gameweeks) if frame is not None]
+    if not frames:
+        return pd.DataFrame(columns=KEY_COLUMNS + HISTORY_STATS)
+    history = pd.concat(frames, ignore_index=True)
+    if player_ids is not None:
+        history = history[history['player_id'].isin(player_ids)]
+    return history.sort_values(KEY_COLUMNS).reset_index(drop=True)
+
+if __name__ == "__main__":
+    print("=== PLAYER HISTORY COLLECTOR ===")
+    update_history()
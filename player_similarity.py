@@ -0,0 +1,143 @@
+"""
+Nearest-neighbour search for "players like X"
+Each player is a vector of per-90 output (influence, creativity, threat, goals, assists) and
+price, standardized so every feature counts equally. The vectors are built once per snapshot,
+whole and split by position; a query takes squared distances to every candidate with one
+vector-matrix product, shortlists the rows no further than the k-th nearest of a strided sample
+and ranks only those, so it stays well under a millisecond even over tens of thousands of
+player-seasons and the answer is the same as a full sort
+"""
+
+import numpy as np
+
+FEATURES = ['influence', 'creativity', 'threat', 'Gls', 'Ast', 'price']
+# Features turned into rates per 90 minutes played; the rest are used as they are
+PER_90 = {'influence', 'creativity', 'threat', 'Gls', 'Ast'}
+
+# Rates of players with fewer minutes are taken over this many, so a cameo goal is not a 9-per-90 striker
+MIN_MINUTES = 90
+
+# Columns returned with every similar player
+SIMILAR_FIELDS = ['Player', 'Team', 'Pos', 'price']
+
+DEFAULT_K = 10
+MAX_K = 100
+
+# Queries over more than k times this many players first shortlist by a sample of every SAMPLE_STRIDE-th
+SAMPLE_STRIDE = 64
+
+NUMERIC_KINDS = ('int', 'float')
+
+def feature_matrix(store):
+    """(feature names, rows x features float64 matrix) from the FEATURES the store has"""
+    minutes = None
+    if store.kinds.get('Min') in NUMERIC_KINDS:
+        minutes = np.maximum(np.nan_to_num(store.column('Min').astype(np.float64)), MIN_MINUTES)
+
+    names, columns = [], []
+    for feature in FEATURES:
+        if store.kinds.get(feature) not in NUMERIC_KINDS:
+            continue
+        values = store.column(feature).astype(np.float64)
+        if feature in PER_90 and minutes is not None:
+            values = values / minutes * 90
+            feature = f'{feature}_per_90'
+        names.append(feature)
+        columns.append(values)
+    if not columns:
+        return names, np.zeros((len(store), 0))
+    return names, np.column_stack(columns)
+
+def standardize(matrix):
+    """Zero mean, unit variance columns; missing values become the mean and constant columns zero"""
+    mean = np.nanmean(matrix, axis=0) if len(matrix) else np.zeros(matrix.shape[1])
+    std = np.nanstd(matrix, axis=0) if len(matrix) else np.ones(matrix.shape[1])
+    std[~(std > 0)] = 1
+    return np.nan_to_num((matrix - np.nan_to_num(mean)) / std)
+
+class SimilarityIndex:
+    """Standardized feature vectors of one snapshot's players, whole and per position"""
+
+    def __init__(self, features, vectors, position_groups):
+        self.features = features
+        self.vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        self.norms = np.einsum('ij,ij->i', self.vectors, self.vectors)
+        self.everyone = self.scoring_matrix(self.vectors, self.norms)
+        # Per-position copies, so a filtered query is a single product as well
+        self.groups = {}
+        for key, rows in position_groups.items():
+            rows = np.asarray(rows, dtype=np.intp)
+            self.groups[key] = (rows, self.scoring_matrix(self.vectors[rows], self.norms[rows]))
+
+    @staticmethod
+    def scoring_matrix(vectors, norms):
+        """
+        Features x players matrix with the squared norms as a last row: its product with
+        (-2 * query, 1) is each player's squared distance to the query, less |query|^2
+        (players along the contiguous axis keep the product fast with so few features)
+        """
+        return np.ascontiguousarray(np.vstack([vectors.T, norms]), dtype=np.float32)
+
+    def __len__(self):
+        return len(self.vectors)
+
+    def nearest(self, row_id, k=DEFAULT_K, position=None):
+        """(row ids, distances) of the k players closest to row_id, nearest first, optionally within one position"""
+        if position is None:
+            rows, matrix = None, self.everyone
+        elif position in self.groups:
+            rows, matrix = self.groups[position]
+        else:
+            return np.array([], dtype=np.intp), np.array([])
+
+        weights = np.append(-2 * self.vectors[row_id], np.float32(1))
+        distances = weights @ matrix
+        candidates = len(distances)
+        # The player is never their own neighbour
+        own = row_id if rows is None else int(np.searchsorted(rows, row_id))
+        if own < candidates and (rows is None or rows[own] == row_id):
+            distances[own] = np.inf
+            candidates -= 1
+
+        k = min(k, candidates)
+        if k <= 0:
+            return np.array([], dtype=np.intp), np.array([])
+        if k < len(distances) // SAMPLE_STRIDE:
+            # The k-th nearest of an evenly spaced sample is no nearer than the true k-th nearest,
+            # so the exact neighbours are all within it and only those rows need ranking
+            bound = np.partition(distances[::SAMPLE_STRIDE], k - 1)[k - 1]
+            shortlist = np.flatnonzero(distances <= bound)
+        else:
+            shortlist = np.arange(len(distances))
+        if k < len(shortlist):
+            # Everything tied with the k-th nearest stays, so the row order below settles the tie
+            kth = np.partition(distances[shortlist], k - 1)[k - 1]
+            shortlist = shortlist[distances[shortlist] <= kth]
+        # Nearest first, ties in row order
+        nearest = shortlist[np.lexsort((shortlist, distances[shortlist]))][:k]
+        found = nearest if rows is None else rows[nearest]
+        return found, np.sqrt(np.maximum(distances[nearest] + self.norms[row_id], 0))
+
+def build_similarity_index(store, position_groups):
+    """The snapshot's similarity index, or None if the store has none of the features"""
+    features, matrix = feature_matrix(store)
+    if not features:
+        return None
+    return SimilarityIndex(features, standardize(matrix), position_groups)
+
+def similar_players(store, index, row_id, k=DEFAULT_K, position=None):
+    """The /api/stats/players/<id>/similar payload"""
+    fields = [field for field in SIMILAR_FIELDS if field in store.kinds]
+    row_ids, distances = index.nearest(row_id, k, position)
+    similar = store.rows(row_ids, fields=fields)
+    for record, similar_id, distance in zip(similar, row_ids.tolist(), distances.tolist()):
+        record['id'] = similar_id
+        record['distance'] = round(distance, 4)
+        record['similarity'] = round(1 / (1 + distance), 4)
+    return {
+        'player': {'id': row_id, **store.rows([row_id], fields=fields)[0]},
+        'k': k,
+        'position': position,
+        'features': index.features,
+        'similar': similar,
+    }
@@ -0,0 +1,162 @@
+"""
+Compact columnar store for player records
+Columns live in typed NumPy arrays, text columns with few distinct values are dictionary
+encoded, and row dicts or JSON are only materialized for the rows a request asks for
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+from columnar_snapshot import compact_int_dtype
+
+# Text columns with at most this share of distinct values are dictionary encoded
+CATEGORICAL_MAX_RATIO = 0.5
+
+# Below this many rows numeric values are encoded one by one instead of factorized first
+FACTORIZE_MIN_ROWS = 256
+
+def json_fragment(value):
+    """Encode one value exactly as the API's JSON provider would"""
+    return json.dumps(value, ensure_ascii=True)
+
+def row_template(keys):
+    """str.format template that renders one JSON object from per-key value fragments"""
+    members = ', '.join(json_fragment(key).replace('{', '{{').replace('}', '}}') + ': {}' for key in keys)
+    return '{{' + members + '}}'
+
+class PlayerStore:
+    """Immutable column store of player rows addressed by row id"""
+
+    def __init__(self, df):
+        self.length = len(df)
+        self.column_names = list(df.columns)
+        self.kinds = {}
+        self.arrays = {}
+        self.categories = {}
+        self._fragments = {}
+
+        for name in self.column_names:
+            series = df[name]
+            dtype = series.dtype
+            if isinstance(dtype, pd.CategoricalDtype):
+                self._store_categorical(name, series.cat.codes.to_numpy(), list(series.cat.categories))
+            elif pd.api.types.is_bool_dtype(dtype):
+                self.kinds[name] = 'bool'
+                self.arrays[name] = series.to_numpy(dtype=bool)
+            elif pd.api.types.is_integer_dtype(dtype):
+                values = series.to_numpy()
+                self.kinds[name] = 'int'
+                self.arrays[name] = values.astype(compact_int_dtype(values), copy=False)
+            elif pd.api.types.is_float_dtype(dtype):
+                self.kinds[name] = 'float'
+                self.arrays[name] = series.to_numpy(dtype=np.float64)
+            else:
+                values = series.to_numpy(dtype=object)
+                codes, uniques = pd.factorize(values, use_na_sentinel=False)
+                if len(uniques) <= max(1, self.length * CATEGORICAL_MAX_RATIO):
+                    self._store_categorical(name, codes, list(uniques))
+                else:
+                    self.kinds[name] = 'object'
+                    self.arrays[name] = values
+
+        # Keys in sorted order, as the JSON provider sorts them
+        self.json_keys = sorted(self.column_names)
+        self._row_template = row_template(self.json_keys)
+
+    def _store_categorical(self, name, codes, categories):
+        """Keep a text column as small integer codes plus its distinct values"""
+        self.kinds[name] = 'category'
+        self.arrays[name] = np.asarray(codes).astype(compact_int_dtype(np.asarray(codes)), copy=False)
+        self.categories[name] = np.array(categories + [None], dtype=object)
+
+    def __len__(self):
+        return self.length
+
+    @property
+    def columns(self):
+        return list(self.column_names)
+
+    def codes(self, name):
+        """Integer codes of a categorical column"""
+        return self.arrays[name]
+
+    def category_values(self, name):
+        """Distinct values of a categorical column, indexed by code"""
+        return self.categories[name][:-1]
+
+    def column(self, name):
+        """Decoded values of one column as a NumPy array"""
+        if self.kinds[name] == 'category':
+            return self.categories[name][self.arrays[name]]
+        return self.arrays[name]
+
+    def _python_column(self, name, ids):
+        """Column values for the given rows as native Python objects"""
+        values = self.arrays[name] if ids is None else self.arrays[name][ids]
+        if self.kinds[name] == 'category':
+            return self.categories[name][values].tolist()
+        return values.tolist()
+
+    def rows(self, ids=None, fields=None):
+        """Materialize row dicts for the given row ids (all rows when ids is None)"""
+        names = self.column_names if fields is None else [f for f in fields if f in self.kinds]
+        if ids is not None:
+            ids = np.asarray(ids, dtype=np.int64)
+        columns = [self._python_column(name, ids) for name in names]
+        return [dict(zip(names, values)) for values in zip(*columns)] if columns else []
+
+    def row(self, row_id):
+        """Materialize a single row dict"""
+        return self.rows([row_id])[0]
+
+    def _column_fragments(self, name, ids):
+        """Per-row JSON text for a column; each distinct value is encoded once and gathered by code"""
+        kind = self.kinds[name]
+        if kind == 'object':
+            # Free text (player names) has no repeats to exploit, so its encoding is kept once per store
+            fragments = self._fragments.get(name)
+            if fragments is None:
+                fragments = np.array([json_fragment(v) for v in self.arrays[name]], dtype=object)
+                self._fragments[name] = fragments
+            return (fragments if ids is None else fragments[ids]).tolist()
+
+        values = self.arrays[name] if ids is None else self.arrays[name][ids]
+        if kind == 'category':
+            encoded = self._fragments.get(name)
+            if encoded is None:
+                encoded = np.array([json_fragment(v) for v in self.categories[name].tolist()], dtype=object)
+                self._fragments[name] = encoded
+            return encoded[values].tolist()
+
+        if len(values) < FACTORIZE_MIN_ROWS:
+            # int and finite float reprs are already valid JSON
+            if kind == 'int' or (kind == 'float' and np.isfinite(values).all()):
+                return list(map(repr, values.tolist()))
+            return [json_fragment(v) for v in values.tolist()]
+
+        # Stats take few distinct values, so factorizing beats formatting every number
+        codes, uniques = pd.factorize(values, use_na_sentinel=False)
+        encoded = np.array([json_fragment(v) for v in uniques.tolist()], dtype=object)
+        return encoded[codes].tolist()
+
+    def to_json(self, ids=None, fields=None):
+        """Serialize the given rows to a JSON array string without building row dicts"""
+        if fields is None:
+            keys = self.json_keys
+            template = self._row_template
+        else:
+            keys = sorted(f for f in set(fields) if f in self.kinds)
+            template = row_template(keys)
+
+        if ids is not None:
+            ids = np.asarray(ids, dtype=np.int64)
+        count = self.length if ids is None else len(ids)
+        if count == 0:
+            return '[]'
+        if not keys:
+            return '[' + ', '.join(['{}'] * count) + ']'
+
+        columns = [self._column_fragments(key, ids) for key in keys]
+        return '[' + ', '.join(map(template.format, *columns)) + ']'
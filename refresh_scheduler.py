@@ -0,0 +1,114 @@
+"""
+Background refresh scheduler for the stats API server
+Runs data collection off the request path and coalesces concurrent triggers into one job
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+
+class RefreshScheduler:
+    """Run a refresh function in a background thread, at most one at a time"""
+
+    def __init__(self, refresh_fn, max_jobs=50, job_dir=None):
+        self.refresh_fn = refresh_fn
+        self.max_jobs = max_jobs
+        # With several server processes, job states are also written here so any of them can report them
+        self.job_dir = job_dir
+        self.jobs = OrderedDict()
+        self.current_job = None
+        self.lock = threading.Lock()
+
+    def trigger(self, reason='manual'):
+        """Start a refresh, or join the one already in flight; returns (job, coalesced)"""
+        with self.lock:
+            if self.current_job is not None:
+                self.current_job['triggers'] += 1
+                return dict(self.current_job), True
+
+            job = {
+                'job_id': uuid.uuid4().hex[:12],
+                'status': 'running',
+                'reason': reason,
+                'triggers': 1,
+                'started_at': datetime.now().isoformat(),
+                'finished_at': None,
+                'version': None,
+                'error': None,
+            }
+            self.current_job = job
+            self.jobs[job['job_id']] = job
+            while len(self.jobs) > self.max_jobs:
+                self.jobs.popitem(last=False)
+        self._save(job)
+
+        worker = threading.Thread(target=self._run, args=(job,), daemon=True)
+        worker.start()
+        return dict(job), False
+
+    def _run(self, job):
+        """Execute the refresh function and record its outcome on the job"""
+        try:
+            job['version'] = self.refresh_fn()
+            job['status'] = 'succeeded'
+        except Exception as e:
+            job['status'] = 'failed'
+            job['error'] = str(e)
+            print(f"❌ Refresh job {job['job_id']} failed: {e}")
+        finally:
+            job['finished_at'] = datetime.now().isoformat()
+            with self.lock:
+                self.current_job = None
+            self._save(job)
+
+    def _save(self, job):
+        """Write a job's state to job_dir, dropping the oldest files beyond max_jobs"""
+        if self.job_dir is None:
+            return
+        path = os.path.join(self.job_dir, f"{job['job_id']}.json")
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(job, f)
+        os.replace(tmp_path, path)
+
+        paths = [os.path.join(self.job_dir, name) for name in os.listdir(self.job_dir) if name.endswith('.json')]
+        if len(paths) > self.max_jobs:
+            for old_path in sorted(paths, key=os.path.getmtime)[:-self.max_jobs]:
+                try:
+                    os.remove(old_path)
+                except FileNotFoundError:
+                    pass
+
+    def get_job(self, job_id):
+        """Return a copy of a job's status, or None if it is unknown or expired"""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job:
+                return dict(job)
+        # Started by another server process
+        if self.job_dir is not None and job_id.isalnum():
+            try:
+                with open(os.path.join(self.job_dir, f'{job_id}.json')) as f:
+                    return json.load(f)
+            except (FileNotFoundError, ValueError):
+                pass
+        return None
+
+    def is_running(self):
+        """Whether a refresh is currently in flight"""
+        return self.current_job is not None
+
+    def start_periodic(self, interval_seconds):
+        """Trigger a refresh every interval_seconds from a daemon thread"""
+        def loop():
+            while True:
+                time.sleep(interval_seconds)
+                self.trigger(reason='scheduled')
+
+        thread = threading.Thread(target=loop, daemon=True)
+        thread.start()
+        return thread
@@ -0,0 +1,118 @@
+"""
+Versioned cache of pre-serialized API responses
+Each body is serialized (and compressed) once per data version and reused until the next reload
+"""
+
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+# Bodies smaller than this are not worth compressing
+MIN_COMPRESS_SIZE = 512
+
+class CachedResponse:
+    """One serialized response body plus its lazily built compressed variants"""
+
+    __slots__ = ('body', 'etag', 'encoded', 'lock')
+
+    def __init__(self, body, etag):
+        self.body = body
+        self.etag = etag
+        self.encoded = {}
+        self.lock = threading.Lock()
+
+    def etag_for(self, encoding):
+        """Strong ETag for the representation sent with the given encoding"""
+        if encoding is None or len(self.body) < MIN_COMPRESS_SIZE:
+            return f'"{self.etag}"'
+        return f'"{self.etag}-{encoding}"'
+
+    def matches(self, if_none_match):
+        """Check an If-None-Match header against every representation of this body"""
+        if not if_none_match:
+            return False
+        candidates = {tag.strip() for tag in if_none_match.split(',')}
+        if '*' in candidates:
+            return True
+        return any(self.etag_for(encoding) in candidates for encoding in (None, 'gzip', 'br'))
+
+    def encode(self, encoding):
+        """Return the body compressed with the given encoding, compressing at most once"""
+        if encoding is None or len(self.body) < MIN_COMPRESS_SIZE:
+            return self.body
+
+        data = self.encoded.get(encoding)
+        if data is None:
+            with self.lock:
+                data = self.encoded.get(encoding)
+                if data is None:
+                    if encoding == 'br':
+                        data = brotli.compress(self.body, quality=5)
+                    else:
+                        data = gzip.compress(self.body, compresslevel=6)
+                    self.encoded[encoding] = data
+        return data
+
+class ResponseCache:
+    """LRU cache of serialized responses, invalidated as a whole when the data version changes"""
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self.version = None
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key, version, serialize):
+        """
+        Return the cached response for key at version, calling serialize() on a miss
+        A newer version replaces every entry; a request still holding an older snapshot gets its
+        response serialized but not stored, so it cannot evict the newer version's entries
+        """
+        with self.lock:
+            if self.version is None or version > self.version:
+                self.entries.clear()
+                self.version = version
+            entry = self.entries.get(key) if version == self.version else None
+            if entry is not None:
+                self.entries.move_to_end(key)
+                return entry
+
+        body = serialize()
+        digest = hashlib.sha1(body).hexdigest()[:20]
+        entry = CachedResponse(body, f'{version}-{digest}')
+
+        with self.lock:
+            # Another request may have reloaded the data while we were serializing
+            if version == self.version:
+                self.entries[key] = entry
+                while len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        """Drop every cached response (and the version, so a lower version number can be cached again)"""
+        with self.lock:
+            self.entries.clear()
+            self.version = None
+
+def choose_encoding(accept_encoding):
+    """Pick the best supported content encoding from an Accept-Encoding header"""
+    accepted = set()
+    for part in (accept_encoding or '').split(','):
+        token, _, params = part.strip().partition(';')
+        if params.strip().replace(' ', '') in ('q=0', 'q=0.0'):
+            continue
+        accepted.add(token.strip().lower())
+
+    if brotli is not None and 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted:
+        return 'gzip'
+    return None
+
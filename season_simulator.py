@@ -0,0 +1,183 @@
+"""
+Monte Carlo simulation of the rest of the Premier League season
+Scores of every remaining fixture are drawn for a whole batch of simulations at once from the match
+predictor's expected goals, added to the current table with one matrix product per batch, and the
+final tables ranked by points, goal difference and goals scored. Each batch gets its own seed
+spawned from one root seed, so the results are identical whether the batches run in this process
+or across a process pool
+Usage: python season_simulator.py [simulations] [workers] [seed]
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from match_predictor import MAX_GOALS, load_predictor, poisson_pmf
+
+SIMULATIONS = 10000
+BATCH_SIMULATIONS = 5000
+SEED = 2025
+
+TOP_FOUR = 4
+RELEGATED = 3
+
+def double_round_robin(teams):
+    """
+    Matchdays of a balanced double round robin as (home rows, away rows) pairs (circle method):
+    every team plays once per matchday and hosts every other team once, the second half mirroring the first
+    """
+    rotation = list(range(teams + teams % 2))  # An odd league gets a bye slot
+    size = len(rotation)
+    first_half = []
+    for matchday in range(size - 1):
+        home, away = [], []
+        for i in range(size // 2):
+            a, b = rotation[i], rotation[size - 1 - i]
+            if a >= teams or b >= teams:
+                continue
+            # Swapping every venue on odd matchdays keeps home or away runs to two games
+            if matchday % 2:
+                a, b = b, a
+            home.append(a)
+            away.append(b)
+        first_half.append((np.array(home, dtype=np.intp), np.array(away, dtype=np.intp)))
+        rotation = [rotation[0], rotation[-1], *rotation[1:-1]]
+    return first_half + [(away, home) for home, away in first_half]
+
+def remaining_fixtures(predictor):
+    """
+    (home rows, away rows) still to play. The collectors do not fetch the fixture list, so the
+    season is taken to follow a balanced round robin with the median number of games played so far
+    """
+    matchdays = double_round_robin(len(predictor.names))
+    played = int(np.median(predictor.played)) if len(predictor.played) else 0
+    remaining = matchdays[min(played, len(matchdays)):]
+    if not remaining:
+        return np.array([], dtype=np.intp), np.array([], dtype=np.intp)
+    return np.concatenate([home for home, _ in remaining]), np.concatenate([away for _, away in remaining])
+
+def goal_thresholds(rates):
+    """float32 cumulative Poisson probabilities per fixture, for drawing goals by inverse transform"""
+    return np.cumsum(poisson_pmf(rates), axis=1).astype(np.float32)
+
+def draw_goals(rng, thresholds, simulations):
+    """(simulations, fixtures) goals: a uniform draw counts the thresholds it exceeds (capped at MAX_GOALS)"""
+    uniform = rng.random((simulations, len(thresholds)), dtype=np.float32)
+    goals = np.zeros(uniform.shape, dtype=np.int8)
+    for k in range(MAX_GOALS):
+        goals += uniform > thresholds[:, k]
+    return goals
+
+def simulate_batch(task):
+    """
+    Play the remaining fixtures `simulations` times; returns (position counts as a teams x positions
+    array, each team's summed final points). Runs in pool workers, so it takes one picklable tuple
+    """
+    home_thresholds, away_thresholds, home_rows, away_rows, table, simulations, seed = task
+    rng = np.random.default_rng(seed)
+    teams = len(table['points'])
+
+    home_goals = draw_goals(rng, home_thresholds, simulations)
+    away_goals = draw_goals(rng, away_thresholds, simulations)
+    margin = home_goals.astype(np.float32) - away_goals
+
+    # Fixture x team incidence matrices turn per-fixture results into per-team totals
+    at_home = np.zeros((len(home_rows), teams), dtype=np.float32)
+    at_home[np.arange(len(home_rows)), home_rows] = 1
+    away = np.zeros((len(away_rows), teams), dtype=np.float32)
+    away[np.arange(len(away_rows)), away_rows] = 1
+
+    draws = (margin == 0).astype(np.float32)
+    points = table['points'] + (3 * (margin > 0) + draws) @ at_home + (3 * (margin < 0) + draws) @ away
+    goal_difference = table['goal_difference'] + margin @ (at_home - away)
+    goals_for = table['goals_for'] + home_goals.astype(np.float32) @ at_home + away_goals.astype(np.float32) @ away
+
+    # Points, then goal difference, then goals scored; anything still level is settled at random
+    key = points * 1e6 + (goal_difference + 1000) * 1e3 + goals_for + rng.random(points.shape)
+    standings = np.argsort(-key, axis=1)  # standings[s, position] = team
+    cells = standings * teams + np.arange(teams)
+    position_counts = np.bincount(cells.ravel(), minlength=teams * teams).reshape(teams, teams)
+    return position_counts, points.sum(axis=0, dtype=np.float64)
+
+def simulate_season(predictor, simulations=SIMULATIONS, workers=1, seed=SEED, fixtures=None, batch_simulations=BATCH_SIMULATIONS):
+    """
+    Title, top-four and relegation probabilities, expected points and the finishing position
+    distribution of every team over `simulations` playings of the remaining fixtures
+    """
+    home_rows, away_rows = fixtures if fixtures is not None else remaining_fixtures(predictor)
+    home_rates, away_rates = predictor.expected_goals(home_rows, away_rows)
+    table = {
+        'points': predictor.points.astype(np.float64),
+        'goal_difference': predictor.goal_difference.astype(np.float64),
+        'goals_for': predictor.goals_for.astype(np.float64),
+    }
+    sizes = [batch_simulations] * (simulations // batch_simulations)
+    if simulations % batch_simulations:
+        sizes.append(simulations % batch_simulations)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    home_thresholds = goal_thresholds(home_rates)
+    away_thresholds = goal_thresholds(away_rates)
+    tasks = [
+        (home_thresholds, away_thresholds, home_rows, away_rows, table, size, batch_seed)
+        for size, batch_seed in zip(sizes, seeds)
+    ]
+
+    start = time.perf_counter()
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+            results = list(executor.map(simulate_batch, tasks))
+    else:
+        results = [simulate_batch(task) for task in tasks]
+    elapsed = time.perf_counter() - start
+
+    teams = len(predictor.names)
+    position_counts = sum(counts for counts, _ in results)
+    expected_points = sum(points for _, points in results) / simulations
+    probabilities = position_counts / simulations
+    expected_position = probabilities @ np.arange(1, teams + 1)
+
+    records = [
+        {
+            'team': predictor.names[row],
+            'short_name': predictor.short_names[row],
+            'points': int(predictor.points[row]),
+            'played': int(predictor.played[row]),
+            'expected_points': round(float(expected_points[row]), 2),
+            'expected_position': round(float(expected_position[row]), 2),
+            'title': round(float(probabilities[row, 0]), 4),
+            'top_four': round(float(probabilities[row, :TOP_FOUR].sum()), 4),
+            'relegation': round(float(probabilities[row, teams - RELEGATED:].sum()), 4),
+            'positions': np.round(probabilities[row], 4).tolist(),
+        }
+        for row in range(teams)
+    ]
+    records.sort(key=lambda record: record['expected_position'])
+    return {
+        'simulations': simulations,
+        'seed': seed,
+        'fixtures_remaining': len(home_rows),
+        'seconds': round(elapsed, 3),
+        'teams': records,
+    }
+
+def display_simulation(result):
+    """Print the simulated final table"""
+    print(f"\n🎲 {result['simulations']:,} simulations of {result['fixtures_remaining']} remaining fixtures in {result['seconds']:.2f}s")
+    print(f"\n{'':>3} {'Team':<16}{'Pts':>5}{'xPts':>7}{'xPos':>6}{'Title':>8}{'Top 4':>8}{'Releg.':>8}")
+    for i, record in enumerate(result['teams'], 1):
+        print(
+            f"{i:>3} {record['team']:<16}{record['points']:>5}{record['expected_points']:>7.1f}{record['expected_position']:>6.1f}"
+            f"{record['title']:>8.1%}{record['top_four']:>8.1%}{record['relegation']:>8.1%}"
+        )
+
+if __name__ == '__main__':
+    simulations = int(sys.argv[1]) if len(sys.argv) > 1 else SIMULATIONS
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else SEED
+
+    predictor = load_predictor()
+    print(f"🏟️ Team strengths from {predictor.source}")
+    display_simulation(simulate_season(predictor, simulations, workers, seed))
@@ -0,0 +1,125 @@
+"""
+Snapshot sharing and refresh leadership for multi-worker serving
+Each published stats table is written once as a generation-numbered Arrow file that every worker
+memory-maps, so the column data lives in the page cache once rather than in each process. A small
+manifest names the current generation; workers poll it and adopt newer ones. Collection is
+serialized across workers with an exclusive flock, and one worker, elected by holding another
+flock, runs the periodic refresh (the lock is released when it exits, and a survivor takes over)
+"""
+
+import fcntl
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+SHARED_DIR = os.environ.get('STATS_SHARED_DIR', '.stats_shared')
+POLL_SECONDS = 1.0
+KEEP_GENERATIONS = 3  # Files kept for workers that have not adopted the newest yet
+
+class SharedSnapshot:
+    """Generation-numbered stats files plus the manifest and locks coordinating the workers"""
+
+    def __init__(self, directory=SHARED_DIR):
+        from columnar_snapshot import is_available
+
+        if not is_available():
+            raise RuntimeError('Sharing the snapshot between workers needs pyarrow')
+        self.directory = directory
+        self.manifest_path = os.path.join(directory, 'manifest.json')
+        self.jobs_dir = os.path.join(directory, 'jobs')
+        self._leader_file = None
+        os.makedirs(self.jobs_dir, exist_ok=True)
+
+    def current(self):
+        """The manifest of the newest generation ({'generation', 'path', 'published_at'}), or None"""
+        try:
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    @contextmanager
+    def refresh_lock(self):
+        """Hold the cross-worker refresh lock; blocks while another worker is collecting"""
+        with open(os.path.join(self.directory, 'refresh.lock'), 'w') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def publish(self, df):
+        """Write df as the next generation and point the manifest at it; call with refresh_lock held"""
+        from columnar_snapshot import write_snapshot
+
+        previous = self.current()
+        generation = previous['generation'] + 1 if previous else 1
+        path = os.path.join(self.directory, f'stats-g{generation}.arrow')
+        write_snapshot(df, path)
+
+        manifest = {'generation': generation, 'path': path, 'published_at': time.time()}
+        tmp_path = f'{self.manifest_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, self.manifest_path)
+
+        # Workers still mapping an older file (or its query database) keep it open after it is unlinked
+        for name in os.listdir(self.directory):
+            stem, _, extension = name.partition('.')
+            if stem.startswith('stats-g') and extension in ('arrow', 'sqlite'):
+                if int(stem[len('stats-g'):]) <= generation - KEEP_GENERATIONS:
+                    os.remove(os.path.join(self.directory, name))
+        return manifest
+
+    def ensure_published(self, read_frame):
+        """The current manifest, publishing read_frame() as the first generation if there is none"""
+        manifest = self.current()
+        if manifest is not None:
+            return manifest
+        with self.refresh_lock():
+            return self.current() or self.publish(read_frame())
+
+    def try_lead(self):
+        """Become the refresh leader if no live worker is; the lock is held until this process exits"""
+        if self._leader_file is not None:
+            return True
+        f = open(os.path.join(self.directory, 'leader.lock'), 'a')
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            f.close()
+            return False
+        f.truncate(0)
+        f.write(str(os.getpid()))
+        f.flush()
+        self._leader_file = f
+        return True
+
+    def is_leader(self):
+        """Whether this process holds the leader lock"""
+        return self._leader_file is not None
+
+    def watch(self, on_generation, on_elected, interval=POLL_SECONDS):
+        """
+        Poll from a daemon thread: call on_generation(manifest) when the manifest changes, and
+        on_elected() once if this process becomes the leader
+        """
+        def loop():
+            seen = None
+            while True:
+                try:
+                    stamp = os.stat(self.manifest_path).st_mtime_ns if os.path.exists(self.manifest_path) else None
+                    if stamp is not None and stamp != seen:
+                        seen = stamp
+                        on_generation(self.current())
+                    if not self.is_leader() and self.try_lead():
+                        on_elected()
+                except Exception as e:
+                    print(f"⚠️ Shared snapshot watcher: {e}")
+                time.sleep(interval)
+
+        thread = threading.Thread(target=loop, name='shared-snapshot-watcher', daemon=True)
+        thread.start()
+        return thread
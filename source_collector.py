@@ -0,0 +1,199 @@
+"""
+Concurrent collection from every configured Premier League data source
+FPL, ESPN and football-data.org are fetched at the same time from an asyncio loop, each under
+its own timeout and all through the shared pooled session, so a refresh takes about as long as
+the slowest source rather than the sum of them. Results are merged into the output CSVs, with
+each file taken from the best source that answered
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from fpl_client import fetch_bootstrap_static, get_session
+from fpl_transform import latest_players_frame, latest_teams_frame
+
+# Override with local stub servers for offline testing (FPL uses FPL_API_BASE in fpl_client)
+ESPN_API_BASE = os.environ.get('ESPN_API_BASE', 'https://site.api.espn.com/apis/site/v2/sports/soccer/eng.1').rstrip('/')
+FOOTBALL_DATA_API_BASE = os.environ.get('FOOTBALL_DATA_API_BASE', 'https://api.football-data.org/v4').rstrip('/')
+# football-data.org needs a free API key; the source is skipped without one
+FOOTBALL_DATA_API_KEY = os.environ.get('FOOTBALL_DATA_API_KEY')
+
+OUTPUT_FILES = {
+    'players': 'premier_league_players_latest.csv',
+    'teams': 'premier_league_teams_latest.csv',
+    'team_info': 'premier_league_team_info_latest.csv',
+    'standings': 'premier_league_standings_latest.csv',
+}
+
+# Sources that can fill each output file, best first. ESPN's team list has no FPL strength
+# columns (which match_predictor reads from the teams file), so it gets a file of its own
+OUTPUT_PRIORITY = {
+    'players': ['fpl'],
+    'teams': ['fpl'],
+    'team_info': ['espn_teams'],
+    'standings': ['football_data', 'espn_standings'],
+}
+
+def get_json(url, timeout, headers=None):
+    """GET a JSON document through the shared pooled session"""
+    response = get_session().get(url, headers=headers, timeout=timeout)
+    response.raise_for_status()
+    return response.json()
+
+def espn_standings_frame(espn_data):
+    """League table rows from the ESPN standings payload"""
+    standings_data = []
+    for child in espn_data.get('children', []):
+        for entry in child.get('standings', {}).get('entries', []):
+            team = entry.get('team', {})
+            stat_dict = {stat.get('name', ''): stat.get('value', 0) for stat in entry.get('stats', [])}
+            standings_data.append({
+                'team_name': team.get('displayName', ''),
+                'abbreviation': team.get('abbreviation', ''),
+                'position': entry.get('note', {}).get('rank', 0) if entry.get('note') else 0,
+                'played': stat_dict.get('gamesPlayed', 0),
+                'wins': stat_dict.get('wins', 0),
+                'draws': stat_dict.get('ties', 0),
+                'losses': stat_dict.get('losses', 0),
+                'goals_for': stat_dict.get('pointsFor', 0),
+                'goals_against': stat_dict.get('pointsAgainst', 0),
+                'goal_difference': stat_dict.get('pointDifferential', 0),
+                'points': stat_dict.get('points', 0),
+            })
+    return pd.DataFrame(standings_data)
+
+def espn_teams_frame(espn_data):
+    """Team names, colours and logos from the ESPN teams payload"""
+    teams_data = []
+    for team in espn_data.get('sports', [{}])[0].get('leagues', [{}])[0].get('teams', []):
+        team_info = team.get('team', {})
+        teams_data.append({
+            'team_name': team_info.get('displayName', ''),
+            'abbreviation': team_info.get('abbreviation', ''),
+            'location': team_info.get('location', ''),
+            'color': team_info.get('color', ''),
+            'logo': team_info.get('logos', [{}])[0].get('href', '') if team_info.get('logos') else '',
+        })
+    return pd.DataFrame(teams_data)
+
+def football_data_standings_frame(standings_data):
+    """League table rows from the football-data.org standings payload (same columns as ESPN)"""
+    tables = standings_data.get('standings', [])
+    total = next((table for table in tables if table.get('type') == 'TOTAL'), tables[0] if tables else {})
+    return pd.DataFrame([
+        {
+            'team_name': row.get('team', {}).get('name', ''),
+            'abbreviation': row.get('team', {}).get('tla', ''),
+            'position': row.get('position', 0),
+            'played': row.get('playedGames', 0),
+            'wins': row.get('won', 0),
+            'draws': row.get('draw', 0),
+            'losses': row.get('lost', 0),
+            'goals_for': row.get('goalsFor', 0),
+            'goals_against': row.get('goalsAgainst', 0),
+            'goal_difference': row.get('goalDifference', 0),
+            'points': row.get('points', 0),
+        }
+        for row in total.get('table', [])
+    ])
+
+def fetch_fpl(timeout):
+    """Players and teams from the Fantasy Premier League API (shared, cached bootstrap-static)"""
+    fpl_data = fetch_bootstrap_static(timeout=timeout)
+    return {'players': latest_players_frame(fpl_data), 'teams': latest_teams_frame(fpl_data)}
+
+def fetch_espn_standings(timeout):
+    """League table from the ESPN soccer API"""
+    return {'standings': espn_standings_frame(get_json(f'{ESPN_API_BASE}/standings', timeout))}
+
+def fetch_espn_teams(timeout):
+    """Team metadata from the ESPN soccer API"""
+    return {'team_info': espn_teams_frame(get_json(f'{ESPN_API_BASE}/teams', timeout))}
+
+def fetch_football_data(timeout):
+    """League table from football-data.org"""
+    data = get_json(
+        f'{FOOTBALL_DATA_API_BASE}/competitions/PL/standings', timeout,
+        headers={'X-Auth-Token': FOOTBALL_DATA_API_KEY},
+    )
+    return {'standings': football_data_standings_frame(data)}
+
+# name -> fetch(timeout) returning {output: DataFrame}, its timeout in seconds, and whether it is configured
+SOURCES = {
+    'fpl': {'fetch': fetch_fpl, 'timeout': 20, 'enabled': lambda: True},
+    'espn_standings': {'fetch': fetch_espn_standings, 'timeout': 10, 'enabled': lambda: True},
+    'espn_teams': {'fetch': fetch_espn_teams, 'timeout': 10, 'enabled': lambda: True},
+    'football_data': {'fetch': fetch_football_data, 'timeout': 10, 'enabled': lambda: bool(FOOTBALL_DATA_API_KEY)},
+}
+
+async def run_source(name, executor, timeout):
+    """Fetch one source on the executor; returns its result record, never raises"""
+    loop = asyncio.get_running_loop()
+    result = {'source': name, 'status': 'ok', 'seconds': None, 'error': None, 'frames': {}}
+    start = time.perf_counter()
+    try:
+        # The HTTP timeout bounds each socket wait; wait_for bounds the whole fetch (retries included)
+        result['frames'] = await asyncio.wait_for(loop.run_in_executor(executor, SOURCES[name]['fetch'], timeout), timeout)
+    except asyncio.TimeoutError:
+        result['status'] = 'timeout'
+        result['error'] = f'no response within {timeout:g}s'
+    except Exception as e:
+        result['status'] = 'error'
+        result['error'] = str(e)
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+async def collect_async(names=None, timeouts=None):
+    """Fetch the named sources (default: every configured one) concurrently"""
+    names = [name for name in (names or SOURCES) if SOURCES[name]['enabled']()]
+    if not names:
+        return []
+    timeouts = timeouts or {}
+
+    # Blocking fetches get a thread each so a slow source never holds up the others
+    executor = ThreadPoolExecutor(max_workers=len(names), thread_name_prefix='source')
+    try:
+        return await asyncio.gather(*(
+            run_source(name, executor, timeouts.get(name, SOURCES[name]['timeout'])) for name in names
+        ))
+    finally:
+        # A fetch that timed out is left to finish in the background rather than blocking the refresh
+        executor.shutdown(wait=False)
+
+def collect(names=None, timeouts=None):
+    """Synchronous entry point for collect_async"""
+    return asyncio.run(collect_async(names, timeouts))
+
+def merge_outputs(results, output_dir='.'):
+    """Write each output CSV from the best source that returned rows; returns {output: source}"""
+    frames = {result['source']: result['frames'] for result in results if result['status'] == 'ok'}
+    written = {}
+    for output, priority in OUTPUT_PRIORITY.items():
+        for name in priority:
+            frame = frames.get(name, {}).get(output)
+            if frame is not None and len(frame):
+                frame.to_csv(os.path.join(output_dir, OUTPUT_FILES[output]), index=False)
+                written[output] = name
+                break
+    return written
+
+def collect_to_csv(names=None, output_dir='.', timeouts=None):
+    """Collect every source concurrently, report each one, and write the merged output CSVs"""
+    start = time.perf_counter()
+    results = collect(names, timeouts)
+    for result in results:
+        if result['status'] == 'ok':
+            counts = ', '.join(f"{len(frame)} {output}" for output, frame in result['frames'].items())
+            print(f"✅ {result['source']}: {counts} in {result['seconds']:.2f}s")
+        else:
+            print(f"❌ {result['source']}: {result['error']} ({result['seconds']:.2f}s)")
+
+    written = merge_outputs(results, output_dir)
+    for output, name in written.items():
+        print(f"   Saved {OUTPUT_FILES[output]} from {name}")
+    print(f"Collected {len(results)} sources in {time.perf_counter() - start:.2f}s")
+    return written
@@ -0,0 +1,325 @@
+"""
+Exact FPL squad selection: the best 15 players for an objective within the budget, the position
+quotas and the per-club limit
+Players that can always be swapped for a cheaper, at-least-as-good one are pruned first. Without
+the club limit the problem is a knapsack per position with an exact player count, solved by a
+dynamic program over the budget (in 0.1m steps) and merged across positions. The club limit is
+enforced by branch and bound: when the best squad has too many players from one club, the search
+branches on which of them is left out, the per-position optimum bounding every branch
+Usage: python squad_optimizer.py [objective] [budget] [players csv]
+"""
+
+import heapq
+import sys
+
+import numpy as np
+
+BUDGET = 100.0
+QUOTAS = {'GKP': 2, 'DEF': 5, 'MID': 5, 'FWD': 3}
+MAX_PER_CLUB = 3
+OBJECTIVES = ('total_points', 'form', 'points_per_game')
+
+# Prices are whole multiples of this; objective values are compared to one decimal place
+PRICE_STEP = 0.1
+VALUE_SCALE = 10
+
+# Player columns in stats.csv, with their names in current_season_players.csv
+COLUMN_ALIASES = {'Player': 'name', 'Team': 'team', 'Pos': 'position'}
+
+# Branch and bound gives up after this many squads (the FPL rules need a handful)
+MAX_NODES = 5000
+
+# Per-position DP tables kept for reuse between branches
+TABLE_CACHE_SIZE = 256
+
+class InfeasibleSquadError(ValueError):
+    """No squad satisfies the budget, quotas and club limit"""
+
+class SearchLimitError(ValueError):
+    """The search reached its node limit before it could prove a squad optimal"""
+
+    def __init__(self, nodes):
+        super().__init__(f'Squad search stopped after {nodes} nodes without proving a squad optimal')
+        self.nodes = nodes
+
+def dominated_players(costs, values, clubs, quota, max_per_club, squad_size):
+    """
+    Mask of one position's players that some optimal squad never needs: a dominated player
+    (another costs no more and is worth no less) can be swapped for a dominating one outside the
+    squad unless all of them are blocked, by the quota - 1 other squad places at the position or by
+    the (squad_size - 1) // max_per_club other clubs the rest of the squad could fill
+    """
+    count = len(costs)
+    if count <= quota:
+        return np.zeros(count, dtype=bool)
+    order = np.arange(count)
+    # dominates[q, p]: q is no dearer and no worse than p, ties going to the earlier player
+    no_worse = (costs[:, None] <= costs[None, :]) & (values[:, None] >= values[None, :])
+    identical = (costs[:, None] == costs[None, :]) & (values[:, None] == values[None, :])
+    dominates = no_worse & (~identical | (order[:, None] < order[None, :]))
+
+    club_ids, club_rows = np.unique(clubs, return_inverse=True)
+    by_club = dominates.T.astype(np.int32) @ np.eye(len(club_ids), dtype=np.int32)[club_rows]
+    # Dominators from the player's own club can always replace it
+    by_club[order, club_rows] = 0
+    blocked_clubs = (squad_size - 1) // max_per_club
+    blocked = np.sort(by_club, axis=1)[:, ::-1][:, :blocked_clubs].sum(axis=1)
+    return dominates.sum(axis=0) - (quota - 1) - blocked >= 1
+
+def position_table(costs, scores, count, budget):
+    """
+    (best, took): best[k, b] is the best summed score of exactly k of these players costing at
+    most b (-inf when impossible); took[i] marks the (k, b) cells that player i improved, which is
+    all that is kept for reading the chosen players back
+    """
+    best = np.full((count + 1, budget + 1), -np.inf)
+    best[0] = 0
+    took = np.zeros((len(costs), count + 1, budget + 1), dtype=bool)
+    for i, (cost, score) in enumerate(zip(costs, scores)):
+        if cost > budget:
+            continue
+        candidate = best[:-1, :budget + 1 - cost] + score
+        improved = candidate > best[1:, cost:]
+        took[i, 1:, cost:] = improved
+        best[1:, cost:][improved] = candidate[improved]
+    return best, took
+
+def chosen_players(took, costs, count, budget):
+    """Indices of the players behind best[count, budget]"""
+    chosen = []
+    for i in range(len(took) - 1, -1, -1):
+        if count == 0:
+            break
+        if took[i, count, budget]:
+            chosen.append(i)
+            count -= 1
+            budget -= costs[i]
+    return chosen
+
+def merge_budgets(a, b):
+    """Max-plus convolution: c[x] is the best a[y] + b[x - y]"""
+    merged = np.full(len(a), -np.inf)
+    # a never decreases with the budget, so only the budgets where it improves are worth splitting at
+    improves = np.empty(len(a), dtype=bool)
+    improves[0] = np.isfinite(a[0])
+    improves[1:] = a[1:] > a[:-1]
+    for y in np.flatnonzero(improves):
+        np.maximum(merged[y:], a[y] + b[:len(a) - y], out=merged[y:])
+    return merged
+
+def split_budget(a, b, total):
+    """A budget y with a[y] + b[total - y] as large as possible"""
+    candidates = a[:total + 1] + b[total::-1]
+    return int(np.argmax(candidates))
+
+class SquadSearch:
+    """One optimization: the pruned candidate pool, cached per-position tables and the search state"""
+
+    def __init__(self, positions, clubs, costs, scores, budget, quotas, max_per_club):
+        self.budget = budget
+        self.quotas = quotas
+        self.max_per_club = max_per_club
+        self.costs = costs
+        self.scores = scores
+        self.clubs = clubs
+        self.candidates = {}
+        squad_size = sum(quotas.values())
+        for position, quota in quotas.items():
+            rows = np.flatnonzero(positions == position)
+            pruned = dominated_players(costs[rows], scores[rows], clubs[rows], quota, max_per_club, squad_size)
+            self.candidates[position] = rows[~pruned]
+        self.candidate_sets = {position: frozenset(rows.tolist()) for position, rows in self.candidates.items()}
+        self._tables = {}
+        self.nodes = 0
+
+    def position_table(self, position, excluded):
+        """Cached (rows, best, took) DP tables for a position's candidates minus the excluded rows"""
+        key = (position, excluded)
+        if key not in self._tables:
+            rows = np.array([row for row in self.candidates[position] if row not in excluded], dtype=np.intp)
+            self._tables[key] = (rows, *position_table(self.costs[rows], self.scores[rows], self.quotas[position], self.budget))
+            if len(self._tables) > TABLE_CACHE_SIZE:
+                del self._tables[next(iter(self._tables))]
+        return self._tables[key]
+
+    def relaxed(self, forced, excluded):
+        """
+        Best squad ignoring the club limit that contains every forced row and no excluded one:
+        (score, rows), or None if there is none within the budget
+        """
+        self.nodes += 1
+        forced_rows = sorted(forced)
+        budget = self.budget - int(self.costs[forced_rows].sum())
+        if budget < 0:
+            return None
+
+        tables = []
+        for position, quota in self.quotas.items():
+            candidates = self.candidate_sets[position]
+            at_position = frozenset(row for row in forced_rows if row in candidates)
+            need = quota - len(at_position)
+            if need < 0:
+                return None
+            rows, best, took = self.position_table(position, (excluded | at_position) & candidates)
+            tables.append((rows, best, took, need))
+
+        # best[i][b]: best score of a position's remaining picks within b; prefixes[i] merges positions 0..i
+        best = [table[need] for _, table, _, need in tables]
+        prefixes = [best[0]]
+        for table in best[1:-1]:
+            prefixes.append(merge_budgets(prefixes[-1], table))
+        if not np.isfinite(prefixes[-1][:budget + 1] + best[-1][budget::-1]).any():
+            return None
+
+        # Walk back from the last position, splitting the remaining budget at each step
+        budgets = [0] * len(best)
+        remaining = budget
+        for i in range(len(best) - 1, 0, -1):
+            spent_before = split_budget(prefixes[i - 1], best[i], remaining)
+            budgets[i] = remaining - spent_before
+            remaining = spent_before
+        budgets[0] = remaining
+
+        squad = list(forced_rows)
+        for (rows, _, took, need), position_budget in zip(tables, budgets):
+            chosen = chosen_players(took, self.costs[rows], need, position_budget)
+            squad.extend(int(rows[i]) for i in chosen)
+        return float(self.scores[squad].sum()), squad
+
+    def branches(self, squad, forced, excluded):
+        """
+        (forced, excluded) children covering every squad that keeps the most crowded over-limit
+        club within the limit, or None if squad already respects it: the i-th child keeps the
+        first i - 1 of that club's unforced picks and leaves out the i-th
+        """
+        counts = np.bincount(self.clubs[squad])
+        club = int(np.argmax(counts))
+        if counts[club] <= self.max_per_club:
+            return None
+        picks = [row for row in squad if self.clubs[row] == club and row not in forced]
+        room = self.max_per_club - sum(1 for row in forced if self.clubs[row] == club)
+        # Weakest first, so the early children drop the players that cost the least score
+        picks.sort(key=lambda row: self.scores[row])
+        children = []
+        for i in range(room + 1):
+            child_forced = forced | frozenset(picks[:i])
+            child_excluded = excluded | {picks[i]}
+            if i == room:
+                # The club is full: none of its other players can join
+                club_rows = np.flatnonzero(self.clubs == club).tolist()
+                child_excluded |= frozenset(row for row in club_rows if row not in child_forced)
+            children.append((child_forced, frozenset(child_excluded)))
+        return children
+
+    def solve(self, max_nodes=MAX_NODES):
+        """(score, rows) of the best squad within every rule"""
+        root = self.relaxed(frozenset(), frozenset())
+        if root is None:
+            raise InfeasibleSquadError('No squad fits the budget and position quotas')
+        best = None
+        # Best-first: the node with the highest relaxed score is expanded next
+        queue = [(-root[0], 0, root[1], frozenset(), frozenset())]
+        tiebreak = 1
+        while queue:
+            bound, _, squad, forced, excluded = heapq.heappop(queue)
+            if best is not None and -bound <= best[0]:
+                break
+            children = self.branches(squad, forced, excluded)
+            if children is None:
+                best = (-bound, squad)
+                continue
+            if self.nodes >= max_nodes:
+                raise SearchLimitError(self.nodes)
+            for child_forced, child_excluded in children:
+                result = self.relaxed(child_forced, child_excluded)
+                if result is not None and (best is None or result[0] > best[0]):
+                    heapq.heappush(queue, (-result[0], tiebreak, result[1], child_forced, child_excluded))
+                    tiebreak += 1
+        if best is None:
+            raise InfeasibleSquadError(f'No squad fits the budget with at most {self.max_per_club} players per club')
+        return best
+
+def optimize_squad(positions, clubs, prices, values, budget=BUDGET, quotas=QUOTAS, max_per_club=MAX_PER_CLUB, max_nodes=MAX_NODES):
+    """
+    Row numbers of the best squad for parallel arrays of positions, clubs, prices and objective
+    values, plus search statistics. Among equally valued squads the cheapest is chosen
+    """
+    positions = np.asarray(positions, dtype=object)
+    prices = np.asarray(prices, dtype=np.float64)
+    values = np.nan_to_num(np.asarray(values, dtype=np.float64))
+    _, clubs = np.unique(np.asarray(clubs, dtype=str), return_inverse=True)
+
+    # Players without a price cannot be bought
+    usable = np.flatnonzero(np.isfinite(prices) & np.isin(positions, list(quotas)))
+    costs = np.round(prices[usable] / PRICE_STEP).astype(np.int64)
+    budget_steps = int(round(budget / PRICE_STEP))
+    # Integer scores rank by value first, then by lower cost (a squad never costs more than the budget)
+    scores = np.round(values[usable] * VALUE_SCALE) * (budget_steps + 1) - costs
+
+    search = SquadSearch(positions[usable], clubs[usable], costs, scores.astype(np.float64), budget_steps, quotas, max_per_club)
+    _, squad = search.solve(max_nodes)
+    rows = usable[sorted(squad)]
+    return {
+        'rows': rows.tolist(),
+        'value': float(values[rows].sum()),
+        'cost': round(float(costs[sorted(squad)].sum()) * PRICE_STEP, 1),
+        'candidates': sum(len(rows) for rows in search.candidates.values()),
+        'nodes': search.nodes,
+    }
+
+def squad_records(players, objective):
+    """The squad as Player/Team/Pos/price/value records, goalkeepers to forwards and best first"""
+    order = list(QUOTAS)
+    records = [
+        {
+            'Player': player['Player'],
+            'Team': player['Team'],
+            'Pos': player['Pos'],
+            'price': player['price'],
+            objective: player[objective],
+        }
+        for player in players
+    ]
+    records.sort(key=lambda record: (order.index(record['Pos']), -(record[objective] or 0)))
+    return records
+
+def optimize_from_store(store, objective='total_points', budget=BUDGET, max_per_club=MAX_PER_CLUB, max_nodes=MAX_NODES):
+    """The best squad from a snapshot's player store, as an API payload"""
+    if objective not in OBJECTIVES or objective not in store.kinds:
+        raise ValueError(f'Unknown objective: {objective} (use {", ".join(OBJECTIVES)})')
+    result = optimize_squad(
+        store.column('Pos'), store.column('Team'), store.column('price'), store.column(objective),
+        budget, QUOTAS, max_per_club, max_nodes,
+    )
+    players = store.rows(result['rows'], fields=['Player', 'Team', 'Pos', 'price', objective])
+    return {
+        'objective': objective,
+        'budget': budget,
+        'max_per_club': max_per_club,
+        'total_cost': result['cost'],
+        'total_value': round(result['value'], 1),
+        'squad': squad_records(players, objective),
+        'search': {'candidates': result['candidates'], 'nodes': result['nodes']},
+    }
+
+if __name__ == '__main__':
+    import time
+
+    import pandas as pd
+
+    objective = sys.argv[1] if len(sys.argv) > 1 else 'total_points'
+    budget = float(sys.argv[2]) if len(sys.argv) > 2 else BUDGET
+    path = sys.argv[3] if len(sys.argv) > 3 else 'stats.csv'
+
+    df = pd.read_csv(path)
+    df = df.rename(columns={alias: name for name, alias in COLUMN_ALIASES.items() if name not in df.columns})
+    start = time.perf_counter()
+    result = optimize_squad(df['Pos'], df['Team'], df['price'], df[objective], budget)
+    elapsed = time.perf_counter() - start
+
+    squad = squad_records(df.iloc[result['rows']].to_dict('records'), objective)
+    print(f"⚽ Best squad by {objective} from {path} (£{budget:.1f}m budget)\n")
+    for player in squad:
+        print(f"   {player['Pos']:<4}{player['Player']:<30}{player['Team']:<16}£{player['price']:>5.1f}m{player[objective]:>8}")
+    print(f"\n✅ {objective} {result['value']:.1f} for £{result['cost']:.1f}m "
+          f"({result['candidates']} candidates, {result['nodes']} squads searched, {elapsed * 1e3:.1f} ms)")
@@ -0,0 +1,199 @@
+"""
+Server-Sent Events fan-out for snapshot notifications
+One asyncio event loop in a background thread holds every subscriber connection, so a
+thousand open dashboards cost sockets and small buffers rather than a Flask worker thread
+each. Publishers on any thread hand events over with publish(); each client has a bounded
+queue and is disconnected if it falls that far behind (EventSource reconnects on its own,
+and a reconnecting client is sent the latest event if its Last-Event-ID is older)
+"""
+
+import asyncio
+import os
+import threading
+from urllib.parse import parse_qs, urlsplit
+
+STREAM_PATH = '/api/stats/stream'
+STREAM_HOST = os.environ.get('STATS_STREAM_HOST', '0.0.0.0')
+STREAM_PORT = int(os.environ.get('STATS_STREAM_PORT', '5001'))
+
+HEARTBEAT_SECONDS = 15   # comment lines keep proxies from closing idle streams and expose dead clients
+CLIENT_QUEUE_SIZE = 16   # undelivered events a client may lag behind before it is dropped
+RETRY_MS = 5000          # reconnect delay suggested to EventSource
+MAX_HEADER_BYTES = 16 * 1024
+
+STREAM_HEADERS = (
+    'HTTP/1.1 200 OK\r\n'
+    'Content-Type: text/event-stream\r\n'
+    'Cache-Control: no-cache\r\n'
+    'Connection: keep-alive\r\n'
+    'Access-Control-Allow-Origin: *\r\n'
+    'X-Accel-Buffering: no\r\n'
+    '\r\n'
+).encode('ascii')
+
+def format_event(event, data, event_id=None):
+    """Encode one SSE message"""
+    lines = [] if event_id is None else [f'id: {event_id}']
+    lines.append(f'event: {event}')
+    lines.extend(f'data: {line}' for line in (data.splitlines() or ['']))
+    return ('\n'.join(lines) + '\n\n').encode('utf-8')
+
+def plain_response(status, body=b'', headers=''):
+    """A complete non-streaming HTTP response"""
+    return (
+        f'HTTP/1.1 {status}\r\nContent-Length: {len(body)}\r\nAccess-Control-Allow-Origin: *\r\n'
+        f'{headers}Connection: close\r\n\r\n'
+    ).encode('ascii') + body
+
+class SSEBroadcaster:
+    """Serves STREAM_PATH on its own port from a background event loop"""
+
+    def __init__(self, host=STREAM_HOST, port=STREAM_PORT, path=STREAM_PATH, reuse_port=False):
+        self.host = host
+        self.port = port
+        self.path = path
+        # Lets every server worker bind the same port; the kernel spreads clients across them
+        self.reuse_port = reuse_port
+        self.clients = set()
+        self.latest = None  # (event id, encoded message) of the last event published
+        self.loop = None
+        self.server = None
+        self._ready = threading.Event()
+        self._error = None
+
+    def start(self):
+        """Start the event loop thread and bind the port; returns self"""
+        thread = threading.Thread(target=self._run, name='sse-broadcaster', daemon=True)
+        thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            raise self._error
+        return self
+
+    def _run(self):
+        """Event loop thread: bind the server, then serve until close()"""
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            self.server = loop.run_until_complete(
+                asyncio.start_server(
+                    self._handle, self.host, self.port, limit=MAX_HEADER_BYTES, reuse_port=self.reuse_port or None,
+                )
+            )
+        except OSError as e:
+            self._error = e
+            self._ready.set()
+            return
+        # Port 0 binds an ephemeral port; report the real one
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.loop = loop
+        self._ready.set()
+        loop.run_forever()
+
+    def is_running(self):
+        """Whether the stream port is being served"""
+        return self.loop is not None
+
+    def client_count(self):
+        """Number of connected subscribers"""
+        return len(self.clients)
+
+    def publish(self, event, data, event_id=None):
+        """Queue an event for every connected client; safe to call from any thread"""
+        message = format_event(event, data, event_id)
+        if self.loop is None:
+            self.latest = (event_id, message)
+            return
+        self.loop.call_soon_threadsafe(self._broadcast, event_id, message)
+
+    def _broadcast(self, event_id, message):
+        """Loop-thread side of publish()"""
+        self.latest = (event_id, message)
+        for queue in list(self.clients):
+            self._broadcast_to(queue, message)
+
+    def _broadcast_to(self, queue, message):
+        """Queue a message for one client, disconnecting it if its queue is full"""
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Too far behind: drop the backlog and tell the client's task to hang up
+            self.clients.discard(queue)
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(None)
+
+    async def _handle(self, reader, writer):
+        """Answer one connection: CORS preflight, 404, or an event stream"""
+        try:
+            request = await reader.readuntil(b'\r\n\r\n')
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            writer.close()
+            return
+
+        request_line, *header_lines = request.decode('latin-1').split('\r\n')
+        method, target, *_ = request_line.split(' ') + ['', '']
+        headers = dict(
+            (name.strip().lower(), value.strip())
+            for name, _, value in (line.partition(':') for line in header_lines if line)
+        )
+        url = urlsplit(target)
+
+        if method == 'OPTIONS':
+            writer.write(plain_response('204 No Content', headers='Access-Control-Allow-Headers: Last-Event-ID, Cache-Control\r\n'))
+        elif method != 'GET' or url.path != self.path:
+            writer.write(plain_response('404 Not Found', b'Not Found'))
+        else:
+            # Browsers send Last-Event-ID on reconnect; polyfills often pass it in the query string
+            last_id = headers.get('last-event-id') or parse_qs(url.query).get('lastEventId', [''])[0]
+            await self._stream(writer, last_id)
+            return
+        await self._close(writer)
+
+    async def _stream(self, writer, last_id):
+        """Send events to one subscriber until it disconnects or is dropped"""
+        queue = asyncio.Queue(CLIENT_QUEUE_SIZE)
+        self.clients.add(queue)
+        try:
+            writer.write(STREAM_HEADERS + f'retry: {RETRY_MS}\n\n'.encode('ascii'))
+            if self.latest is not None and str(self.latest[0]) != last_id:
+                writer.write(self.latest[1])
+            await writer.drain()
+
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    message = b': ping\n\n'
+                if message is None:
+                    break
+                writer.write(message)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.clients.discard(queue)
+            await self._close(writer)
+
+    async def _close(self, writer):
+        """Flush and close a connection, ignoring clients that already went away"""
+        try:
+            await writer.drain()
+            writer.close()
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+    def close(self):
+        """Stop accepting clients and stop the event loop"""
+        if self.loop is None:
+            return
+        loop, self.loop = self.loop, None
+
+        def stop():
+            self.server.close()
+            for queue in list(self.clients):
+                self._broadcast_to(queue, None)
+            loop.call_later(0.1, loop.stop)
+
+        loop.call_soon_threadsafe(stop)
@@ -0,0 +1,160 @@
+"""
+Leaderboards and team totals maintained across refreshes
+Each leaderboard keeps a ranked buffer of more rows than it serves, so a per-player delta can
+patch it without sorting the table; team totals are patched by subtracting old and adding new
+values. Anything the delta cannot answer exactly falls back to a full recompute
+"""
+
+import numpy as np
+import pandas as pd
+
+from player_delta import compute_player_delta
+
+# Served leaderboards: name -> (ranking column, columns in each record)
+LEADERBOARDS = {
+    'top_scorers': ('Gls', ['Player', 'Team', 'Gls', 'Ast', 'total_points']),
+    'top_assists': ('Ast', ['Player', 'Team', 'Ast', 'Gls', 'total_points']),
+    'top_points': ('total_points', ['Player', 'Team', 'total_points', 'Gls', 'Ast']),
+}
+TOP_N = 10
+
+# Rows ranked per leaderboard; the slack beyond TOP_N absorbs players dropping out
+BUFFER_SIZE = 64
+
+# Team total columns: output name -> source column (PlayerCount counts non-null names)
+TEAM_TOTALS = [('TotalGoals', 'Gls'), ('TotalAssists', 'Ast'), ('TotalPoints', 'total_points')]
+TEAM_COLUMNS = {'Team', 'Player', *(column for _, column in TEAM_TOTALS)}
+
+def rank_key(values, row_id):
+    """Sort key matching DataFrame.nlargest(keep='first'): larger value first, then row order"""
+    return (-values[row_id], row_id)
+
+def ranked_rows(values, row_ids):
+    """Row ids ordered best first, with NaN values left out"""
+    row_ids = np.asarray(row_ids, dtype=np.int64)
+    row_ids = row_ids[~np.isnan(values[row_ids])]
+    return row_ids[np.lexsort((row_ids, -values[row_ids]))]
+
+def full_leaderboard(store, column):
+    """Rank every row of a column and keep the best BUFFER_SIZE"""
+    values = store.column(column).astype(np.float64)
+    order = ranked_rows(values, np.arange(len(store)))
+    rows = order[:BUFFER_SIZE]
+    return {
+        'column': column,
+        'rows': rows,
+        # Every row outside the buffer ranks strictly after this key; None means nothing is outside
+        'boundary': rank_key(values, rows[-1]) if len(order) > len(rows) else None,
+    }
+
+def patch_leaderboard(board, store, changed_rows):
+    """Re-rank only the changed rows against the buffer; None if the buffer can no longer answer"""
+    values = store.column(board['column']).astype(np.float64)
+    changed = set(changed_rows.tolist())
+    candidates = [row_id for row_id in board['rows'].tolist() if row_id not in changed]
+    candidates.extend(changed)
+    order = ranked_rows(values, candidates)
+
+    boundary = board['boundary']
+    if boundary is not None:
+        # Rows that fell past the boundary may now trail unseen rows outside the buffer
+        order = np.array([row_id for row_id in order.tolist() if rank_key(values, row_id) <= boundary], dtype=np.int64)
+        if len(order) < TOP_N:
+            return None
+
+    if len(order) > BUFFER_SIZE:
+        order = order[:BUFFER_SIZE]
+        boundary = rank_key(values, order[-1])
+    return {'column': board['column'], 'rows': order, 'boundary': boundary}
+
+def team_frame(store):
+    """Team and total columns of a store as a DataFrame"""
+    return pd.DataFrame({column: store.column(column) for column in sorted(TEAM_COLUMNS)})
+
+def full_team_totals(store):
+    """Per-team sums and player counts: team -> [goals, assists, points, players, rows]"""
+    frame = team_frame(store)
+    grouped = frame.groupby('Team')
+    # Summed column by column: a row of the summed frame would upcast every total to float as soon
+    # as one column is float, while the patched totals keep each column's own type
+    sums = [grouped[column].sum().tolist() for _, column in TEAM_TOTALS]
+    players = grouped['Player'].count().tolist()
+    rows = grouped.size()
+    return {
+        team: [*(column_sums[i] for column_sums in sums), int(players[i]), int(rows.iloc[i])]
+        for i, team in enumerate(rows.index)
+    }
+
+def team_contributions(store, row_ids):
+    """Each row's team and its contribution to the team totals"""
+    teams = store.column('Team')[row_ids].tolist()
+    names = store.column('Player')[row_ids]
+    values = [np.nan_to_num(store.column(column)[row_ids].astype(np.float64)) for _, column in TEAM_TOTALS]
+    exact = [store.kinds[column] != 'float' for _, column in TEAM_TOTALS]
+    present = (~pd.isna(names)).tolist()
+    for position, team in enumerate(teams):
+        sums = [int(v[position]) if is_int else float(v[position]) for v, is_int in zip(values, exact)]
+        yield team, [*sums, int(present[position]), 1]
+
+def patch_team_totals(totals, previous, store, changed_rows):
+    """Move the changed rows' old contributions out of their teams and the new ones in"""
+    totals = {team: list(entry) for team, entry in totals.items()}
+    for sign, source in ((-1, previous), (1, store)):
+        for team, contribution in team_contributions(source, changed_rows):
+            if team is None or team != team:
+                continue  # groupby drops players without a team
+            entry = totals.setdefault(team, [0] * len(contribution))
+            for position, value in enumerate(contribution):
+                entry[position] += sign * value
+    return {team: entry for team, entry in totals.items() if entry[-1] > 0}
+
+def build_aggregates(store):
+    """Compute every leaderboard and the team totals from scratch"""
+    boards = {name: full_leaderboard(store, column) for name, (column, _) in LEADERBOARDS.items()}
+    return {'leaderboards': boards, 'teams': full_team_totals(store), 'mode': 'full'}
+
+def update_aggregates(previous_aggregates, previous_store, store):
+    """Patch the previous aggregates with the delta between two stores, recomputing only as a fallback"""
+    if not previous_aggregates:
+        return build_aggregates(store)
+    delta = compute_player_delta(previous_store, store)
+    if delta is None:
+        return build_aggregates(store)
+
+    boards = {}
+    for name, board in previous_aggregates['leaderboards'].items():
+        changed_rows = delta['columns'].get(board['column'])
+        if changed_rows is None:
+            boards[name] = board
+            continue
+        patched = patch_leaderboard(board, store, changed_rows)
+        boards[name] = patched or full_leaderboard(store, board['column'])
+
+    team_rows = [delta['columns'][column] for column in TEAM_COLUMNS if column in delta['columns']]
+    teams = previous_aggregates['teams']
+    if team_rows:
+        teams = patch_team_totals(teams, previous_store, store, np.unique(np.concatenate(team_rows)))
+
+    return {
+        'leaderboards': boards,
+        'teams': teams,
+        'mode': 'incremental',
+        'changed_players': len(delta['rows']),
+        'changed_rows': delta['rows'],
+    }
+
+def leaderboard_records(store, aggregates, name):
+    """Top TOP_N records of a leaderboard with its configured columns"""
+    _, fields = LEADERBOARDS[name]
+    return store.rows(aggregates['leaderboards'][name]['rows'][:TOP_N], fields)
+
+def team_records(aggregates):
+    """Team totals as records sorted by team name, like groupby('Team')"""
+    return [
+        {
+            'Team': team,
+            **{output: entry[position] for position, (output, _) in enumerate(TEAM_TOTALS)},
+            'PlayerCount': entry[len(TEAM_TOTALS)],
+        }
+        for team, entry in sorted(aggregates['teams'].items())
+    ]
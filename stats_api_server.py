@@ -1,198 +1,778 @@
-from flask import Flask, jsonify, send_from_directory
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
-import pandas as pd
 import json
-from datetime import datetime, timedelta
+from datetime import datetime
 import os
 import threading
 import time
-import subprocess
-import sys
+
+# pandas, NumPy, pyarrow and the collectors are imported by the functions that load, build or
+# collect snapshots, so the server starts and answers /api/health before any of them load
+from refresh_scheduler import RefreshScheduler
+from sse_broadcaster import SSEBroadcaster
+from response_cache import ResponseCache, choose_encoding
+from shared_snapshot import SHARED_DIR, SharedSnapshot
+from stats_changes import ChangeLog, changes_payload
+from stats_db import (
+    QueryError, build_shared_stats_database, build_stats_database, is_ignored_param, query_from_args,
+)
+from stats_snapshot import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, build_snapshot, decode_cursor, error_snapshot,
+    normalize_position, page_player_ids, query_player_ids,
+)
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for React frontend
 
-# Global variable to store stats data
-stats_data = {}
-last_update = None
+# The published snapshot; replaced as a whole, never mutated, so readers need no lock
+snapshot = error_snapshot('Stats not loaded yet', 0)
+snapshot_lock = threading.RLock()  # Serializes publishers only
+response_cache = ResponseCache()
+change_log = ChangeLog()  # Per-version diffs behind /api/stats/changes
+stream_broadcaster = SSEBroadcaster()  # Pushes a notification per published version to /api/stats/stream clients
+shared_snapshot = None  # Set in each worker when several server processes share one snapshot (see wsgi.py)
+match_predictor = None  # Kept warm between requests; rebuilt when its team strengths file changes
+predictor_lock = threading.Lock()
+simulation_runs = {}  # (team file, mtime, simulations) -> {'lock', 'result'}; dropped when the team file changes
+simulation_lock = threading.Lock()  # Guards simulation_runs; each run has its own lock, which requests for it wait on
 
-def load_stats_data():
-    """Load the latest stats data from CSV files"""
-    global stats_data, last_update
+# stats.csv is kept only as a persistence sink so a restarted server starts from the last collection
+PERSIST_STATS_CSV = os.environ.get('STATS_PERSIST_CSV', '1') != '0'
+
+# Most fixtures scored by one /api/predict request
+MAX_PREDICT_FIXTURES = 50000
+
+# Largest budget /api/optimize accepts, in £m
+MAX_OPTIMIZE_BUDGET = 200.0
+
+# Season simulation sizes served (requests are rounded up to one, so every run is computed once per
+# team file and shared), and processes per run. The default size is run on the refresh thread
+SIMULATION_SIZES = (1000, 10000, 100000)
+SIMULATION_WORKERS = int(os.environ.get('STATS_SIMULATION_WORKERS', '1'))
+
+# Stands in for the player list while the rest of /api/stats is serialized; NULs never occur in real values
+PLAYERS_PLACEHOLDER = '\x00players\x00'
+
+def publish_snapshot(build, version=None):
+    """Build a snapshot with the next (or the given) version number and swap it in atomically"""
+    global snapshot
+    with snapshot_lock:
+        previous = snapshot
+        new_snapshot = build(previous['version'] + 1 if version is None else version)
+        snapshot = new_snapshot
+        if new_snapshot['version'] <= previous['version']:
+            # A restarted numbering: the cache only ever advances to newer versions on its own
+            response_cache.clear()
+        change_log.record(previous, new_snapshot)
+        # Published under the lock so subscribers see versions in order
+        stream_broadcaster.publish('snapshot', stream_event(previous, new_snapshot), new_snapshot['version'])
+    return new_snapshot
+
+def stream_event(previous, current):
+    """
+    The /api/stats/stream message for a new version: the changes since the previous one without
+    player rows (clients fetch those by id), or just {"full": true} when it could not be diffed
+    """
+    since = previous['version']
+    changes = change_log.since(since, current['version'])
+    if changes is None or current['players'] is None:
+        return app.json.dumps({'version': current['version'], 'since': since, 'full': True})
+    payload, _ = changes_payload(current, since, changes)
+    return app.json.dumps(payload)
+
+def read_stats_frame():
+    """Read the latest stats, preferring the memory-mapped columnar snapshot over stats.csv"""
+    import pandas as pd
+    from columnar_snapshot import STATS_SNAPSHOT_PATH, read_snapshot, snapshot_is_fresh
     
+    if snapshot_is_fresh(STATS_SNAPSHOT_PATH, 'stats.csv'):
+        try:
+            return read_snapshot(STATS_SNAPSHOT_PATH)
+        except Exception as e:
+            print(f"⚠️ Could not read {STATS_SNAPSHOT_PATH}, falling back to stats.csv: {e}")
+    
+    # Empty columns stay '' as in the collector output instead of becoming NaN
+    return pd.read_csv('stats.csv', keep_default_na=False)
+
+def build_stats_snapshot(df, version, loaded_at=None):
+    """Build the next snapshot and the query database over it (the API still serves without one)"""
+    new_snapshot = build_snapshot(df, version, previous=snapshot, loaded_at=loaded_at)
     try:
-        # Load main stats data
-        if os.path.exists('stats.csv'):
-            df = pd.read_csv('stats.csv')
-            
-            # Convert to JSON format for API
-            players = df.to_dict('records')
-            
-            # Get top performers
-            top_scorers = df.nlargest(10, 'Gls')[['Player', 'Team', 'Gls', 'Ast', 'total_points']].to_dict('records')
-            top_assists = df.nlargest(10, 'Ast')[['Player', 'Team', 'Ast', 'Gls', 'total_points']].to_dict('records')
-            top_points = df.nlargest(10, 'total_points')[['Player', 'Team', 'total_points', 'Gls', 'Ast']].to_dict('records')
-            
-            # Team statistics
-            team_stats = df.groupby('Team').agg({
-                'Gls': 'sum',
-                'Ast': 'sum',
-                'total_points': 'sum',
-                'Player': 'count'
-            }).reset_index()
-            team_stats.columns = ['Team', 'TotalGoals', 'TotalAssists', 'TotalPoints', 'PlayerCount']
-            team_stats = team_stats.to_dict('records')
-            
-            # Update global stats data
-            stats_data = {
-                'players': players,
-                'top_scorers': top_scorers,
-                'top_assists': top_assists,
-                'top_points': top_points,
-                'team_stats': team_stats,
-                'total_players': len(players),
-                'total_teams': df['Team'].nunique(),
-                'last_updated': datetime.now().isoformat(),
-                'status': 'success'
-            }
-            
-            last_update = datetime.now()
-            print(f"✅ Stats data loaded: {len(players)} players, {df['Team'].nunique()} teams")
-            
+        if shared_snapshot is not None:
+            new_snapshot['database'] = build_shared_stats_database(df, version, shared_snapshot.directory)
         else:
-            stats_data = {'error': 'Stats file not found', 'status': 'error'}
-            print("❌ stats.csv not found")
+            new_snapshot['database'] = build_stats_database(df, version)
+    except Exception as e:
+        print(f"⚠️ Could not build the query database: {e}")
+        new_snapshot['database'] = None
+    return new_snapshot
+
+def load_stats_data():
+    """Load the latest stats data from CSV files and publish it as a new snapshot"""
+    if shared_snapshot is not None:
+        return adopt_shared_snapshot(shared_snapshot.ensure_published(read_stats_frame))
+    
+    from columnar_snapshot import STATS_SNAPSHOT_PATH, snapshot_is_fresh
+    
+    def build(version):
+        try:
+            # Load main stats data
+            if os.path.exists('stats.csv') or snapshot_is_fresh(STATS_SNAPSHOT_PATH, 'stats.csv'):
+                df = read_stats_frame()
+                new_snapshot = build_stats_snapshot(df, version)
+                stats = new_snapshot['stats']
+                print(f"✅ Stats data loaded: {stats['total_players']} players, {stats['total_teams']} teams")
+                return new_snapshot
             
+            print("❌ stats.csv not found")
+            return error_snapshot('Stats file not found', version)
+        
+        except Exception as e:
+            print(f"❌ Error loading stats: {e}")
+            return error_snapshot(str(e), version)
+    
+    return publish_snapshot(build)
+
+def get_snapshot():
+    """Return the published snapshot, loading the first one on demand"""
+    if snapshot['version'] == 0:
+        with snapshot_lock:
+            if snapshot['version'] == 0:
+                load_stats_data()
+    return snapshot
+
+def get_match_predictor():
+    """The warm match predictor, (re)built on first use and whenever its team file changes"""
+    global match_predictor
+    from match_predictor import load_predictor
+    
+    current = match_predictor
+    if current is None or not current.is_current():
+        with predictor_lock:
+            match_predictor = load_predictor(match_predictor)
+            current = match_predictor
+    return current
+
+def warm_up():
+    """Load the first snapshot, then the match predictor and the default season simulation"""
+    get_snapshot()
+    try:
+        get_match_predictor()
     except Exception as e:
-        stats_data = {'error': str(e), 'status': 'error'}
-        print(f"❌ Error loading stats: {e}")
+        print(f"⚠️ Match predictor not loaded: {e}")
+        return
+    warm_simulation()
+
+def load_in_background():
+    """Load the first snapshot (and the predictor) in a daemon thread so the server accepts requests (and health checks) at once"""
+    thread = threading.Thread(target=warm_up, name='initial-load', daemon=True)
+    thread.start()
+    return thread
+
+def cached_json(cache_key, build_payload):
+    """Serve a JSON payload serialized once per snapshot version, with ETag and 304 support"""
+    current = get_snapshot()
+    
+    def serialize():
+        payload = build_payload(current['stats'], current)
+        # Builders may hand back JSON text they rendered themselves (e.g. from the player store)
+        if not isinstance(payload, str):
+            payload = app.json.dumps(payload)
+        return payload.encode('utf-8')
+    
+    entry = response_cache.get(cache_key, current['version'], serialize)
+    encoding = choose_encoding(request.headers.get('Accept-Encoding'))
+    
+    if entry.matches(request.headers.get('If-None-Match')):
+        response = Response(status=304)
+    else:
+        body = entry.encode(encoding)
+        response = Response(body, mimetype='application/json')
+        if body is not entry.body:
+            response.headers['Content-Encoding'] = encoding
+    
+    response.headers['ETag'] = entry.etag_for(encoding)
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def adopt_shared_snapshot(manifest):
+    """Publish a shared generation in this worker, with the generation as its version"""
+    with snapshot_lock:
+        if manifest['generation'] <= snapshot['version']:
+            return snapshot
+        from columnar_snapshot import read_snapshot
+        
+        # Column data stays backed by the shared memory-mapped file; the publish time keeps
+        # last_updated, and so the response bodies and ETags, identical across workers
+        df = read_snapshot(manifest['path'])
+        loaded_at = datetime.fromtimestamp(manifest['published_at'])
+        return publish_snapshot(lambda version: build_stats_snapshot(df, version, loaded_at), version=manifest['generation'])
+
+def collect_stats():
+    """Run the collectors; returns the stats DataFrame"""
+    from football_stats import get_latest_premier_league_data
+    
+    print("🔄 Running automatic stats update...")
+    stat_df = get_latest_premier_league_data(save_csv=PERSIST_STATS_CSV, show_highlights=False)
+    
+    if stat_df is None:
+        print("❌ Stats update failed")
+        raise RuntimeError('Stats collection failed, see data_collection_log.json')
+    return stat_df
+
+def update_shared_snapshot():
+    """Collect and publish a new shared generation, unless another worker did while this one waited"""
+    requested_at = time.time()
+    with shared_snapshot.refresh_lock():
+        manifest = shared_snapshot.current()
+        if manifest is None or manifest['published_at'] < requested_at:
+            manifest = shared_snapshot.publish(collect_stats())
+    new_snapshot = adopt_shared_snapshot(manifest)
+    print(f"✅ Stats generation {manifest['generation']} published: {new_snapshot['stats'].get('total_players', 0)} players")
+    return manifest['generation']
 
 def update_stats_automatically():
-    """Run the stats collection script automatically"""
+    """Collect fresh stats in-process, then build and publish the new snapshot"""
     try:
-        print("🔄 Running automatic stats update...")
-        result = subprocess.run([
-            sys.executable, 'football_stats.py'
-        ], capture_output=True, text=True, cwd='.')
-        
-        if result.returncode == 0:
-            print("✅ Stats updated successfully")
-            load_stats_data()
-        else:
-            print(f"❌ Stats update failed: {result.stderr}")
-            
-    except Exception as e:
-        print(f"❌ Error updating stats: {e}")
+        return publish_collected_stats()
+    finally:
+        # Rerun the default simulation here if the team strengths changed, rather than in a request
+        warm_simulation()
+
+def publish_collected_stats():
+    """Collect and publish stats (a shared generation when several workers serve them); returns the version"""
+    if shared_snapshot is not None:
+        return update_shared_snapshot()
+    
+    stat_df = collect_stats()
+    
+    # Leaderboards and team totals are patched from the current snapshot's per-player delta
+    new_snapshot = publish_snapshot(lambda version: build_stats_snapshot(stat_df, version))
+    aggregates = new_snapshot['aggregates']
+    if aggregates['mode'] == 'incremental':
+        print(f"✅ Stats updated successfully: {new_snapshot['stats']['total_players']} players ({aggregates['changed_players']} changed)")
+    else:
+        print(f"✅ Stats updated successfully: {new_snapshot['stats']['total_players']} players")
+    return new_snapshot['version']
+
+# Runs collection in the background; concurrent triggers share one in-flight job
+refresh_scheduler = RefreshScheduler(update_stats_automatically)
 
-def background_updater():
-    """Background thread to update stats every hour"""
-    while True:
-        time.sleep(3600)  # Wait 1 hour
-        update_stats_automatically()
+def with_players_json(payload, players_json):
+    """Serialize payload with its 'players' entry replaced by already-rendered player JSON"""
+    body = app.json.dumps({**payload, 'players': PLAYERS_PLACEHOLDER})
+    return body.replace(json.dumps(PLAYERS_PLACEHOLDER), players_json, 1)
+
+def requested_fields(current):
+    """Player columns named by ?fields=, None for all; ValueError naming unknown columns"""
+    fields = [field for field in request.args.get('fields', '').split(',') if field]
+    if not fields or current['players'] is None:
+        return None
+    unknown = [field for field in fields if field not in current['players'].kinds]
+    if unknown:
+        raise ValueError(f'Unknown field(s): {", ".join(unknown)}')
+    return fields
 
 @app.route('/api/stats')
 def get_stats():
-    """Get all stats data"""
-    if not stats_data:
-        load_stats_data()
-    return jsonify(stats_data)
+    """Get all stats data (?players=0 leaves out the player list, ?fields= projects it)"""
+    current = get_snapshot()
+    include_players = request.args.get('players', '1') not in ('0', 'false', 'no')
+    try:
+        fields = requested_fields(current) if include_players else None
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    
+    def build_payload(stats, current):
+        players = current['players']
+        if players is None or not include_players:
+            return stats
+        # Serialize everything else as usual, then splice in the store's own player JSON
+        return with_players_json(stats, players.to_json(fields=fields))
+    
+    if not include_players:
+        cache_key = 'stats?players=0'
+    else:
+        cache_key = 'stats' + (f'?fields={",".join(fields)}' if fields else '')
+    return cached_json(cache_key, build_payload)
 
 @app.route('/api/stats/players')
 def get_players():
-    """Get all players data"""
-    if not stats_data:
-        load_stats_data()
-    return jsonify(stats_data.get('players', []))
+    """
+    Get players data, optionally filtered by team, position, nation or name
+    ?fields= limits the columns; ?limit= and ?cursor= page through the rows by player name, returning
+    {"players": [...], "next_cursor": ..., "total": n} instead of a bare list
+    """
+    current = get_snapshot()
+    filters = {
+        field: request.args.get(field, '')
+        for field in ('team', 'position', 'nation', 'name')
+    }
+    cursor = request.args.get('cursor', '')
+    paged = 'limit' in request.args or bool(cursor)
+    try:
+        limit = int(request.args.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        return jsonify({'status': 'error', 'message': 'limit must be an integer'}), 400
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    try:
+        fields = requested_fields(current)
+        if cursor:
+            decode_cursor(cursor)
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    
+    cache_key = 'players?' + '&'.join(f'{field}={value}' for field, value in filters.items() if value)
+    if fields:
+        cache_key += f'&fields={",".join(fields)}'
+    if paged:
+        cache_key += f'&limit={limit}&cursor={cursor}'
+    
+    def build_payload(stats, current):
+        players = current['players']
+        if players is None:
+            return {'players': [], 'next_cursor': None, 'total': 0} if paged else []
+        ids = query_player_ids(current['indexes'], **filters)
+        if not paged:
+            return players.to_json(ids, fields)
+        
+        # Only the page's rows (and only the requested columns) are serialized
+        page, next_cursor = page_player_ids(ids, current['indexes'], cursor, limit)
+        total = len(players) if ids is None else len(ids)
+        return with_players_json({'next_cursor': next_cursor, 'total': total}, players.to_json(page, fields))
+    
+    return cached_json(cache_key, build_payload)
+
+@app.route('/api/stats/players/<int:player_id>/similar')
+def get_similar_players(player_id):
+    """The k players most like one player by per-90 output and price (?k=10&position=MID)"""
+    from player_similarity import DEFAULT_K, MAX_K, similar_players
+    
+    current = get_snapshot()
+    if current['players'] is None or current.get('similarity') is None:
+        return jsonify({'status': 'error', 'message': 'Player data not available'}), 503
+    if player_id >= len(current['players']):
+        return jsonify({'status': 'error', 'message': f'Unknown player id: {player_id}'}), 404
+    
+    try:
+        k = int(request.args.get('k', DEFAULT_K))
+    except ValueError:
+        return jsonify({'status': 'error', 'message': 'k must be an integer'}), 400
+    k = max(1, min(k, MAX_K))
+    position = normalize_position(request.args.get('position', '')) or None
+    
+    def build_payload(stats, current):
+        return similar_players(current['players'], current['similarity'], player_id, k, position)
+    
+    return cached_json(f'similar?id={player_id}&k={k}&position={position or ""}', build_payload)
+
+@app.route('/api/stats/changes')
+def get_changes():
+    """
+    Get what changed since a snapshot version (?since=<version>, ?players=0 to skip player rows)
+    Changed player rows come with their row ids in player_ids; when the version is too old to
+    diff from, the full stats are returned with "full": true
+    """
+    try:
+        since = int(request.args.get('since', 0))
+    except ValueError:
+        return jsonify({'status': 'error', 'message': 'since must be an integer'}), 400
+    include_players = request.args.get('players', '1') not in ('0', 'false', 'no')
+    
+    def build_payload(stats, current):
+        payload, player_ids = changes_payload(current, since, change_log.since(since, current['version']))
+        players = current['players']
+        if players is None or not include_players:
+            payload.pop('player_ids', None)
+            return payload
+        return with_players_json(payload, players.to_json(player_ids))
+    
+    return cached_json(f'changes?since={since}&players={int(include_players)}', build_payload)
+
+@app.route('/api/stats/stream')
+def stream_stats():
+    """
+    Live snapshot notifications as Server-Sent Events
+    The stream is served by the broadcaster's event loop on its own port, so an open connection
+    does not hold a Flask worker; this route redirects EventSource clients there
+    """
+    if not stream_broadcaster.is_running():
+        return jsonify({'status': 'error', 'message': 'Live updates are not enabled on this server'}), 503
+    # Same host the client used, with the stream's port (a bare IPv6 literal ends in ']')
+    host = request.host if request.host.endswith(']') else request.host.rsplit(':', 1)[0]
+    query = f'?{request.query_string.decode()}' if request.query_string else ''
+    return Response(status=307, headers={
+        'Location': f'{request.scheme}://{host}:{stream_broadcaster.port}{stream_broadcaster.path}{query}',
+        'Cache-Control': 'no-cache',
+    })
+
+def start_shared_worker(directory=SHARED_DIR, refresh_interval=3600):
+    """
+    Run this process as one of several workers serving a snapshot shared through directory
+    Loads the current generation, follows new ones, and runs the periodic refresh if elected
+    """
+    global shared_snapshot
+    shared_snapshot = SharedSnapshot(directory)
+    refresh_scheduler.job_dir = shared_snapshot.jobs_dir
+    load_in_background()
+    
+    def on_elected():
+        print(f"👑 Worker {os.getpid()} runs the scheduled refresh")
+        refresh_scheduler.start_periodic(refresh_interval)
+    
+    shared_snapshot.watch(adopt_shared_snapshot, on_elected)
+    # Every worker serves the stream port and pushes the generations it adopts
+    stream_broadcaster.reuse_port = True
+    start_stream()
+
+def start_stream():
+    """Start serving /api/stats/stream; the API keeps working without it if the port is taken"""
+    try:
+        stream_broadcaster.start()
+        print(f"📡 Live updates streaming on port {stream_broadcaster.port}")
+    except OSError as e:
+        print(f"⚠️ Could not start the live update stream: {e}")
+
+@app.route('/api/stats/leaderboard')
+def get_leaderboard():
+    """Get the top N players for any numeric stat, optionally filtered by team, position or nation"""
+    from leaderboards import DEFAULT_SIZE, MAX_SIZE, stat_leaderboard
+    
+    current = get_snapshot()
+    stat = request.args.get('stat', 'total_points')
+    if current['players'] is not None and stat not in current['sorted_indexes']:
+        return jsonify({
+            'status': 'error',
+            'message': f'Unknown or non-numeric stat: {stat}',
+            'stats': sorted(current['sorted_indexes']),
+        }), 400
+    
+    try:
+        n = int(request.args.get('n', DEFAULT_SIZE))
+    except ValueError:
+        return jsonify({'status': 'error', 'message': 'n must be an integer'}), 400
+    n = max(1, min(n, MAX_SIZE))
+    
+    filters = {
+        field: request.args.get(field, '')
+        for field in ('team', 'position', 'nation')
+    }
+    cache_key = f'leaderboard?stat={stat}&n={n}&' + '&'.join(f'{field}={value}' for field, value in filters.items() if value)
+    
+    def build_payload(stats, current):
+        players = current['players']
+        if players is None:
+            return []
+        row_ids = query_player_ids(current['indexes'], **filters)
+        return stat_leaderboard(players, current['sorted_indexes'], stat, n, row_ids)
+    
+    return cached_json(cache_key, build_payload)
+
+def query_response(dataset, run_query):
+    """Serve a query against the snapshot's database, cached per version and normalized query string"""
+    current = get_snapshot()
+    database = current['database']
+    if database is None:
+        return jsonify({'status': 'error', 'message': 'Query database not available'}), 503
+    if dataset not in database.datasets:
+        return jsonify({
+            'status': 'error',
+            'message': f'Unknown dataset: {dataset}',
+            'datasets': sorted(database.datasets),
+        }), 404
+    
+    args = '&'.join(
+        f'{key}={value}' for key, value in sorted(request.args.items(multi=True)) if not is_ignored_param(key)
+    )
+    
+    def build_payload(stats, current):
+        current_database = current['database'] or database
+        columns = current_database.dataset(dataset)['columns']
+        return run_query(current_database, query_from_args(request.args, columns))
+    
+    try:
+        # The query only runs on a cache miss; a rejected query raises before anything is cached
+        return cached_json(f'{request.path}?{args}', build_payload)
+    except QueryError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+
+@app.route('/api/datasets')
+def get_datasets():
+    """List the queryable datasets with their columns and row counts"""
+    def build_payload(stats, current):
+        database = current['database']
+        return database.describe() if database is not None else []
+    
+    return cached_json('datasets', build_payload)
+
+@app.route('/api/query/<dataset>')
+def query_dataset(dataset):
+    """Filter, sort and page through any dataset (?col=value&min_col=&max_col=&sort=&order=&limit=&offset=&fields=)"""
+    def run_query(database, query):
+        query.pop('by', None)
+        query.pop('metrics', None)
+        return database.select(dataset, **query)
+    
+    return query_response(dataset, run_query)
+
+@app.route('/api/query/<dataset>/groups')
+def group_dataset(dataset):
+    """Grouped counts and aggregates for any dataset (?by=Team&metrics=sum:Gls,avg:xG&sort=&order=&limit=)"""
+    def run_query(database, query):
+        if not query.get('by'):
+            raise QueryError('by is required (e.g. by=Team)')
+        return database.group(dataset, **query)
+    
+    return query_response(dataset, run_query)
 
 @app.route('/api/stats/top-scorers')
 def get_top_scorers():
     """Get top scorers"""
-    if not stats_data:
-        load_stats_data()
-    return jsonify(stats_data.get('top_scorers', []))
+    return cached_json('top_scorers', lambda stats, current: stats.get('top_scorers', []))
 
 @app.route('/api/stats/top-assists')
 def get_top_assists():
     """Get top assist providers"""
-    if not stats_data:
-        load_stats_data()
-    return jsonify(stats_data.get('top_assists', []))
+    return cached_json('top_assists', lambda stats, current: stats.get('top_assists', []))
 
 @app.route('/api/stats/top-points')
 def get_top_points():
     """Get top fantasy points"""
-    if not stats_data:
-        load_stats_data()
-    return jsonify(stats_data.get('top_points', []))
+    return cached_json('top_points', lambda stats, current: stats.get('top_points', []))
 
 @app.route('/api/stats/teams')
 def get_team_stats():
     """Get team statistics"""
-    if not stats_data:
-        load_stats_data()
-    return jsonify(stats_data.get('team_stats', []))
+    return cached_json('team_stats', lambda stats, current: stats.get('team_stats', []))
 
 @app.route('/api/stats/summary')
 def get_summary():
     """Get summary statistics"""
-    if not stats_data:
-        load_stats_data()
-    
-    summary = {
-        'total_players': stats_data.get('total_players', 0),
-        'total_teams': stats_data.get('total_teams', 0),
-        'last_updated': stats_data.get('last_updated'),
-        'status': stats_data.get('status', 'unknown')
-    }
+    def build_summary(stats, current):
+        summary = {
+            'total_players': stats.get('total_players', 0),
+            'total_teams': stats.get('total_teams', 0),
+            'last_updated': stats.get('last_updated'),
+            'status': stats.get('status', 'unknown')
+        }
+        
+        if 'top_scorers' in stats and stats['top_scorers']:
+            summary['leading_scorer'] = stats['top_scorers'][0]
+        
+        if 'top_assists' in stats and stats['top_assists']:
+            summary['leading_assists'] = stats['top_assists'][0]
+        
+        return summary
     
-    if 'top_scorers' in stats_data and stats_data['top_scorers']:
-        summary['leading_scorer'] = stats_data['top_scorers'][0]
+    return cached_json('summary', build_summary)
+
+def requested_fixtures():
+    """
+    (home, away) team lists from a POSTed {"fixtures": [{"home": ..., "away": ...} or [home, away], ...]}
+    body or from comma-separated ?home=&away= lists; raises ValueError when malformed
+    """
+    if request.method == 'POST':
+        body = request.get_json(silent=True)
+        fixtures = body.get('fixtures') if isinstance(body, dict) else body
+        if not isinstance(fixtures, list):
+            raise ValueError('POST a JSON body {"fixtures": [{"home": "ARS", "away": "LIV"}, ...]}')
+        home, away = [], []
+        for fixture in fixtures:
+            if isinstance(fixture, dict) and 'home' in fixture and 'away' in fixture:
+                home.append(fixture['home'])
+                away.append(fixture['away'])
+            elif isinstance(fixture, list) and len(fixture) == 2:
+                home.append(fixture[0])
+                away.append(fixture[1])
+            else:
+                raise ValueError(f'Fixtures need a home and an away team: {fixture!r}')
+    else:
+        home = [team for team in request.args.get('home', '').split(',') if team]
+        away = [team for team in request.args.get('away', '').split(',') if team]
+        if len(home) != len(away):
+            raise ValueError('home and away must list the same number of teams')
+    if not home:
+        raise ValueError('No fixtures given (?home=ARS&away=LIV, or POST {"fixtures": [...]})')
+    if len(home) > MAX_PREDICT_FIXTURES:
+        raise ValueError(f'At most {MAX_PREDICT_FIXTURES} fixtures per request')
+    return home, away
+
+@app.route('/api/predict', methods=['GET', 'POST'])
+def predict_matches():
+    """Home win / draw / away win probabilities and expected goals for a batch of fixtures"""
+    from match_predictor import UnknownTeamError
     
-    if 'top_assists' in stats_data and stats_data['top_assists']:
-        summary['leading_assists'] = stats_data['top_assists'][0]
+    try:
+        predictor = get_match_predictor()
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': f'Match predictor not available: {e}'}), 503
     
-    return jsonify(summary)
+    try:
+        home, away = requested_fixtures()
+        predictions = predictor.predictions(home, away)
+    except UnknownTeamError as e:
+        return jsonify({'status': 'error', 'message': str(e), 'teams': predictor.short_names}), 400
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    
+    return jsonify({
+        'status': 'success',
+        'model': {key: value for key, value in predictor.describe().items() if key != 'teams'},
+        'count': len(predictions),
+        'predictions': predictions,
+    })
 
-@app.route('/api/stats/update')
-def trigger_update():
-    """Manually trigger stats update"""
+def season_simulation(predictor, simulations):
+    """The predictor's season simulated `simulations` times (one of SIMULATION_SIZES), run at most once per team file"""
+    from season_simulator import SEED, simulate_season
+    
+    key = (predictor.source, predictor.source_mtime, simulations)
+    with simulation_lock:
+        run = simulation_runs.get(key)
+        if run is None:
+            for cached_key in [cached_key for cached_key in simulation_runs if cached_key[:2] != key[:2]]:
+                del simulation_runs[cached_key]
+            run = simulation_runs[key] = {'lock': threading.Lock(), 'result': None}
+    
+    # Requests for a run in progress wait for it; other sizes are not held up
+    with run['lock']:
+        if run['result'] is None:
+            run['result'] = simulate_season(predictor, simulations, SIMULATION_WORKERS, SEED)
+    return run['result']
+
+def warm_simulation():
+    """Run the default season simulation for the current team file, so no request has to"""
+    from season_simulator import SIMULATIONS
+    
     try:
-        update_stats_automatically()
-        return jsonify({'status': 'success', 'message': 'Stats update triggered'})
+        season_simulation(get_match_predictor(), SIMULATIONS)
     except Exception as e:
-        return jsonify({'status': 'error', 'message': str(e)})
+        print(f"⚠️ Season simulation not run: {e}")
+
+@app.route('/api/stats/simulation')
+def get_simulation():
+    """
+    Title, top-four and relegation probabilities from Monte Carlo runs of the remaining fixtures
+    ?simulations= is rounded up to the next of SIMULATION_SIZES; the seed is fixed, so results are reproducible
+    """
+    from season_simulator import SIMULATIONS
+    
+    try:
+        simulations = int(request.args.get('simulations', SIMULATIONS))
+    except ValueError:
+        return jsonify({'status': 'error', 'message': 'simulations must be an integer'}), 400
+    simulations = next((size for size in SIMULATION_SIZES if size >= simulations), SIMULATION_SIZES[-1])
+    
+    try:
+        predictor = get_match_predictor()
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': f'Team strengths not available: {e}'}), 503
+    
+    cache_key = f'simulation?simulations={simulations}&teams={predictor.source_mtime}'
+    return cached_json(
+        cache_key,
+        lambda stats, current: {'status': 'success', **season_simulation(predictor, simulations)},
+    )
+
+@app.route('/api/optimize')
+def get_optimal_squad():
+    """Best FPL squad within the budget, 2/5/5/3 quotas and 3 per club (?objective=total_points|form|points_per_game&budget=100.0)"""
+    from squad_optimizer import BUDGET, OBJECTIVES, SearchLimitError, optimize_from_store
+    
+    objective = request.args.get('objective', 'total_points')
+    if objective not in OBJECTIVES:
+        return jsonify({'status': 'error', 'message': f'Unknown objective: {objective}', 'objectives': list(OBJECTIVES)}), 400
+    try:
+        budget = round(float(request.args.get('budget', BUDGET)), 1)
+    except ValueError:
+        return jsonify({'status': 'error', 'message': 'budget must be a number'}), 400
+    if not 0 < budget <= MAX_OPTIMIZE_BUDGET:
+        return jsonify({'status': 'error', 'message': f'budget must be above 0 and at most {MAX_OPTIMIZE_BUDGET}'}), 400
+    
+    if get_snapshot()['players'] is None:
+        return jsonify({'status': 'error', 'message': 'Player data not available'}), 503
+    
+    try:
+        # Solved once per snapshot version, objective and budget
+        return cached_json(
+            f'optimize?objective={objective}&budget={budget}',
+            lambda stats, current: {'status': 'success', **optimize_from_store(current['players'], objective, budget)},
+        )
+    except SearchLimitError as e:
+        # The request is valid; this player pool is just too hard for the search's node limit
+        return jsonify({'status': 'error', 'message': str(e), 'nodes': e.nodes}), 503
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+
+@app.route('/api/stats/update')
+def trigger_update():
+    """Manually trigger a background stats update and return its job id"""
+    job, coalesced = refresh_scheduler.trigger(reason='manual')
+    message = 'Joined update already in progress' if coalesced else 'Stats update started'
+    return jsonify({
+        'status': 'accepted',
+        'message': message,
+        'job_id': job['job_id'],
+        'coalesced': coalesced,
+    }), 202
+
+@app.route('/api/stats/update/<job_id>')
+def get_update_status(job_id):
+    """Get the status of a background stats update"""
+    job = refresh_scheduler.get_job(job_id)
+    if job is None:
+        return jsonify({'status': 'error', 'message': 'Unknown job id'}), 404
+    return jsonify(job)
 
 @app.route('/api/health')
 def health_check():
     """Health check endpoint"""
+    current = snapshot
     return jsonify({
         'status': 'healthy',
         'timestamp': datetime.now().isoformat(),
-        'data_loaded': bool(stats_data),
-        'last_update': last_update.isoformat() if last_update else None
+        'data_loaded': current['stats'].get('status') == 'success',
+        'data_version': current['version'],
+        'last_update': current['loaded_at'].isoformat() if current['loaded_at'] else None,
+        'update_in_progress': refresh_scheduler.is_running(),
     })
 
 if __name__ == '__main__':
     print("🚀 Starting Premier League Stats API Server...")
     
-    # Load initial data
-    load_stats_data()
+    # Load initial data while the server starts; data requests wait for it
+    load_in_background()
+    
+    # Schedule hourly background updates
+    refresh_scheduler.start_periodic(3600)
     
-    # Start background updater thread
-    updater_thread = threading.Thread(target=background_updater, daemon=True)
-    updater_thread.start()
+    # The debug reloader's parent process only watches files; the stream belongs to the serving child
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_stream()
     
     print("📊 Stats API Server running on http://localhost:5000")
     print("🔄 Automatic updates every hour")
     print("\nAvailable endpoints:")
-    print("  📈 /api/stats - All stats data")
-    print("  👥 /api/stats/players - All players")
+    print("  📈 /api/stats - All stats data (?players=0 for the slim version, ?fields=)")
+    print("  👥 /api/stats/players - All players (?team=&position=&nation=&name=&fields=&limit=&cursor=)")
     print("  🥅 /api/stats/top-scorers - Top scorers")
     print("  🎯 /api/stats/top-assists - Top assists")
     print("  👑 /api/stats/top-points - Top fantasy points")
+    print("  🧬 /api/stats/players/<id>/similar - Most similar players (?k=&position=)")
+    print("  🔁 /api/stats/changes - Changes since a version (?since=&players=0)")
+    print("  📡 /api/stats/stream - Server-Sent Events on every new version")
+    print("  📶 /api/stats/leaderboard - Top N for any stat (?stat=&n=&team=&position=&nation=)")
     print("  🏟️ /api/stats/teams - Team statistics")
+    print("  🗃️ /api/datasets - Queryable datasets (stats, current_season, pl_data)")
+    print("  🔎 /api/query/<dataset> - Filter, sort, page (?col=&min_col=&max_col=&sort=&order=&limit=&offset=&fields=)")
+    print("  🧮 /api/query/<dataset>/groups - Grouped aggregates (?by=&metrics=sum:col,avg:col)")
     print("  📋 /api/stats/summary - Summary stats")
-    print("  🔄 /api/stats/update - Manual update trigger")
+    print("  🎲 /api/stats/simulation - Season simulation: title, top-four and relegation odds (?simulations=)")
+    print("  🧩 /api/optimize - Best FPL squad for a budget (?objective=total_points|form|points_per_game&budget=100.0)")
+    print("  🔮 /api/predict - Match outcome probabilities (?home=ARS&away=LIV, or POST a batch of fixtures)")
+    print("  🔄 /api/stats/update - Manual update trigger (returns a job id)")
+    print("  🧾 /api/stats/update/<job_id> - Update job status")
     print("  💚 /api/health - Health check")
     
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
@@ -0,0 +1,92 @@
+"""
+Bounded log of what changed between consecutive snapshots, for /api/stats/changes
+Every published version records which player rows, leaderboards and teams differ from the
+version before it. A client a few versions behind gets the union of those changes rendered
+from the current snapshot; one further behind than the log reaches, or across a refresh that
+could not be diffed (players added or removed), gets the full stats instead
+"""
+
+import threading
+from collections import deque
+
+DEFAULT_MAX_VERSIONS = 48
+
+LEADERBOARD_KEYS = ('top_scorers', 'top_assists', 'top_points')
+
+def snapshot_changes(previous, current):
+    """Player row ids, leaderboard names and team names changed from previous to current, or None"""
+    if previous['players'] is None or current['players'] is None:
+        return None
+    # Only an incremental refresh knows which rows moved; a full rebuild means the rows did not line up
+    rows = current['aggregates'].get('changed_rows')
+    if rows is None:
+        return None
+
+    old_stats, stats = previous['stats'], current['stats']
+    old_teams = {team['Team']: team for team in old_stats.get('team_stats', [])}
+    return {
+        'players': set(rows.tolist()),
+        'leaderboards': {key for key in LEADERBOARD_KEYS if old_stats.get(key) != stats.get(key)},
+        'teams': {team['Team'] for team in stats.get('team_stats', []) if old_teams.get(team['Team']) != team},
+    }
+
+class ChangeLog:
+    """Ring of per-version changes; the oldest versions fall off once max_versions are kept"""
+
+    def __init__(self, max_versions=DEFAULT_MAX_VERSIONS):
+        self.entries = deque(maxlen=max_versions)
+        self.lock = threading.Lock()
+
+    def record(self, previous, current):
+        """Log the changes that produced current from previous"""
+        # since() reads each entry as the diff from the version just before it; one taken across a
+        # gap or from a restarted numbering is not, so it only marks where the chain restarts
+        consecutive = previous['version'] == current['version'] - 1
+        entry = {'version': current['version'], 'changes': snapshot_changes(previous, current) if consecutive else None}
+        with self.lock:
+            if self.entries and self.entries[-1]['version'] >= current['version']:
+                self.entries.clear()
+            self.entries.append(entry)
+
+    def since(self, version, current_version):
+        """Union of the changes after version up to current_version, or None if they are not all logged"""
+        merged = {'players': set(), 'leaderboards': set(), 'teams': set()}
+        if version == current_version:
+            return merged
+        if version > current_version:
+            return None
+
+        with self.lock:
+            entries = [entry for entry in self.entries if version < entry['version'] <= current_version]
+        # Every version in between must be present and diffable
+        if [entry['version'] for entry in entries] != list(range(version + 1, current_version + 1)):
+            return None
+        for entry in entries:
+            if entry['changes'] is None:
+                return None
+            for key, values in entry['changes'].items():
+                merged[key] |= values
+        return merged
+
+def changes_payload(current, since, changes):
+    """
+    The response for a client at version `since`, without player rows
+    Returns (payload, player row ids to splice in as 'players', or None for every row)
+    """
+    stats = current['stats']
+    if changes is None:
+        return {**stats, 'version': current['version'], 'since': since, 'full': True}, None
+
+    team_stats = [team for team in stats.get('team_stats', []) if team['Team'] in changes['teams']]
+    payload = {
+        'version': current['version'],
+        'since': since,
+        'full': False,
+        'total_players': stats.get('total_players', 0),
+        'total_teams': stats.get('total_teams', 0),
+        'last_updated': stats.get('last_updated'),
+        'player_ids': sorted(changes['players']),
+        'team_stats': team_stats,
+        **{key: stats.get(key, []) for key in sorted(changes['leaderboards'])},
+    }
+    return payload, payload['player_ids']
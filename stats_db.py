@@ -0,0 +1,317 @@
+"""
+Embedded SQLite query backend for the stats API
+Every dataset (the live stats snapshot and the season files) is a table in an on-disk database
+with an index on each column, and requests run as parameterized queries against it, so several
+seasons are served without keeping them in memory as Python objects. The snapshot's table is
+written to a new file per version; the season files are loaded once into a database keyed by
+their modification times and attached read-only
+"""
+
+import fcntl
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+from urllib.parse import quote
+
+DB_DIR = os.environ.get('STATS_DB_DIR', '.stats_db')
+
+# Per-process snapshot databases: stats-<pid>-v<version>.sqlite
+STATS_FILE_PATTERN = re.compile(r'stats-(?P<pid>\d+)-v(?P<version>\d+)\.sqlite')
+
+def read_csv_table(path):
+    """A plain CSV season file"""
+    import pandas as pd
+
+    return pd.read_csv(path)
+
+def read_pipe_table_file(path):
+    """A pipe-delimited season file, via its columnar snapshot (converted once, see pipe_table.py)"""
+    from pipe_table import load_pipe_table
+
+    return load_pipe_table(path)
+
+# dataset -> (source file, reader); loaded into the attached seasons database. pandas is only
+# imported by the readers and write_tables, so queries against built databases never load it
+SEASON_FILES = {
+    'current_season': ('current_season_players.csv', read_csv_table),
+    'pl_data': ('PL data.csv', read_pipe_table_file),
+}
+SEASONS_SCHEMA = 'seasons'
+STATS_DATASET = 'stats'
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+AGGREGATES = {'sum': 'SUM', 'avg': 'AVG', 'min': 'MIN', 'max': 'MAX'}
+
+# Query-string parameters that are not column filters
+RESERVED_PARAMS = {'sort', 'order', 'limit', 'offset', 'fields', 'by', 'metrics'}
+
+_build_lock = threading.Lock()
+
+class QueryError(ValueError):
+    """A request that names unknown columns or has malformed parameters"""
+
+def quote_name(name):
+    """SQL identifier for a (validated) column or table name"""
+    return '"' + name.replace('"', '""') + '"'
+
+def write_tables(path, frames):
+    """Write {table: DataFrame} to a new database file with an index on every column"""
+    import pandas as pd
+
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    con = sqlite3.connect(tmp_path)
+    try:
+        con.execute('PRAGMA journal_mode=OFF')
+        con.execute('PRAGMA synchronous=OFF')
+        for table, df in frames.items():
+            # Categoricals and pandas string arrays are stored as plain text
+            df = df.astype({column: object for column in df.columns if not pd.api.types.is_numeric_dtype(df[column].dtype)})
+            df.to_sql(table, con, index=False)
+            for i, (column, kind) in enumerate(column_kinds(con, quote_name(table)).items()):
+                collate = ' COLLATE NOCASE' if kind == 'text' else ''
+                con.execute(f'CREATE INDEX {quote_name(f"ix_{table}_{i}")} ON {quote_name(table)} ({quote_name(column)}{collate})')
+        con.execute('ANALYZE')
+        con.commit()
+    finally:
+        con.close()
+    os.replace(tmp_path, path)
+
+def column_kinds(con, table, schema='main'):
+    """{column: 'number' | 'text'} from a table's declared types"""
+    rows = con.execute(f'PRAGMA {schema}.table_info({table})').fetchall()
+    return {name: 'number' if declared in ('INTEGER', 'REAL') else 'text' for _, name, declared, *_ in rows}
+
+def season_database(db_dir=DB_DIR):
+    """Path of the seasons database for the current season files, building it if they changed"""
+    sources = {name: path for name, (path, _) in SEASON_FILES.items() if os.path.exists(path)}
+    key = hashlib.sha1(repr(sorted(
+        (name, path, os.path.getmtime(path), os.path.getsize(path)) for name, path in sources.items()
+    )).encode('utf-8')).hexdigest()[:16]
+    path = os.path.join(db_dir, f'seasons-{key}.sqlite')
+
+    with _build_lock:
+        if not os.path.exists(path):
+            os.makedirs(db_dir, exist_ok=True)
+            write_tables(path, {name: SEASON_FILES[name][1](source) for name, source in sources.items()})
+    return path
+
+def process_alive(pid):
+    """Whether a process with this pid exists"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def build_stats_database(stats_df, version, db_dir=DB_DIR):
+    """Write one snapshot's stats table and return a StatsDatabase over it and the season tables"""
+    os.makedirs(db_dir, exist_ok=True)
+    path = os.path.join(db_dir, f'stats-{os.getpid()}-v{version}.sqlite')
+    write_tables(path, {STATS_DATASET: stats_df})
+
+    # Keep the previous version's file for readers still holding the old snapshot, and drop
+    # files left behind by server processes that have exited. Anything not named like our own files
+    # (a backup, a renamed copy) is left alone
+    for name in os.listdir(db_dir):
+        match = STATS_FILE_PATTERN.fullmatch(name)
+        if match is None:
+            continue
+        pid, file_version = int(match['pid']), int(match['version'])
+        if (pid == os.getpid() and file_version < version - 1) or not process_alive(pid):
+            os.remove(os.path.join(db_dir, name))
+
+    return StatsDatabase(path, {SEASONS_SCHEMA: season_database(db_dir)})
+
+def build_shared_stats_database(stats_df, generation, shared_dir, db_dir=DB_DIR):
+    """StatsDatabase for a generation shared by several server processes; the first one here writes it"""
+    path = os.path.join(shared_dir, f'stats-g{generation}.sqlite')
+    with open(os.path.join(shared_dir, 'database.lock'), 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        if not os.path.exists(path):
+            write_tables(path, {STATS_DATASET: stats_df})
+        seasons = season_database(db_dir)
+    return StatsDatabase(path, {SEASONS_SCHEMA: seasons})
+
+class StatsDatabase:
+    """Read-only view of one snapshot's database; each thread opens its own connection on first use"""
+
+    def __init__(self, path, attached=None):
+        self.path = path
+        self.attached = attached or {}
+        self._local = threading.local()
+
+        # dataset -> {'table': qualified table name, 'columns': {column: kind}, 'rows': count}
+        self.datasets = {}
+        con = self.connection()
+        for schema in ['main', *self.attached]:
+            for (table,) in con.execute(f"SELECT name FROM {schema}.sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"):
+                qualified = f'{schema}.{quote_name(table)}'
+                self.datasets[table] = {
+                    'table': qualified,
+                    'columns': column_kinds(con, quote_name(table), schema),
+                    'rows': con.execute(f'SELECT COUNT(*) FROM {qualified}').fetchone()[0],
+                }
+
+    def connection(self):
+        """This thread's connection, with the season database attached"""
+        con = getattr(self._local, 'con', None)
+        if con is None:
+            # Files are never modified after they are written, so SQLite can skip locking
+            con = sqlite3.connect(f'file:{quote(os.path.abspath(self.path))}?mode=ro&immutable=1', uri=True)
+            for schema, path in self.attached.items():
+                con.execute(f'ATTACH DATABASE ? AS {schema}', (f'file:{quote(os.path.abspath(path))}?mode=ro&immutable=1',))
+            self._local.con = con
+        return con
+
+    def describe(self):
+        """Datasets with their columns and row counts"""
+        return [
+            {'dataset': name, 'rows': info['rows'], 'columns': info['columns']}
+            for name, info in sorted(self.datasets.items())
+        ]
+
+    def dataset(self, name):
+        """A dataset's table info; QueryError if there is no such dataset"""
+        if name not in self.datasets:
+            raise QueryError(f'Unknown dataset: {name}')
+        return self.datasets[name]
+
+    def fetch(self, sql, params):
+        """Run a query and return its rows as dicts"""
+        cursor = self.connection().execute(sql, params)
+        names = [column[0] for column in cursor.description]
+        return [dict(zip(names, row)) for row in cursor]
+
+    def select(self, name, filters=None, ranges=None, sort=None, descending=False, limit=DEFAULT_LIMIT, offset=0, fields=None):
+        """One page of rows matching the filters, plus the total number of matches"""
+        info = self.dataset(name)
+        columns = info['columns']
+        selected = ', '.join(quote_name(column) for column in check_columns(columns, fields)) if fields else '*'
+        where, params = where_clause(columns, filters, ranges)
+        order = order_clause(columns, sort, descending)
+
+        total = self.connection().execute(f"SELECT COUNT(*) FROM {info['table']}{where}", params).fetchone()[0]
+        rows = self.fetch(f"SELECT {selected} FROM {info['table']}{where}{order} LIMIT ? OFFSET ?", [*params, limit, offset])
+        return {'dataset': name, 'total': total, 'limit': limit, 'offset': offset, 'rows': rows}
+
+    def group(self, name, by, metrics=(), filters=None, ranges=None, sort=None, descending=False, limit=MAX_LIMIT):
+        """Per-group row counts and sum/avg/min/max of numeric columns"""
+        info = self.dataset(name)
+        columns = info['columns']
+        by = check_columns(columns, by)
+        selected = [quote_name(column) for column in by] + ['COUNT(*) AS count']
+        for function, column in metrics:
+            if function not in AGGREGATES:
+                raise QueryError(f'Unknown aggregate: {function} (use {", ".join(AGGREGATES)})')
+            check_columns(columns, [column])
+            if columns[column] != 'number':
+                raise QueryError(f'{function} needs a numeric column: {column}')
+            selected.append(f'{AGGREGATES[function]}({quote_name(column)}) AS {quote_name(f"{function}_{column}")}')
+
+        where, params = where_clause(columns, filters, ranges)
+        group_by = ', '.join(quote_name(column) for column in by)
+        outputs = {**{column: columns[column] for column in by}, 'count': 'number',
+                   **{f'{function}_{column}': 'number' for function, column in metrics}}
+        order = order_clause(outputs, sort, descending, tiebreak=group_by) if sort else f' ORDER BY {group_by}'
+        rows = self.fetch(f"SELECT {', '.join(selected)} FROM {info['table']}{where} GROUP BY {group_by}{order} LIMIT ?", [*params, limit])
+        return {'dataset': name, 'by': by, 'groups': rows}
+
+def check_columns(columns, names):
+    """Raise QueryError for names that are not columns; returns them as a list"""
+    unknown = [name for name in names if name not in columns]
+    if unknown:
+        raise QueryError(f'Unknown column(s): {", ".join(unknown)}')
+    return list(names)
+
+def where_clause(columns, filters=None, ranges=None):
+    """WHERE clause and parameters for equality filters ({column: [values]}) and ranges ({column: (low, high)})"""
+    conditions = []
+    params = []
+    for column, values in (filters or {}).items():
+        check_columns(columns, [column])
+        collate = ' COLLATE NOCASE' if columns[column] == 'text' else ''
+        placeholders = ', '.join('?' * len(values))
+        conditions.append(f'{quote_name(column)}{collate} IN ({placeholders})')
+        params.extend(values)
+    for column, (low, high) in (ranges or {}).items():
+        check_columns(columns, [column])
+        if low is not None:
+            conditions.append(f'{quote_name(column)} >= ?')
+            params.append(low)
+        if high is not None:
+            conditions.append(f'{quote_name(column)} <= ?')
+            params.append(high)
+    return (' WHERE ' + ' AND '.join(conditions) if conditions else ''), params
+
+def order_clause(columns, sort, descending, tiebreak='rowid'):
+    """ORDER BY clause for one column; ties keep table order (or the tiebreak expression's)"""
+    if not sort:
+        return ''
+    check_columns(columns, [sort])
+    collate = ' COLLATE NOCASE' if columns[sort] == 'text' else ''
+    return f' ORDER BY {quote_name(sort)}{collate} {"DESC" if descending else "ASC"}, {tiebreak}'
+
+def parse_number(value, name):
+    """A numeric query parameter as float"""
+    try:
+        return float(value)
+    except ValueError:
+        raise QueryError(f'{name} must be a number')
+
+def parse_int(args, name, default, low, high):
+    """An integer query parameter clamped to [low, high]"""
+    try:
+        value = int(args.get(name, default))
+    except ValueError:
+        raise QueryError(f'{name} must be an integer')
+    return max(low, min(value, high))
+
+def is_ignored_param(key):
+    """Parameters starting with _ are client cache busters (?_=1700000000000), never filters"""
+    return key.startswith('_')
+
+def query_from_args(args, columns=()):
+    """
+    select()/group() keyword arguments from a query string
+    column=value (repeatable) filters by equality, min_column/max_column by range (unless
+    min_column is itself one of the dataset's columns), and sort/order/limit/offset/fields/by/
+    metrics (e.g. metrics=sum:Gls,avg:xG) shape the result
+    """
+    filters = {}
+    ranges = {}
+    for key in args:
+        if key in RESERVED_PARAMS or is_ignored_param(key):
+            continue
+        if key.startswith(('min_', 'max_')) and key not in columns:
+            column = key[4:]
+            low, high = ranges.get(column, (None, None))
+            value = parse_number(args.get(key), key)
+            ranges[column] = (value, high) if key.startswith('min_') else (low, value)
+        else:
+            filters[key] = args.getlist(key)
+
+    split = lambda value: [part for part in value.split(',') if part]
+    query = {
+        'filters': filters,
+        'ranges': ranges,
+        'sort': args.get('sort') or None,
+        'descending': args.get('order', 'asc').lower() == 'desc',
+        'limit': parse_int(args, 'limit', DEFAULT_LIMIT, 1, MAX_LIMIT),
+    }
+    if 'by' in args:
+        query['by'] = split(args.get('by'))
+        query['metrics'] = [tuple(metric.split(':', 1)) if ':' in metric else (metric, None) for metric in split(args.get('metrics', ''))]
+        if any(column is None for _, column in query['metrics']):
+            raise QueryError('metrics must look like sum:Gls,avg:xG')
+    else:
+        query['offset'] = parse_int(args, 'offset', 0, 0, 2 ** 31)
+        query['fields'] = split(args.get('fields', '')) or None
+    return query
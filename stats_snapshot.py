@@ -0,0 +1,245 @@
+"""
+Immutable stats snapshots for the API server
+A snapshot bundles the player store, leaderboards, team aggregates and lookup indexes
+built from one collection run, so it can be published with a single reference swap
+NumPy, pandas and the store modules are imported by the build functions, so the server can
+import the request-side helpers (filters, cursors) and start before any of them load
+"""
+
+import base64
+import bisect
+from datetime import datetime
+import unicodedata
+
+# Page sizes for cursor pagination of player lists
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# Aliases so the frontend's position codes (GK/DF/MF/FW) match the FPL ones
+POSITION_ALIASES = {
+    'gk': 'gkp', 'goalkeeper': 'gkp', 'goalie': 'gkp',
+    'df': 'def', 'defender': 'def',
+    'mf': 'mid', 'midfielder': 'mid',
+    'fw': 'fwd', 'forward': 'fwd', 'forwards': 'fwd',
+}
+
+def normalize_key(value):
+    """Normalize a team/nation/position value for case-insensitive lookups"""
+    if value is None or (isinstance(value, float) and value != value):
+        return ''
+    return ' '.join(str(value).replace('-', ' ').lower().split())
+
+def normalize_position(value):
+    """Normalized position key, with the frontend's codes mapped to the FPL ones"""
+    key = normalize_key(value)
+    return POSITION_ALIASES.get(key, key)
+
+def normalize_name(value):
+    """Lowercase and strip accents so 'Martín' matches a search for 'martin'"""
+    decomposed = unicodedata.normalize('NFKD', normalize_key(value))
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+def name_trigrams(text):
+    """Return the set of 3-character substrings of a normalized name"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+def grouped_row_ids(store, column, normalize=normalize_key):
+    """Map each normalized value of a column to the sorted row ids holding it"""
+    import numpy as np
+    import pandas as pd
+    
+    if column not in store.kinds:
+        return {'': list(range(len(store)))} if len(store) else {}
+    
+    if store.kinds[column] == 'category':
+        codes, values = store.codes(column), store.categories[column]  # code -1 is the trailing None
+    else:
+        codes, values = pd.factorize(store.column(column), use_na_sentinel=False)
+    
+    # One stable sort groups the rows of every value without a per-row Python loop
+    order = np.argsort(codes, kind='stable')
+    sorted_codes = codes[order]
+    starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+    ends = np.r_[starts[1:], len(order)]
+    
+    groups = {}
+    for start, end in zip(starts, ends):
+        key = normalize(values[sorted_codes[start]])
+        groups.setdefault(key, []).extend(order[start:end].tolist())
+    for key, row_ids in groups.items():
+        row_ids.sort()
+    return groups
+
+def build_player_indexes(store):
+    """Build hash indexes from team/position/nation to row ids plus a name search index"""
+    indexes = {
+        'team': grouped_row_ids(store, 'Team'),
+        'position': grouped_row_ids(store, 'Pos'),
+        'nation': grouped_row_ids(store, 'Nation'),
+        'name_prefix': {},
+        'name_trigram': {},
+        'names': [],
+        'scan_keys': [],
+    }
+    
+    names = store.column('Player') if 'Player' in store.kinds else [None] * len(store)
+    occurrences = {}
+    for row_id, raw_name in enumerate(names):
+        name = normalize_name(raw_name)
+        indexes['names'].append(name)
+        
+        # Players sharing a name are told apart by how many came before them
+        raw_name = '' if name == '' else str(raw_name)
+        occurrence = occurrences.get(raw_name, 0)
+        occurrences[raw_name] = occurrence + 1
+        indexes['scan_keys'].append(player_key(raw_name, occurrence))
+        
+        # Prefixes of every name part serve 1-2 character queries
+        for part in name.split():
+            for length in (1, 2):
+                if len(part) >= length:
+                    indexes['name_prefix'].setdefault(part[:length], set()).add(row_id)
+        
+        # Trigrams serve substring queries of 3+ characters
+        for trigram in name_trigrams(name):
+            indexes['name_trigram'].setdefault(trigram, set()).add(row_id)
+    
+    keys = indexes['scan_keys']
+    indexes['scan_order'] = sorted(range(len(keys)), key=keys.__getitem__)
+    return indexes
+
+def search_player_names(query, indexes):
+    """Return the row ids whose normalized name contains the query"""
+    query = normalize_name(query)
+    if not query:
+        return None
+    
+    if len(query) < 3:
+        candidates = indexes['name_prefix'].get(query, set())
+    else:
+        postings = [indexes['name_trigram'].get(t) for t in name_trigrams(query)]
+        if not all(postings):
+            return set()
+        postings.sort(key=len)
+        candidates = set(postings[0]).intersection(*postings[1:])
+    
+    # Trigram hits can be out of order, so confirm the substring on the few candidates left
+    names = indexes['names']
+    return {row_id for row_id in candidates if query in names[row_id]}
+
+def query_player_ids(indexes, team=None, position=None, nation=None, name=None):
+    """Filter players through the prebuilt indexes; returns sorted row ids, or None for no filter"""
+    matches = []
+    
+    if team:
+        matches.append(set(indexes['team'].get(normalize_key(team), [])))
+    if position:
+        matches.append(set(indexes['position'].get(normalize_position(position), [])))
+    if nation:
+        matches.append(set(indexes['nation'].get(normalize_key(nation), [])))
+    if name:
+        name_matches = search_player_names(name, indexes)
+        if name_matches is not None:
+            matches.append(name_matches)
+    
+    if not matches:
+        return None
+    
+    matches.sort(key=len)
+    return sorted(matches[0].intersection(*matches[1:]))
+
+def player_key(name, occurrence=0):
+    """
+    Sort key identifying a player across snapshots: their normalized and raw name, and how many
+    players with the same name come before them. Unlike a row id it does not move when players
+    are added, removed or transferred to another team
+    """
+    return (normalize_name(name), name, occurrence)
+
+def encode_cursor(key):
+    """Opaque cursor pointing just past a player key"""
+    _, name, occurrence = key
+    return base64.urlsafe_b64encode(f'{occurrence}:{name}'.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor):
+    """Player key a cursor points past; ValueError for a malformed cursor"""
+    try:
+        text = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('utf-8')
+    except Exception:
+        raise ValueError('invalid cursor')
+    occurrence, separator, name = text.partition(':')
+    if not separator or not occurrence.isdigit():
+        raise ValueError('invalid cursor')
+    return player_key(name, int(occurrence))
+
+def page_player_ids(ids, indexes, cursor=None, limit=DEFAULT_PAGE_SIZE):
+    """
+    One page of row ids after the cursor, and the cursor for the next page (None on the last page)
+    ids is a sorted id list, or None for every player; pages follow the players' scan keys rather
+    than their rows, so a cursor stays valid when the snapshot is replaced mid-scan: players in
+    both snapshots are served exactly once, wherever the new collection put them
+    """
+    keys = indexes['scan_keys']
+    order = indexes['scan_order'] if ids is None else sorted(ids, key=keys.__getitem__)
+    start = bisect.bisect_right(order, decode_cursor(cursor), key=keys.__getitem__) if cursor else 0
+    page = order[start:start + limit]
+    more = start + limit < len(order)
+    return page, (encode_cursor(keys[page[-1]]) if more and page else None)
+
+def build_snapshot(df, version, previous=None, loaded_at=None):
+    """
+    Build a complete, read-only snapshot from a stats DataFrame
+    Leaderboards and team totals are patched from the previous snapshot when the
+    players line up row for row, and recomputed in full otherwise
+    loaded_at defaults to now; workers sharing one generation pass its publish time
+    """
+    from leaderboards import build_sorted_indexes
+    from player_similarity import build_similarity_index
+    from player_store import PlayerStore
+    from stats_aggregates import build_aggregates, leaderboard_records, team_records, update_aggregates
+    
+    # Players stay in typed columns; JSON is rendered from them per request
+    players = PlayerStore(df)
+    
+    if previous is not None and previous.get('players') is not None:
+        aggregates = update_aggregates(previous['aggregates'], previous['players'], players)
+    else:
+        aggregates = build_aggregates(players)
+    
+    loaded_at = loaded_at or datetime.now()
+    stats = {
+        'top_scorers': leaderboard_records(players, aggregates, 'top_scorers'),
+        'top_assists': leaderboard_records(players, aggregates, 'top_assists'),
+        'top_points': leaderboard_records(players, aggregates, 'top_points'),
+        'team_stats': team_records(aggregates),
+        'total_players': len(players),
+        'total_teams': len(aggregates['teams']),
+        'last_updated': loaded_at.isoformat(),
+        'status': 'success'
+    }
+    
+    indexes = build_player_indexes(players)
+    return {
+        'version': version,
+        'stats': stats,
+        'players': players,
+        'aggregates': aggregates,
+        'indexes': indexes,
+        'sorted_indexes': build_sorted_indexes(players),
+        'similarity': build_similarity_index(players, indexes['position']),
+        'loaded_at': loaded_at,
+    }
+
+def error_snapshot(message, version):
+    """Build a snapshot that only reports a load error"""
+    return {
+        'version': version,
+        'stats': {'error': message, 'status': 'error'},
+        'players': None,
+        'aggregates': None,
+        'indexes': {},
+        'sorted_indexes': {},
+        'similarity': None,
+        'database': None,
+        'loaded_at': None,
+    }
@@ -0,0 +1,159 @@
+"""
+Concurrent fbref squad-page scraping
+Pages are fetched by a bounded worker pool (browser drivers or a pooled HTTP session), paced
+by a per-host rate limiter instead of fixed sleeps, and streamed through html_tables so only
+the stats table is ever parsed
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from urllib.parse import urljoin, urlsplit
+
+from html_tables import CHUNK_SIZE, read_first_table
+
+FBREF_BASE = 'https://fbref.com'
+LEAGUE_URL = f'{FBREF_BASE}/en/comps/9/Premier-League-Stats'
+
+# fbref throttles clients that make more than ~20 requests a minute
+FBREF_MIN_INTERVAL = float(os.environ.get('FBREF_MIN_INTERVAL', '3.0'))
+DEFAULT_WORKERS = 3
+
+class HostRateLimiter:
+    """Spaces requests to the same host at least min_interval seconds apart, across threads"""
+
+    def __init__(self, min_interval=FBREF_MIN_INTERVAL):
+        self.min_interval = min_interval
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        """Block until the url's host may be requested again, and reserve that slot"""
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+class DriverPool:
+    """Bounded pool of browser drivers, created on first use and reused across pages"""
+
+    def __init__(self, factory, size=DEFAULT_WORKERS):
+        self.factory = factory
+        self.size = size
+        self._idle = queue.Queue()
+        self._all = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def driver(self):
+        """Check out a driver for one page; a driver that raised is discarded, not reused"""
+        driver = self._acquire()
+        try:
+            yield driver
+        except Exception:
+            self._discard(driver)
+            raise
+        else:
+            self._idle.put(driver)
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._all) < self.size:
+                driver = self.factory()
+                if driver is None:
+                    raise RuntimeError('Could not start a browser driver')
+                self._all.append(driver)
+                return driver
+        return self._idle.get()
+
+    def _discard(self, driver):
+        with self._lock:
+            if driver in self._all:
+                self._all.remove(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def close(self):
+        """Quit every driver the pool started"""
+        with self._lock:
+            drivers, self._all = self._all, []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+def squad_urls(hrefs, base_url=FBREF_BASE):
+    """Absolute /squads/ URLs from a table's links, in table order without repeats"""
+    links = [urljoin(base_url, href) for href in hrefs if '/squads' in href]
+    return list(dict.fromkeys(links))
+
+def team_name_from_url(team_url):
+    """Team name as used in the output CSV, taken from the squad page URL"""
+    return team_url.split("/")[-1].replace("-Stats", "").replace("Stats", "")
+
+def parse_team_table(source, team_name):
+    """Stream the first stats table of a page (or table HTML) into a DataFrame tagged with its team"""
+    team_data = read_first_table(source)
+    if team_data is None:
+        return None
+    team_data["Team"] = team_name
+    return team_data
+
+def http_table_fetcher(session=None, timeout=30):
+    """fetch(url) -> the page body as a stream of text chunks, using a pooled HTTP session (no browser)"""
+    if session is None:
+        from fpl_client import get_session
+        session = get_session()
+
+    def fetch(url):
+        response = session.get(url, timeout=timeout, stream=True)
+        response.raise_for_status()
+        response.encoding = response.encoding or 'utf-8'
+
+        # Parsing stops at the end of the stats table, so the rest of the body is never read
+        def chunks():
+            try:
+                yield from response.iter_content(CHUNK_SIZE, decode_unicode=True)
+            finally:
+                response.close()
+        return chunks()
+
+    return fetch
+
+def scrape_team_pages(team_urls, fetch_table, workers=DEFAULT_WORKERS, limiter=None):
+    """
+    Fetch and parse every squad page with a bounded worker pool
+    Returns the team DataFrames in team_urls order; pages that fail are reported and skipped
+    """
+    limiter = limiter or HostRateLimiter()
+
+    def scrape(numbered_url):
+        i, team_url = numbered_url
+        team_name = team_name_from_url(team_url)
+        limiter.wait(team_url)
+        print(f"Scraping team {i+1}/{len(team_urls)}: {team_name}")
+        try:
+            team_data = parse_team_table(fetch_table(team_url), team_name)
+            if team_data is None:
+                print(f"No stats_table found for team: {team_name}")
+            return team_data
+        except Exception as e:
+            print(f"Error scraping {team_name}: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        results = list(executor.map(scrape, enumerate(team_urls)))
+    return [team_data for team_data in results if team_data is not None]
@@ -0,0 +1,84 @@
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# The modules live at the repository root, as they do for the scripts and benchmarks; the
+# synthetic FPL payloads are shared with the benchmarks
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(1, os.path.join(REPO_ROOT, 'benchmarks'))
+
+class StubServer:
+    """
+    Local HTTP server for the collectors' tests. routes maps a path to a JSON payload or to
+    respond(headers) returning (status, headers, body bytes); every request's path and headers
+    are kept in .requests. Responses wait `delay` seconds, cut short when the test ends
+    """
+
+    def __init__(self, routes, delay=0):
+        self.routes = routes
+        self.delay = delay
+        self.requests = []
+        self.released = threading.Event()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split('?')[0]
+                stub.requests.append((path, dict(self.headers)))
+                stub.released.wait(stub.delay)
+                route = stub.routes.get(path)
+                if route is None:
+                    status, headers, body = 404, {}, b''
+                elif callable(route):
+                    status, headers, body = route(self.headers)
+                else:
+                    status, headers, body = 200, {'Content-Type': 'application/json'}, json.dumps(route).encode('utf-8')
+                try:
+                    self.send_response(status)
+                    for name, value in headers.items():
+                        self.send_header(name, value)
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except OSError:
+                    pass  # The client gave up waiting
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}'
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+
+    def close(self):
+        self.released.set()
+        self.server.shutdown()
+        self.server.server_close()
+
+@pytest.fixture
+def stub_server():
+    """stub_server(routes, delay=0) starts a StubServer that is shut down after the test"""
+    servers = []
+
+    def start(routes, delay=0):
+        servers.append(StubServer(routes, delay))
+        return servers[-1]
+
+    yield start
+    for server in servers:
+        server.close()
+
+@pytest.fixture
+def fpl_session(monkeypatch):
+    """A fresh fpl_client session and parse cache, so tests do not share pooled connections"""
+    import fpl_client
+
+    monkeypatch.setattr(fpl_client, '_session', None)
+    monkeypatch.setattr(fpl_client, '_parsed', OrderedDict())
+    return fpl_client
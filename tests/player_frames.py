@@ -0,0 +1,51 @@
+"""Synthetic stats.csv frames and random refreshes of them for the snapshot tests"""
+
+import numpy as np
+import pandas as pd
+
+TEAMS = ['Arsenal', 'Chelsea', 'Everton', 'Fulham', 'Leeds', 'Spurs']
+POSITIONS = ['GKP', 'DEF', 'MID', 'FWD']
+COUNTERS = ['Gls', 'Ast', 'total_points']
+
+def random_players(rng, n=300, float_points=False):
+    """A stats frame with few distinct values per column, so leaderboards are full of ties"""
+    frame = pd.DataFrame({
+        'Player': [f'Player {i}' for i in range(n)],
+        'Nation': rng.choice(['ENG', 'FRA', 'BRA', ''], n),
+        'Pos': rng.choice(POSITIONS, n),
+        'Team': rng.choice(TEAMS, n),
+        'Min': rng.integers(0, 900, n),
+        'Gls': rng.integers(0, 6, n),
+        'Ast': rng.integers(0, 6, n),
+        'total_points': rng.integers(0, 40, n),
+        'influence': rng.integers(0, 200, n) / 2,
+        'creativity': rng.integers(0, 200, n) / 2,
+        'threat': rng.integers(0, 200, n) / 2,
+        'price': rng.integers(40, 140, n) / 10,
+    })
+    if float_points:
+        # Halves add up exactly, so patched and rebuilt float totals compare equal
+        points = frame['total_points'] / 2
+        points[rng.random(n) < 0.05] = np.nan
+        frame['total_points'] = points
+    return frame
+
+def refresh(frame, rng):
+    """The next collection: a few players score, drop to nothing, jump to the top or change team"""
+    frame = frame.copy()
+    rows = rng.choice(len(frame), size=rng.integers(1, 20), replace=False)
+    for row in rows:
+        column = COUNTERS[rng.integers(len(COUNTERS))]
+        value = frame.at[row, column]
+        if value != value:
+            continue  # Leave missing points missing, so the column keeps its type
+        move = rng.random()
+        if move < 0.2:
+            frame.at[row, column] = 0
+        elif move < 0.3:
+            frame.at[row, column] = value + 50
+        elif move < 0.4:
+            frame.at[row, 'Team'] = TEAMS[rng.integers(len(TEAMS))]
+        else:
+            frame.at[row, column] = value + rng.integers(1, 3)
+    return frame
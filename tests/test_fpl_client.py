@@ -0,0 +1,103 @@
+import json
+
+import pytest
+import requests
+
+from synthetic_fpl import make_bootstrap_payload
+
+PAYLOAD = {'events': [{'id': 1, 'is_current': True, 'finished': False}], 'elements': []}
+ETAG = '"v1"'
+
+def revalidating(payload):
+    """A route answering 304 to a request carrying its ETag"""
+    body = json.dumps(payload).encode('utf-8')
+
+    def respond(headers):
+        if headers.get('If-None-Match') == ETAG:
+            return 304, {'ETag': ETAG}, b''
+        return 200, {'ETag': ETAG, 'Last-Modified': 'Sat, 01 Nov 2025 12:00:00 GMT'}, body
+
+    return respond
+
+def test_fresh_cache_entry_skips_the_network(fpl_session, stub_server, tmp_path):
+    stub = stub_server({'/api/bootstrap-static/': PAYLOAD})
+    url = f'{stub.url}/api/bootstrap-static/'
+
+    assert fpl_session.fetch_json(url, cache_dir=str(tmp_path)) == PAYLOAD
+    assert fpl_session.fetch_json(url, cache_dir=str(tmp_path)) == PAYLOAD
+    assert len(stub.requests) == 1
+
+def test_not_modified_reuses_the_cached_body(fpl_session, stub_server, tmp_path):
+    stub = stub_server({'/api/bootstrap-static/': revalidating(PAYLOAD)})
+    url = f'{stub.url}/api/bootstrap-static/'
+
+    first = fpl_session.fetch_json(url, max_age=0, cache_dir=str(tmp_path))
+    # A new process has no parsed copy in memory, only the disk cache
+    fpl_session._parsed.clear()
+    second = fpl_session.fetch_json(url, max_age=0, cache_dir=str(tmp_path))
+
+    assert first == second == PAYLOAD
+    (_, revalidation) = stub.requests[1]
+    assert revalidation['If-None-Match'] == ETAG
+    assert revalidation['If-Modified-Since'] == 'Sat, 01 Nov 2025 12:00:00 GMT'
+
+def test_failing_upstream_falls_back_to_the_cache(fpl_session, stub_server, tmp_path):
+    routes = {'/api/bootstrap-static/': PAYLOAD}
+    stub = stub_server(routes)
+    url = f'{stub.url}/api/bootstrap-static/'
+    fpl_session.fetch_json(url, cache_dir=str(tmp_path))
+
+    routes['/api/bootstrap-static/'] = lambda headers: (404, {}, b'')
+    assert fpl_session.fetch_json(url, max_age=0, cache_dir=str(tmp_path)) == PAYLOAD
+    assert len(stub.requests) == 2
+
+def test_failure_with_nothing_cached_raises(fpl_session, stub_server, tmp_path):
+    stub = stub_server({})
+    with pytest.raises(requests.HTTPError):
+        fpl_session.fetch_json(f'{stub.url}/api/bootstrap-static/', cache_dir=str(tmp_path))
+
+def test_server_errors_are_retried(fpl_session, stub_server, tmp_path):
+    responses = iter([(503, {}, b''), (200, {}, json.dumps(PAYLOAD).encode('utf-8'))])
+    stub = stub_server({'/api/bootstrap-static/': lambda headers: next(responses)})
+
+    assert fpl_session.fetch_json(f'{stub.url}/api/bootstrap-static/', cache_dir=str(tmp_path)) == PAYLOAD
+    assert len(stub.requests) == 2
+
+def test_parsed_bodies_are_bounded(fpl_session, stub_server, tmp_path):
+    routes = {f'/api/event/{gameweek}/live/': {'elements': [{'id': gameweek}]} for gameweek in range(1, 11)}
+    stub = stub_server({'/api/bootstrap-static/': PAYLOAD, **routes})
+
+    fpl_session.fetch_json(f'{stub.url}/api/bootstrap-static/', cache_dir=str(tmp_path))
+    for path in routes:
+        fpl_session.fetch_json(f'{stub.url}{path}', cache_dir=str(tmp_path))
+        fpl_session.fetch_json(f'{stub.url}/api/bootstrap-static/', cache_dir=str(tmp_path))
+
+    assert len(fpl_session._parsed) <= fpl_session.PARSED_CACHE_SIZE
+    assert f'{stub.url}/api/bootstrap-static/' in fpl_session._parsed
+    # Evicted bodies are read back from the disk cache, not fetched again
+    assert fpl_session.fetch_json(f'{stub.url}/api/event/1/live/', cache_dir=str(tmp_path)) == {'elements': [{'id': 1}]}
+    assert len(stub.requests) == 1 + len(routes)
+
+def test_collectors_leave_the_shared_payload_untouched(fpl_session, stub_server, tmp_path):
+    from fpl_transform import (
+        current_gameweek, current_season_players_frame, latest_players_frame, latest_teams_frame, stats_frame,
+    )
+    from player_history import changed_players, empty_checkpoint, plan_gameweeks
+
+    payload = make_bootstrap_payload(n_elements=50)
+    stub = stub_server({'/api/bootstrap-static/': payload})
+    url = f'{stub.url}/api/bootstrap-static/'
+
+    # Every caller gets the same parsed object, so none of them may modify it
+    shared = fpl_session.fetch_json(url, cache_dir=str(tmp_path))
+    assert fpl_session.fetch_json(url, cache_dir=str(tmp_path)) is shared
+
+    stats_frame(shared)
+    current_season_players_frame(shared)
+    latest_players_frame(shared)
+    latest_teams_frame(shared)
+    current_gameweek(shared)
+    checkpoint = empty_checkpoint()
+    plan_gameweeks(shared, checkpoint, changed_players(shared, checkpoint))
+
+    assert shared == payload
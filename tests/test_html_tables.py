@@ -0,0 +1,86 @@
+from io import StringIO
+
+import pandas as pd
+import pytest
+
+from fbref_fixtures import COLUMNS, league_page, squad_page
+from html_tables import read_first_table, scan_html
+
+# A stats_table with an over-header row, a hidden row, links inside and outside it and squad totals
+STATS_PAGE = '''<html><body>
+<table class="nav"><tr><td><a href="/en/squads/00/Menu-Stats">Menu</a></td></tr></table>
+<table class="min_width stats_table" style="display: none"><tr><td>hidden copy</td></tr></table>
+<table class="min_width sortable stats_table">
+<caption>Standard Stats</caption>
+<thead>
+<tr class="over_header"><th></th><th colspan="2">Performance</th></tr>
+<tr><th>Player</th><th>Gls</th><th>Ast</th></tr>
+</thead>
+<tbody>
+<tr><th scope="row"><a href="/en/players/01/Bukayo-Saka">Bukayo  Saka</a></th><td>1,204</td><td>3</td></tr>
+<tr style="display:none"><th>Spacer</th><td></td><td></td></tr>
+<tr><th scope="row"><a href="/en/players/02/Declan-Rice">Declan<br>Rice</a></th><td>2</td><td></td></tr>
+</tbody>
+<tfoot><tr><th>Squad Total</th><td>1,206</td><td>3</td></tr></tfoot>
+</table>
+<table class="stats_table"><tr><td><a href="/en/players/03/Later">Later</a></td></tr></table>
+</body></html>'''
+
+# No stats_table: the squads are only linked from a later table of another class
+FALLBACK_PAGE = '''<html><body>
+<table class="nav"><tr><td><a href="/en/comps/9/">League</a></td></tr></table>
+<table class="standings"><tr><td><a href="/en/squads/18bb7c10/Arsenal-Stats">Arsenal</a></td></tr>
+<tr><td><a href="/en/squads/cff3d9bb/Chelsea-Stats">Chelsea</a></td></tr></table>
+<table class="fixtures"><tr><td><a href="/en/squads/b8fd03ef/Spurs-Stats">Spurs</a></td></tr></table>
+</body></html>'''
+
+@pytest.mark.parametrize('chunk_size', [7, 100, 64 * 1024])
+def test_scan_keeps_the_sections_of_the_first_visible_stats_table(chunk_size):
+    scan = scan_html(STATS_PAGE, link_text='/players', chunk_size=chunk_size)
+
+    rows = scan['rows']
+    assert rows['thead'] == [
+        [('th', '', 1, 1), ('th', 'Performance', 1, 2)],
+        [('th', 'Player', 1, 1), ('th', 'Gls', 1, 1), ('th', 'Ast', 1, 1)],
+    ]
+    assert rows['tbody'] == [
+        [('th', 'Bukayo Saka', 1, 1), ('td', '1,204', 1, 1), ('td', '3', 1, 1)],
+        [('th', 'Declan Rice', 1, 1), ('td', '2', 1, 1), ('td', '', 1, 1)],
+    ]
+    assert rows['tfoot'] == [[('th', 'Squad Total', 1, 1), ('td', '1,206', 1, 1), ('td', '3', 1, 1)]]
+    assert rows['root'] == []
+    # Only the target table's links; the menu's and the later table's are not part of it
+    assert scan['links'] == ['/en/players/01/Bukayo-Saka', '/en/players/02/Declan-Rice']
+
+def test_frame_matches_read_html():
+    expected = pd.read_html(StringIO(STATS_PAGE), attrs={'class': 'min_width sortable stats_table'})[0]
+
+    frame = read_first_table(STATS_PAGE)
+
+    pd.testing.assert_frame_equal(frame, expected)
+    assert frame.iloc[0].tolist() == ['Bukayo Saka', 1204, 3.0]
+
+@pytest.mark.parametrize('chunk_size', [512, 64 * 1024])
+def test_squad_page_matches_read_html(chunk_size):
+    html = squad_page('Arsenal', players=12, chrome_kb=20)
+
+    frame = read_first_table(html, chunk_size=chunk_size)
+
+    pd.testing.assert_frame_equal(frame, pd.read_html(StringIO(html))[0])
+    assert len(frame) == 13 and frame.shape[1] == len(COLUMNS)
+    # The commented-out tables further down are never reached
+    assert len(scan_html(html, link_text='/players/')['links']) == 2 * 12
+
+def test_fallback_links_come_from_the_first_table_with_matching_links():
+    scan = scan_html(FALLBACK_PAGE, link_text='/squads')
+
+    assert scan['rows'] is None
+    assert scan['links'] == []
+    assert scan['fallback_links'] == ['/en/squads/18bb7c10/Arsenal-Stats', '/en/squads/cff3d9bb/Chelsea-Stats']
+
+def test_league_page_links_every_squad():
+    teams = ['Arsenal', 'Chelsea', 'Everton']
+    scan = scan_html(league_page(teams, chrome_kb=4), link_text='/squads')
+
+    assert [len(row) for row in scan['rows']['tbody']] == [3, 3, 3]
+    assert [link.rsplit('/', 1)[1] for link in scan['links']] == [f'{team}-Stats' for team in teams]
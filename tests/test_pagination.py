@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import stats_api_server
+from player_frames import TEAMS, random_players, refresh
+from response_cache import ResponseCache
+from stats_snapshot import build_snapshot, decode_cursor, encode_cursor, page_player_ids, player_key, query_player_ids
+
+def scan(ids, indexes, limit, cursor=None, pages=None):
+    """Row ids of every page from cursor on (or the first `pages` pages), and the cursor after them"""
+    rows = []
+    while pages is None or pages > 0:
+        page, cursor = page_player_ids(ids, indexes, cursor, limit)
+        rows.extend(page)
+        if cursor is None:
+            break
+        assert page
+        pages = None if pages is None else pages - 1
+    return rows, cursor
+
+def league_order(frame):
+    """The frame laid out as stats.csv is, grouped by team and then position"""
+    return frame.sort_values(['Team', 'Pos'], kind='stable').reset_index(drop=True)
+
+def served(snapshot, rows):
+    """The player keys behind a scan's row ids (every player's for None)"""
+    keys = snapshot['indexes']['scan_keys']
+    return keys if rows is None else [keys[row] for row in rows]
+
+@pytest.mark.parametrize('name, occurrence', [
+    ('Bukayo Saka', 0), ('David Raya Martín', 0), ('Danny Ward', 1), ('', 0), ('a:b', 2 ** 40),
+])
+def test_cursor_round_trip(name, occurrence):
+    key = player_key(name, occurrence)
+    assert decode_cursor(encode_cursor(key)) == key
+
+@pytest.mark.parametrize('cursor', ['', '!!', 'cg', 'cjU', '_zo', encode_cursor(player_key('x', 5))[:-1] + '*', 'ci0x', 'eDE'])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+@pytest.mark.parametrize('seed', range(20))
+def test_pages_cover_every_row_once(seed):
+    rng = np.random.default_rng(seed)
+    count = int(rng.integers(0, 200))
+    limit = int(rng.integers(1, 60))
+    frame = random_players(rng, n=count)
+    # Shared names, so the scan has to tell namesakes apart
+    frame['Player'] = rng.choice(['Ben Davies', 'Danny Ward', 'Tom Davies', 'Adama'], count) if count else []
+    current = build_snapshot(frame, 1)
+    keys = current['indexes']['scan_keys']
+    subset = sorted(rng.choice(count, size=int(rng.integers(0, count + 1)), replace=False).tolist()) if count else []
+
+    rows = scan(None, current['indexes'], limit)[0]
+    assert sorted(rows) == list(range(count))
+    assert served(current, rows) == sorted(keys)
+    assert scan(subset, current['indexes'], limit)[0] == sorted(subset, key=keys.__getitem__)
+
+@pytest.mark.parametrize('seed', range(10))
+def test_cursor_stays_valid_across_a_snapshot_swap(seed):
+    rng = np.random.default_rng(seed)
+    frame = random_players(rng)
+    before = build_snapshot(frame, 1)
+    team = TEAMS[seed % len(TEAMS)]
+    limit = int(rng.integers(3, 12))
+
+    ids = query_player_ids(before['indexes'], team=team)
+    first, cursor = scan(ids, before['indexes'], limit, pages=2)
+    assert cursor is not None
+
+    # Transfers in and out of the team between the two halves of the scan
+    after = build_snapshot(refresh(refresh(frame, rng), rng), 2, previous=before)
+    new_ids = query_player_ids(after['indexes'], team=team)
+    rest, _ = scan(new_ids, after['indexes'], limit, cursor)
+
+    boundary = decode_cursor(cursor)
+    assert served(before, first) == sorted(key for key in served(before, ids) if key <= boundary)
+    assert served(after, rest) == sorted(key for key in served(after, new_ids) if key > boundary)
+    # Players on the team in both snapshots are served exactly once
+    both = set(served(before, ids)) & set(served(after, new_ids))
+    assert sorted(key for key in served(before, first) + served(after, rest) if key in both) == sorted(both)
+
+@pytest.mark.parametrize('team', [None, 'Chelsea'])
+def test_rows_inserted_and_moved_mid_frame_do_not_shift_the_scan(team):
+    rng = np.random.default_rng(7)
+    frame = league_order(random_players(rng, n=120))
+    before = build_snapshot(frame, 1)
+    ids = query_player_ids(before['indexes'], team=team)
+    first, cursor = scan(ids, before['indexes'], 10, pages=2)
+
+    # A mid-season signing lands in the middle of the frame and a player moves to another team's
+    # block, so every row after them changes id
+    signing = frame.iloc[[5]].assign(Player='Zak Signing', Team='Chelsea')
+    grown = pd.concat([frame.iloc[:50], signing, frame.iloc[50:]], ignore_index=True)
+    grown.loc[grown['Player'] == 'Player 3', 'Team'] = 'Spurs'
+    grown = league_order(grown)
+    assert list(grown['Player'].drop(51)) != list(frame['Player'])
+    after = build_snapshot(grown, 2, previous=before)
+    new_ids = query_player_ids(after['indexes'], team=team)
+    rest, _ = scan(new_ids, after['indexes'], 10, cursor)
+
+    names = [key[1] for key in served(before, first) + served(after, rest)]
+    assert len(names) == len(set(names))
+    kept = {key[1] for key in served(before, ids)} & {key[1] for key in served(after, new_ids)}
+    assert kept <= set(names)
+    # The signing sorts after the cursor, so the rest of the scan picks it up
+    assert 'Zak Signing' in names
+
+@pytest.mark.parametrize('query, message', [
+    ('limit=abc', 'limit must be an integer'),
+    ('limit=2.5', 'limit must be an integer'),
+    ('limit=5&cursor=!!', None),
+])
+def test_route_rejects_a_bad_limit_or_cursor(monkeypatch, query, message):
+    monkeypatch.setattr(stats_api_server, 'snapshot', {**build_snapshot(random_players(np.random.default_rng(0), n=20), 1), 'database': None})
+    monkeypatch.setattr(stats_api_server, 'response_cache', ResponseCache())
+
+    response = stats_api_server.app.test_client().get(f'/api/stats/players?{query}')
+
+    assert response.status_code == 400
+    assert response.get_json()['status'] == 'error'
+    if message:
+        assert response.get_json()['message'] == message
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from columnar_snapshot import read_snapshot
+from pipe_table import convert_pipe_table, read_pipe_table
+
+pytest.importorskip('pyarrow')
+
+# Two header levels as the fbref export writes them: the frame's index column, then groups
+# whose repeated lower names (the per-90 block) are told apart by the group
+LEVEL0 = [
+    '', 'Unnamed: 0_level_0', 'Unnamed: 1_level_0', 'Playing Time', 'Playing Time', 'Performance',
+    'Performance', 'Per 90 Minutes', 'Per 90 Minutes', 'Unnamed: 9_level_0', 'Unnamed: 10_level_0',
+]
+LEVEL1 = ['', 'Player', 'Pos', 'MP', 'Min', 'Gls', 'xG', 'Gls', 'xG', 'Note', 'Blank']
+
+def write_table(path, rows):
+    """A pipe table with a rule line around every row, as the export has"""
+    rule = '|' + '|'.join('-' * 6 for _ in LEVEL0) + '|\n'
+    lines = [rule]
+    for row in [LEVEL0, LEVEL1, *rows]:
+        lines += ['| ' + ' | '.join(row) + ' |\n', rule]
+    path.write_text(''.join(lines), encoding='utf-8')
+    return str(path)
+
+def random_rows(rng, n):
+    """Rows with blank cells, short rows, totals and columns whose type only settles in a late batch"""
+    rows = []
+    for i in range(n):
+        cells = [
+            str(i), f'Player {rng.integers(40)}', str(rng.choice(['GK', 'DF', 'MF', 'FW'])),
+            str(rng.integers(0, 38)), f'{rng.integers(0, 3400):,}', str(rng.integers(0, 5)),
+            f'{rng.random() * 3:.2f}', f'{rng.random():.2f}', f'{rng.random():.2f}',
+            str(rng.integers(100)), '',
+        ]
+        for column in rng.choice(range(3, 10), size=rng.integers(0, 3), replace=False):
+            cells[column] = ''
+        if rng.random() < 0.05:
+            cells = cells[:rng.integers(2, len(cells))]
+        if rng.random() < 0.03:
+            cells[1] = str(rng.choice(['Squad Total', 'Opponent Total']))
+        rows.append(cells)
+    # Numbers until the last batch turn out to be text
+    rows[-1][9] = 'n/a'
+    return rows
+
+def comparable(df):
+    """Frame values with categories as plain values, so stored dtypes do not matter"""
+    return pd.DataFrame({
+        column: df[column].astype(object) if isinstance(df[column].dtype, pd.CategoricalDtype) else df[column]
+        for column in df.columns
+    })
+
+def check_same(source, target, batch_rows):
+    rows = convert_pipe_table(source, target, batch_rows=batch_rows)
+    expected = read_pipe_table(source)
+    converted = read_snapshot(target)
+
+    assert rows == len(expected)
+    assert list(converted.columns) == list(expected.columns)
+    pd.testing.assert_frame_equal(comparable(converted), comparable(expected), check_dtype=False)
+    for column in expected.columns:
+        assert pd.api.types.is_numeric_dtype(converted[column]) == pd.api.types.is_numeric_dtype(expected[column])
+    return expected
+
+def test_small_table_with_totals_short_rows_and_blanks(tmp_path):
+    source = write_table(tmp_path / 'table.csv', [
+        ['0', 'Bukayo Saka', 'FW', '5', '450', '2', '1.5', '0.4', '0.30', '7', ''],
+        ['1', 'Declan Rice', 'MF', '5', '', '1', '', '0.2', '', 'x', ''],
+        ['2', 'Squad Total', '', '10', '900', '3', '2', '', '', '', ''],
+        ['3', 'Ben White', 'DF'],
+        ['4', 'Ben White', 'DF', '3', '1,000', '0', '0.1', '0', '0.02', '8', ''],
+        ['5', 'Opponent Total', '', '1', '1', '1', '1', '1', '1', '1', ''],
+        ['6', 'David Raya', 'GK', '5', '450', '', '0', '0', '0', '9', ''],
+    ])
+
+    expected = check_same(source, str(tmp_path / 'table.arrow'), batch_rows=2)
+
+    assert list(expected.columns) == [
+        'Player', 'Pos', 'MP', 'Min', 'Gls', 'xG', 'Per 90 Minutes Gls', 'Per 90 Minutes xG', 'Note', 'Blank',
+    ]
+    assert expected['Player'].tolist() == ['Bukayo Saka', 'Declan Rice', 'Ben White', 'Ben White', 'David Raya']
+    # The short row's missing cells read as empty ones
+    assert expected.loc[2, 'Note'] == '' and np.isnan(expected.loc[2, 'MP'])
+
+@pytest.mark.parametrize('seed, batch_rows', [(0, 16), (1, 7), (2, 1), (3, 1000)])
+def test_batched_conversion_matches_read_pipe_table(tmp_path, seed, batch_rows):
+    rng = np.random.default_rng(seed)
+    source = write_table(tmp_path / 'table.csv', random_rows(rng, 150))
+
+    expected = check_same(source, str(tmp_path / 'table.arrow'), batch_rows)
+
+    assert not expected['Player'].isin(['Squad Total', 'Opponent Total']).any()
+    assert not pd.api.types.is_numeric_dtype(expected['Note'])
+
+def test_table_without_rows(tmp_path):
+    source = write_table(tmp_path / 'table.csv', [])
+    assert convert_pipe_table(source, str(tmp_path / 'table.arrow')) == 0
+    assert read_pipe_table(source).empty
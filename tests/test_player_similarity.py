@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from player_frames import random_players
+from player_similarity import SAMPLE_STRIDE, SimilarityIndex
+from stats_snapshot import build_snapshot
+
+def random_index(seed):
+    """A snapshot's similarity index and position groups; odd seeds keep the frame's many ties"""
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(2, 4000))
+    frame = random_players(rng, n=n)
+    if seed % 2 == 0:
+        for feature in ('influence', 'creativity', 'threat', 'price'):
+            frame[feature] = rng.random(n) * 100
+    current = build_snapshot(frame, 1)
+    return current['similarity'], current['indexes']['position']
+
+def brute_force(index, row_id, k, rows=None):
+    """The k nearest by a full sort of the same float32 distances, ties in row order"""
+    rows = np.arange(len(index)) if rows is None else np.asarray(rows, dtype=np.intp)
+    matrix = SimilarityIndex.scoring_matrix(index.vectors[rows], index.norms[rows])
+    distances = np.append(-2 * index.vectors[row_id], np.float32(1)) @ matrix
+    distances[rows == row_id] = np.inf
+    order = np.argsort(distances, kind='stable')[:min(k, int(np.isfinite(distances).sum()))]
+    return rows[order]
+
+def check(index, row_id, k, position=None, groups=None):
+    found, distances = index.nearest(row_id, k, position)
+    expected = brute_force(index, row_id, k, None if position is None else groups[position])
+    assert found.tolist() == expected.tolist()
+    assert row_id not in found.tolist()
+    # The reported distances are the true (float64) ones, nearest first
+    exact = np.sqrt(((index.vectors[found].astype(np.float64) - index.vectors[row_id]) ** 2).sum(axis=1))
+    assert np.allclose(distances, exact, atol=1e-3)
+    assert np.all(np.diff(distances) >= -1e-3)
+
+@pytest.mark.parametrize('seed', range(10))
+def test_nearest_matches_a_full_sort(seed):
+    index, groups = random_index(seed)
+    rng = np.random.default_rng(seed + 100)
+    for row_id in rng.choice(len(index), size=min(len(index), 15), replace=False).tolist():
+        # Small k takes the sampled shortlist on large stores; large k the full ranking
+        for k in (1, 3, 10, len(index) // SAMPLE_STRIDE - 1, len(index) - 1, len(index) + 5):
+            if k >= 1:
+                check(index, row_id, k)
+
+@pytest.mark.parametrize('seed', range(10))
+def test_position_filter_matches_a_full_sort_of_the_group(seed):
+    index, groups = random_index(seed)
+    rng = np.random.default_rng(seed + 200)
+    for position, rows in groups.items():
+        size = len(rows)
+        # Members of the group and players from other positions
+        for row_id in rng.choice(len(index), size=min(len(index), 8), replace=False).tolist():
+            for k in (1, 5, size // SAMPLE_STRIDE - 1, size - 2, size - 1, size, size + 3):
+                if k >= 1:
+                    check(index, row_id, k, position, groups)
+
+def test_whole_group_comes_back_without_the_player():
+    index, groups = random_index(4)
+    position, rows = max(groups.items(), key=lambda item: len(item[1]))
+    row_id = rows[len(rows) // 2]
+
+    found, _ = index.nearest(row_id, len(rows) + 10, position)
+
+    assert sorted(found.tolist()) == [row for row in rows if row != row_id]
+
+def test_unknown_position_finds_nobody():
+    index, _ = random_index(0)
+    found, distances = index.nearest(0, 5, 'coach')
+    assert len(found) == 0 and len(distances) == 0
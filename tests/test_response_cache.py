@@ -0,0 +1,55 @@
+import gzip
+
+from response_cache import ResponseCache, choose_encoding
+
+def serializer(body, calls):
+    def serialize():
+        calls.append(body)
+        return body
+    return serialize
+
+def test_entries_are_serialized_once_per_version():
+    cache, calls = ResponseCache(), []
+    first = cache.get('stats', 1, serializer(b'one', calls))
+    assert cache.get('stats', 1, serializer(b'one', calls)) is first
+    assert calls == [b'one']
+
+    newer = cache.get('stats', 2, serializer(b'two', calls))
+    assert newer.body == b'two' and newer.etag != first.etag
+    assert cache.version == 2
+
+def test_an_older_version_does_not_evict_the_newer_one():
+    cache, calls = ResponseCache(), []
+    current = cache.get('stats', 2, serializer(b'new', calls))
+
+    # A request that took the old snapshot just before the swap
+    stale = cache.get('stats', 1, serializer(b'old', calls))
+    assert stale.body == b'old'
+    assert cache.version == 2
+    assert cache.get('stats', 2, serializer(b'new', calls)) is current
+    assert cache.get('stats', 1, serializer(b'old', calls)) is not stale
+    assert calls == [b'new', b'old', b'old']
+
+def test_clear_lets_a_restarted_numbering_be_cached():
+    cache, calls = ResponseCache(), []
+    cache.get('stats', 5, serializer(b'five', calls))
+    cache.clear()
+    entry = cache.get('stats', 1, serializer(b'one', calls))
+    assert cache.get('stats', 1, serializer(b'one', calls)) is entry
+
+def test_least_recently_used_entries_are_dropped():
+    cache, calls = ResponseCache(max_entries=2), []
+    cache.get('a', 1, serializer(b'a', calls))
+    cache.get('b', 1, serializer(b'b', calls))
+    cache.get('a', 1, serializer(b'a', calls))
+    cache.get('c', 1, serializer(b'c', calls))
+    assert list(cache.entries) == ['a', 'c']
+
+def test_etags_and_compressed_representations():
+    entry = ResponseCache().get('stats', 1, lambda: b'x' * 2000)
+    assert gzip.decompress(entry.encode('gzip')) == entry.body
+    assert entry.etag_for('gzip') != entry.etag_for(None)
+    assert entry.matches(entry.etag_for('gzip')) and entry.matches('*')
+    assert not entry.matches('"other"')
+    assert choose_encoding('gzip;q=0, deflate') is None
+    assert choose_encoding('gzip, deflate') == 'gzip'
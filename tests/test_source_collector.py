@@ -0,0 +1,102 @@
+import time
+
+import pandas as pd
+import pytest
+
+import fpl_client
+import source_collector
+from source_collector import OUTPUT_FILES, collect, collect_to_csv, merge_outputs
+from synthetic_fpl import TEAM_NAMES, make_bootstrap_payload
+
+DELAY = 0.4
+
+ESPN_STANDINGS = {'children': [{'standings': {'entries': [
+    {'team': {'displayName': name, 'abbreviation': name[:3].upper()}, 'note': {'rank': rank},
+     'stats': [{'name': 'gamesPlayed', 'value': 5}, {'name': 'points', 'value': 10}]}
+    for rank, name in enumerate(TEAM_NAMES, start=1)
+]}}]}
+ESPN_TEAMS = {'sports': [{'leagues': [{'teams': [
+    {'team': {'displayName': name, 'abbreviation': name[:3].upper(), 'location': name, 'color': '000000'}}
+    for name in TEAM_NAMES
+]}]}]}
+FOOTBALL_DATA_STANDINGS = {'standings': [{'type': 'TOTAL', 'table': [
+    {'position': rank, 'team': {'name': name, 'tla': name[:3].upper()}, 'playedGames': 5, 'points': 10}
+    for rank, name in enumerate(TEAM_NAMES, start=1)
+]}]}
+
+@pytest.fixture
+def sources(stub_server, fpl_session, monkeypatch, tmp_path):
+    """Every source pointed at its own stub, each answering after DELAY seconds; returns the stubs"""
+    stubs = {
+        'fpl': stub_server({'/api/bootstrap-static/': make_bootstrap_payload(n_elements=60)}, DELAY),
+        'espn': stub_server({'/eng.1/standings': ESPN_STANDINGS, '/eng.1/teams': ESPN_TEAMS}, DELAY),
+        'football_data': stub_server({'/v4/competitions/PL/standings': FOOTBALL_DATA_STANDINGS}, DELAY),
+    }
+    monkeypatch.setattr(fpl_client, 'FPL_API_BASE', f"{stubs['fpl'].url}/api")
+    monkeypatch.setattr(fpl_client, 'CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.setattr(source_collector, 'ESPN_API_BASE', f"{stubs['espn'].url}/eng.1")
+    monkeypatch.setattr(source_collector, 'FOOTBALL_DATA_API_BASE', f"{stubs['football_data'].url}/v4")
+    monkeypatch.setattr(source_collector, 'FOOTBALL_DATA_API_KEY', 'stub')
+    return stubs
+
+def test_sources_are_fetched_concurrently(sources, tmp_path):
+    start = time.perf_counter()
+    written = collect_to_csv(output_dir=str(tmp_path))
+    elapsed = time.perf_counter() - start
+
+    # Four fetches of DELAY each: one after another would take 4 * DELAY
+    assert elapsed < 2.5 * DELAY
+    assert written == {'players': 'fpl', 'teams': 'fpl', 'team_info': 'espn_teams', 'standings': 'football_data'}
+    assert sources['football_data'].requests[0][1]['X-Auth-Token'] == 'stub'
+    teams = pd.read_csv(tmp_path / OUTPUT_FILES['teams'])
+    assert 'strength_attack_home' in teams.columns and len(teams) == len(TEAM_NAMES)
+
+def test_hung_source_times_out_without_holding_up_the_rest(sources, stub_server, monkeypatch):
+    hung = stub_server({'/eng.1/standings': ESPN_STANDINGS, '/eng.1/teams': ESPN_TEAMS}, delay=60)
+    monkeypatch.setattr(source_collector, 'ESPN_API_BASE', f'{hung.url}/eng.1')
+
+    start = time.perf_counter()
+    results = {result['source']: result for result in collect(timeouts={'espn_standings': 0.5, 'espn_teams': 0.5})}
+    elapsed = time.perf_counter() - start
+
+    assert results['espn_standings']['status'] == results['espn_teams']['status'] == 'timeout'
+    assert results['fpl']['status'] == results['football_data']['status'] == 'ok'
+    assert elapsed < 2 * DELAY + 0.5
+
+def ok(source, **frames):
+    return {'source': source, 'status': 'ok', 'frames': {output: pd.DataFrame(rows) for output, rows in frames.items()}}
+
+def failed(source):
+    return {'source': source, 'status': 'error', 'frames': {}}
+
+def test_merge_takes_each_output_from_the_best_source_that_answered(tmp_path):
+    written = merge_outputs([
+        failed('football_data'),
+        ok('espn_standings', standings=[{'team_name': 'Arsenal'}]),
+        ok('fpl', players=[{'Player': 'Saka'}], teams=[{'name': 'Arsenal', 'strength_attack_home': 1300}]),
+        ok('espn_teams', team_info=[{'team_name': 'Arsenal'}]),
+    ], str(tmp_path))
+    assert written == {'players': 'fpl', 'teams': 'fpl', 'team_info': 'espn_teams', 'standings': 'espn_standings'}
+
+    written = merge_outputs([
+        ok('football_data', standings=[{'team_name': 'Chelsea'}]),
+        ok('espn_standings', standings=[{'team_name': 'Arsenal'}]),
+    ], str(tmp_path))
+    assert written == {'standings': 'football_data'}
+    assert pd.read_csv(tmp_path / OUTPUT_FILES['standings'])['team_name'].tolist() == ['Chelsea']
+
+def test_espn_teams_never_replace_the_fpl_teams_file(tmp_path):
+    fpl_teams = pd.DataFrame([{'name': 'Arsenal', 'strength_attack_home': 1300}])
+    fpl_teams.to_csv(tmp_path / OUTPUT_FILES['teams'], index=False)
+
+    written = merge_outputs([failed('fpl'), ok('espn_teams', team_info=[{'team_name': 'Arsenal'}])], str(tmp_path))
+
+    assert written == {'team_info': 'espn_teams'}
+    assert pd.read_csv(tmp_path / OUTPUT_FILES['teams']).equals(fpl_teams)
+
+def test_empty_frames_fall_through_to_the_next_source(tmp_path):
+    written = merge_outputs([
+        ok('football_data', standings=[]),
+        ok('espn_standings', standings=[{'team_name': 'Arsenal'}]),
+    ], str(tmp_path))
+    assert written == {'standings': 'espn_standings'}
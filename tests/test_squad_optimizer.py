@@ -0,0 +1,47 @@
+import functools
+from collections import Counter
+
+import numpy as np
+import pytest
+
+import squad_optimizer
+import stats_api_server
+from player_frames import random_players
+from player_store import PlayerStore
+from response_cache import ResponseCache
+from squad_optimizer import MAX_PER_CLUB, QUOTAS, SearchLimitError, optimize_from_store
+from stats_snapshot import build_snapshot
+
+def crowded_frame():
+    """Players whose best value is concentrated in one club, so the club limit has to be searched"""
+    rng = np.random.default_rng(3)
+    frame = random_players(rng)
+    frame['total_points'] = rng.permutation(len(frame))
+    frame.loc[frame['Team'] == 'Arsenal', 'total_points'] += 50
+    return frame
+
+def test_squad_keeps_the_quotas_club_limit_and_budget():
+    result = optimize_from_store(PlayerStore(crowded_frame()))
+    squad = result['squad']
+
+    assert Counter(player['Pos'] for player in squad) == Counter(QUOTAS)
+    assert max(Counter(player['Team'] for player in squad).values()) <= MAX_PER_CLUB
+    assert result['total_cost'] <= result['budget']
+    assert result['search']['nodes'] > 1
+
+def test_node_limit_raises_a_value_error():
+    with pytest.raises(SearchLimitError) as error:
+        optimize_from_store(PlayerStore(crowded_frame()), max_nodes=1)
+    assert isinstance(error.value, ValueError)
+    assert error.value.nodes >= 1
+
+def test_route_answers_503_when_the_search_gives_up(monkeypatch):
+    monkeypatch.setattr(stats_api_server, 'snapshot', {**build_snapshot(crowded_frame(), 1), 'database': None})
+    monkeypatch.setattr(stats_api_server, 'response_cache', ResponseCache())
+    monkeypatch.setattr(squad_optimizer, 'optimize_from_store', functools.partial(optimize_from_store, max_nodes=1))
+
+    response = stats_api_server.app.test_client().get('/api/optimize')
+
+    assert response.status_code == 503
+    assert response.get_json()['status'] == 'error'
+    assert 'nodes' in response.get_json()['message']
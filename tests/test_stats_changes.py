@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+
+from player_frames import random_players, refresh
+from stats_changes import DEFAULT_MAX_VERSIONS, LEADERBOARD_KEYS, ChangeLog, changes_payload
+from stats_snapshot import build_snapshot, error_snapshot
+
+def publish(history, change_log, frame):
+    """Build the next version from frame and log it, as publish_snapshot does"""
+    previous = history[-1]
+    current = build_snapshot(frame, previous['version'] + 1, previous=previous)
+    change_log.record(previous, current)
+    history.append(current)
+    return current
+
+def client_state(snapshot):
+    """What a client holding this version has: every player row, the leaderboards and team totals"""
+    return {
+        'players': snapshot['players'].rows(None),
+        **{key: snapshot['stats'][key] for key in LEADERBOARD_KEYS},
+        'teams': {team['Team']: team for team in snapshot['stats']['team_stats']},
+    }
+
+def apply_changes(state, payload, players):
+    """A client's update from a partial /api/stats/changes response"""
+    state = {**state, 'players': list(state['players']), 'teams': dict(state['teams'])}
+    for row_id, record in zip(payload['player_ids'], players.rows(payload['player_ids'])):
+        state['players'][row_id] = record
+    for key in LEADERBOARD_KEYS:
+        state[key] = payload.get(key, state[key])
+    state['teams'].update({team['Team']: team for team in payload['team_stats']})
+    return state
+
+@pytest.mark.parametrize('seed', range(3))
+def test_changes_since_any_logged_version_bring_a_client_up_to_date(seed):
+    rng = np.random.default_rng(seed)
+    max_versions = 6
+    change_log = ChangeLog(max_versions)
+    frame = random_players(rng, n=200)
+    history = [error_snapshot('Stats not loaded yet', 0)]
+    publish(history, change_log, frame)
+
+    for _ in range(15):
+        frame = refresh(frame, rng)
+        current = publish(history, change_log, frame)
+        for old in history:
+            since = old['version']
+            changes = change_log.since(since, current['version'])
+            payload, _ = changes_payload(current, since, changes)
+            if old['players'] is None or current['version'] - since > max_versions:
+                # Evicted from the ring (or never diffable): the client gets everything
+                assert changes is None and payload['full'] is True
+                continue
+            assert changes is not None and payload['full'] is False
+            assert apply_changes(client_state(old), payload, current['players']) == client_state(current)
+
+def test_full_fallback_once_the_default_ring_has_moved_past_a_version():
+    rng = np.random.default_rng(0)
+    change_log = ChangeLog()
+    frame = random_players(rng, n=60)
+    history = [error_snapshot('Stats not loaded yet', 0)]
+    for _ in range(DEFAULT_MAX_VERSIONS + 3):
+        frame = refresh(frame, rng)
+        current = publish(history, change_log, frame)
+
+    oldest = current['version'] - DEFAULT_MAX_VERSIONS
+    assert change_log.since(oldest, current['version']) is not None
+    assert change_log.since(oldest - 1, current['version']) is None
+    assert changes_payload(current, oldest - 1, None)[0]['full'] is True
+
+def test_a_refresh_that_cannot_be_diffed_cuts_the_log():
+    rng = np.random.default_rng(1)
+    change_log = ChangeLog()
+    frame = random_players(rng, n=80)
+    history = [error_snapshot('Stats not loaded yet', 0)]
+    publish(history, change_log, frame)
+    publish(history, change_log, refresh(frame, rng))
+    # A promoted player joins: rows no longer line up with the previous version
+    current = publish(history, change_log, random_players(rng, n=81))
+    after = publish(history, change_log, refresh(random_players(np.random.default_rng(1), n=81), rng))
+
+    assert change_log.since(1, current['version']) is None
+    assert change_log.since(current['version'] - 1, current['version']) is None
+    assert change_log.since(current['version'], after['version']) is not None
+
+def test_versions_from_a_restarted_publisher_reset_the_log():
+    rng = np.random.default_rng(2)
+    change_log = ChangeLog()
+    frame = random_players(rng, n=40)
+    history = [error_snapshot('Stats not loaded yet', 0)]
+    for _ in range(4):
+        frame = refresh(frame, rng)
+        publish(history, change_log, frame)
+
+    restarted = build_snapshot(frame, 2, previous=history[-1])
+    change_log.record(history[-1], restarted)
+
+    # Version 1 of the old numbering is not the version 2 was diffed from
+    assert [entry['version'] for entry in change_log.entries] == [2]
+    assert change_log.since(1, 2) is None
+    assert change_log.since(2, 2) == {'players': set(), 'leaderboards': set(), 'teams': set()}
@@ -0,0 +1,41 @@
+import os
+
+import pandas as pd
+import pytest
+from werkzeug.datastructures import MultiDict
+
+import stats_db
+from stats_db import QueryError, build_stats_database, query_from_args
+
+def test_cache_buster_params_are_ignored():
+    query = query_from_args(MultiDict([('_', '1700000000000'), ('Team', 'Arsenal')]), {'Team': 'text'})
+    assert query['filters'] == {'Team': ['Arsenal']}
+    assert query['ranges'] == {}
+
+def test_min_max_prefix_is_a_range_unless_it_names_a_column():
+    columns = {'Gls': 'number', 'min_price': 'number'}
+    query = query_from_args(MultiDict([('min_Gls', '3'), ('max_Gls', '9'), ('min_price', '5.5')]), columns)
+    assert query['ranges'] == {'Gls': (3.0, 9.0)}
+    assert query['filters'] == {'min_price': ['5.5']}
+
+def test_unknown_column_is_still_rejected(tmp_path, monkeypatch):
+    monkeypatch.setattr(stats_db, 'SEASON_FILES', {})
+    database = build_stats_database(pd.DataFrame({'Player': ['A', 'B'], 'Gls': [1, 2]}), 1, str(tmp_path))
+    with pytest.raises(QueryError):
+        database.select('stats', **query_from_args(MultiDict([('bogus', '1')]), database.dataset('stats')['columns']))
+
+def test_foreign_database_files_are_left_alone(tmp_path, monkeypatch):
+    monkeypatch.setattr(stats_db, 'SEASON_FILES', {})
+    for name in ('stats-backup.sqlite', 'stats-12-vx.sqlite', 'stats-999999999-v1.sqlite'):
+        (tmp_path / name).write_bytes(b'')
+    frame = pd.DataFrame({'Player': ['A'], 'Gls': [1]})
+    for version in (1, 2, 3):
+        database = build_stats_database(frame, version, str(tmp_path))
+
+    names = set(os.listdir(tmp_path))
+    assert {'stats-backup.sqlite', 'stats-12-vx.sqlite'} <= names
+    # A file of a process that no longer exists and this process's older versions are dropped
+    assert 'stats-999999999-v1.sqlite' not in names
+    assert f'stats-{os.getpid()}-v1.sqlite' not in names
+    assert {f'stats-{os.getpid()}-v2.sqlite', f'stats-{os.getpid()}-v3.sqlite'} <= names
+    assert database.select('stats')['total'] == 1
@@ -0,0 +1,11 @@
+"""
+Production entry point for the stats API server
+    gunicorn -c gunicorn.conf.py wsgi:app
+Every worker process serves the same snapshot through the files in STATS_SHARED_DIR (see
+shared_snapshot.py); gunicorn.conf.py sets each one up once it has started. Other WSGI servers
+should call stats_api_server.start_shared_worker() once in every worker process
+"""
+
+from stats_api_server import app
+
+application = app